@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Cooling:
+    __slots__ = ("cluster", "kw")
+    cluster: str
+    kw: float
+
+    def to_dict(self):
+        return {"type": "cooling", "cluster": self.cluster, "kw": self.kw}
+
+
+@dataclass
+class Battery:
+    __slots__ = ("cluster", "kw")
+    cluster: str
+    kw: float
+
+    def to_dict(self):
+        return {"type": "battery", "cluster": self.cluster, "kw": self.kw}
+
+
+@dataclass
+class Redistribute:
+    __slots__ = ("src", "dst", "kw")
+    src: str
+    dst: str
+    kw: float
+
+    def to_dict(self):
+        return {"type": "redistribute", "from": self.src, "to": self.dst, "kw": self.kw}
+
+
+ACTION_TYPES = (Cooling, Battery, Redistribute)
+
+
+def from_dict(action):
+    """Typed record for a plan action dict, or None for an unknown action type."""
+    kind = action.get("type")
+    if kind == "redistribute":
+        return Redistribute(action["from"], action["to"], action["kw"])
+    if kind == "cooling":
+        return Cooling(action["cluster"], action["kw"])
+    if kind == "battery":
+        return Battery(action["cluster"], action["kw"])
+    return None
+
+
+def parse_actions(plan):
+    """Typed records for `plan["actions"]`; entries that already are records pass through."""
+    return [a if type(a) in ACTION_TYPES else from_dict(a) for a in plan["actions"]]
+
+
+# Hand-written mirror of PLAN_SCHEMA (agents/planner.py): the required string
+# fields per action type. kw must be a non-bool number >= 0 for every type.
+_REQUIRED = {
+    "cooling": ("cluster",),
+    "battery": ("cluster",),
+    "redistribute": ("from", "to"),
+}
+
+
+def plan_is_valid(plan):
+    """Fast check that `plan` satisfies PLAN_SCHEMA.
+
+    True means valid. False means "not proven valid": the caller runs the full
+    jsonschema validator, which produces the authoritative error (or accepts
+    edge cases this check leaves to it, such as NaN or non-builtin numbers).
+    """
+    if type(plan) is not dict or len(plan) != 1 or "actions" not in plan:
+        return False
+    actions = plan["actions"]
+    if type(actions) is not list:
+        return False
+    required = _REQUIRED
+    for a in actions:
+        if type(a) is not dict:
+            return False
+        kind = a.get("type")
+        if type(kind) is not str:
+            return False
+        fields = required.get(kind)
+        if fields is None:
+            return False
+        kw = a.get("kw")
+        if type(kw) is not float and type(kw) is not int or not kw >= 0:
+            return False
+        for f in fields:
+            if type(a.get(f)) is not str:
+                return False
+    return True
@@ -1,7 +1,18 @@
 import time
-from tools.cooling import boost
-from tools.battery import discharge
-from tools.workload import redistribute
+from collections.abc import Sequence
+
+import numpy as np
+
+from agents.actions import ACTION_TYPES, Battery, Cooling, Redistribute, from_dict
+from core.cluster_state import ClusterState, ColumnView, ensure_column
+from core.state import ALPHA, BETA, MAX_UTIL, UTIL_PER_KW
+from tools import battery, cooling, workload
+
+TOOLS = ("cooling_tool", "battery_tool", "redistribute_tool", "unknown_tool")
+COOLING, BATTERY, REDISTRIBUTE, UNKNOWN = range(4)
+# below this many actions the per-action path is cheaper than vectorized passes
+BATCH_MIN_ACTIONS = 40
+_KINDS = {Cooling: COOLING, Battery: BATTERY, Redistribute: REDISTRIBUTE}
 
 
 def _log(logs, tool, **kw):
@@ -10,41 +21,320 @@ def _log(logs, tool, **kw):
     logs.append(entry)
 
 
-def apply_plan(state, plan, cooling_cap):
+def _cooling(state, action, cooling_cap, on_delta, logs):
+    msg, actual = cooling.boost(state, action.cluster, action.kw, cooling_cap, on_delta)
+    _log(logs, "cooling_tool", cluster=action.cluster, kw=action.kw, actual=actual, msg=msg)
+
+
+def _battery(state, action, cooling_cap, on_delta, logs):
+    msg, actual = battery.discharge(state, action.cluster, action.kw, on_delta)
+    _log(logs, "battery_tool", cluster=action.cluster, kw=action.kw, actual=actual, msg=msg)
+
+
+def _redistribute(state, action, cooling_cap, on_delta, logs):
+    msg, actual = workload.redistribute(state, action.src, action.dst, action.kw, on_delta)
+    _log(logs, "redistribute_tool", src=action.src, dst=action.dst, kw=action.kw, actual=actual, msg=msg)
+
+
+_HANDLERS = {Cooling: _cooling, Battery: _battery, Redistribute: _redistribute}
+
+
+class ActionLog(Sequence):
+    """Columnar tool log for a batched apply_plan: one preallocated row per action.
+
+    Columns are `t`, `tool` (index into TOOLS), `cluster` / `dst` (registry
+    indices, -1 when unused), `kw` (requested), `actual` and `skipped`. `t` is
+    stamped per action on the one-at-a-time path and per vectorized round on the
+    batched one (unknown actions keep the log's creation time). Indexing or
+    iterating renders the same entry dicts the sequential executor logs,
+    messages included, only for the rows actually read; `to_list()` renders all
+    of them, e.g. for `json.dumps(..., default=core_app.json_default)`.
+    """
+
+    def __init__(self, names, n, t=None):
+        self.names = names
+        # empty + fill: np.full's Python-level overhead dominates for the small logs of a control tick
+        self.t = np.empty(n)
+        self.t.fill(time.time() if t is None else t)
+        self.tool = np.empty(n, dtype=np.int8)
+        self.tool.fill(UNKNOWN)
+        self.cluster = np.empty(n, dtype=np.int32)
+        self.cluster.fill(-1)
+        self.dst = np.empty(n, dtype=np.int32)
+        self.dst.fill(-1)
+        self.kw = np.zeros(n)
+        self.actual = np.zeros(n)
+        self.skipped = np.zeros(n, dtype=bool)
+        self.raw = {}
+
+    def __len__(self):
+        return len(self.tool)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        tool = int(self.tool[i])
+        entry = {"t": float(self.t[i]), "tool": TOOLS[tool]}
+        if tool == UNKNOWN:
+            entry["raw"] = self.raw.get(i)
+            entry["msg"] = "Unknown action"
+            return entry
+        kw, actual = float(self.kw[i]), float(self.actual[i])
+        cluster = self.names[self.cluster[i]]
+        if tool == REDISTRIBUTE:
+            dst = self.names[self.dst[i]]
+            entry.update(src=cluster, dst=dst, kw=kw, actual=actual)
+            entry["msg"] = workload.message(cluster, dst, actual, skipped=bool(self.skipped[i]))
+        else:
+            entry.update(cluster=cluster, kw=kw, actual=actual)
+            entry["msg"] = (cooling if tool == COOLING else battery).message(cluster, actual)
+        return entry
+
+    def to_list(self):
+        return [self[i] for i in range(len(self))]
+
+    def __repr__(self):
+        return f"ActionLog({len(self)} actions)"
+
+
+def _column(cs, values):
+    if isinstance(values, ColumnView) and values._state is cs:
+        return values.array()
+    return ensure_column(values, cs.names, 0.0)
+
+
+def _rounds(occurrence):
+    """Index groups such that each group holds at most one action per cluster, in order."""
+    return [np.flatnonzero(occurrence == r) for r in range(int(occurrence.max()) + 1)] if len(occurrence) else []
+
+
+def _record(action):
+    if type(action) in ACTION_TYPES:
+        return action
+    return from_dict(action) if isinstance(action, dict) else None
+
+
+def _apply_each(cs, actions, cooling_cap, on_delta):
+    """Small plans: apply actions one at a time, logging to the same ActionLog.
+
+    Same arithmetic, order and on_delta reports as the tools, but on the state's
+    arrays directly, so no ColumnView is built per scalar read or write.
+    """
+    index = cs.registry.index
+    log = ActionLog(cs.registry.names, len(actions))
+    cap = None
+    for pos, action in enumerate(actions):
+        record = _record(action)
+        kind = _KINDS.get(type(record), UNKNOWN)
+        if kind == UNKNOWN:
+            log.raw[pos] = action
+            continue
+        log.tool[pos] = kind
+        log.kw[pos] = record.kw
+        log.t[pos] = time.time()
+        if kind == REDISTRIBUTE:
+            s, d = index[record.src], index[record.dst]
+            log.cluster[pos], log.dst[pos] = s, d
+            if cs.column("utilization")[d] >= MAX_UTIL:
+                log.skipped[pos] = True
+                continue
+            draw, temp, util = cs.writable("power_draw_kw"), cs.writable("temp_c"), cs.writable("utilization")
+            kw = max(0.0, min(record.kw, float(draw[s])))
+            draw[s] = max(0.0, float(draw[s]) - kw)
+            temp[s] -= BETA * kw
+            draw[d] += kw
+            temp[d] += BETA * kw
+            util[s] = max(0.0, float(util[s]) - UTIL_PER_KW * kw)
+            util[d] = min(1.0, float(util[d]) + UTIL_PER_KW * kw)
+            log.actual[pos] = kw
+            if on_delta is not None:
+                on_delta(record.src, "power_draw_kw", -kw)
+                on_delta(record.src, "temp_c", -BETA * kw)
+                on_delta(record.dst, "power_draw_kw", kw)
+                on_delta(record.dst, "temp_c", BETA * kw)
+        elif kind == COOLING:
+            c = log.cluster[pos] = index[record.cluster]
+            if cap is None:
+                cap = _column(cs, cooling_cap)
+            online, temp = cs.writable("cooling_online_kw"), cs.writable("temp_c")
+            kw = max(0.0, min(record.kw, float(cap[c]) - float(online[c])))
+            online[c] += kw
+            temp[c] -= ALPHA * kw
+            log.actual[pos] = kw
+            if on_delta is not None:
+                on_delta(record.cluster, "cooling_online_kw", kw)
+                on_delta(record.cluster, "temp_c", -ALPHA * kw)
+        else:
+            c = log.cluster[pos] = index[record.cluster]
+            stored, out = cs.writable("battery_kw"), cs.writable("battery_out_kw")
+            kw = min(record.kw, float(stored[c]))
+            stored[c] -= kw
+            out[c] += kw
+            log.actual[pos] = kw
+            if on_delta is not None:
+                on_delta(record.cluster, "battery_kw", -kw)
+                on_delta(record.cluster, "battery_out_kw", kw)
+    return log
+
+
+def _apply_batched(cs, actions, cooling_cap, on_delta):
+    index = cs.registry.index
+    n = len(actions)
+    log = ActionLog(cs.registry.names, n)
+    groups = {COOLING: [], BATTERY: [], REDISTRIBUTE: []}
+    seen = {COOLING: {}, BATTERY: {}}
+    last_wave = {}
+    for pos, action in enumerate(actions):
+        record = _record(action)
+        kind = _KINDS.get(type(record), UNKNOWN)
+        if kind == UNKNOWN:
+            log.raw[pos] = action
+            continue
+        log.tool[pos] = kind
+        log.kw[pos] = record.kw
+        if kind == REDISTRIBUTE:
+            s, d = index[record.src], index[record.dst]
+            log.cluster[pos], log.dst[pos] = s, d
+            # actions touching disjoint clusters share a wave; a wave runs after
+            # every earlier action on its clusters, preserving sequential results
+            wave = max(last_wave.get(s, -1), last_wave.get(d, -1)) + 1
+            last_wave[s] = last_wave[d] = wave
+            groups[kind].append((pos, wave))
+        else:
+            c = index[record.cluster]
+            log.cluster[pos] = c
+            count = seen[kind].get(c, 0)
+            seen[kind][c] = count + 1
+            groups[kind].append((pos, count))
+
+    before = _snapshot_touched(cs, log) if on_delta is not None else None
+    temp_pos, temp_idx, temp_delta = [], [], []
+
+    if groups[COOLING]:
+        pos, occ = (np.array(v) for v in zip(*groups[COOLING]))
+        cap = _column(cs, cooling_cap)
+        online = cs.writable("cooling_online_kw")
+        for r in _rounds(occ):
+            p = pos[r]
+            idx = log.cluster[p]
+            head = cap[idx] - online[idx]
+            actual = np.maximum(0.0, np.minimum(log.kw[p], head))
+            online[idx] = online[idx] + actual
+            log.actual[p] = actual
+            log.t[p] = time.time()
+            temp_pos.append(p * 2)
+            temp_idx.append(idx)
+            temp_delta.append(-(ALPHA * actual))
+
+    if groups[BATTERY]:
+        pos, occ = (np.array(v) for v in zip(*groups[BATTERY]))
+        stored = cs.writable("battery_kw")
+        out = cs.writable("battery_out_kw")
+        for r in _rounds(occ):
+            p = pos[r]
+            idx = log.cluster[p]
+            actual = np.minimum(log.kw[p], stored[idx])
+            stored[idx] = stored[idx] - actual
+            out[idx] = out[idx] + actual
+            log.actual[p] = actual
+            log.t[p] = time.time()
+
+    if groups[REDISTRIBUTE]:
+        pos, waves = (np.array(v) for v in zip(*groups[REDISTRIBUTE]))
+        util = cs.writable("utilization")
+        draw = cs.writable("power_draw_kw")
+        for w in _rounds(waves):
+            p = pos[w]
+            log.t[p] = time.time()
+            s, d = log.cluster[p], log.dst[p]
+            skip = util[d] >= MAX_UTIL
+            log.skipped[p] = skip
+            p, s, d = p[~skip], s[~skip], d[~skip]
+            actual = np.maximum(0.0, np.minimum(log.kw[p], draw[s]))
+            draw[s] = np.maximum(0.0, draw[s] - actual)
+            draw[d] = draw[d] + actual
+            util[s] = np.maximum(0.0, util[s] - UTIL_PER_KW * actual)
+            util[d] = np.minimum(1.0, util[d] + UTIL_PER_KW * actual)
+            log.actual[p] = actual
+            moved = BETA * actual
+            temp_pos += [p * 2, p * 2 + 1]
+            temp_idx += [s, d]
+            temp_delta += [-moved, moved]
+
+    if temp_pos:
+        # temperature is written by cooling and redistribute alike; apply in plan order
+        order = np.argsort(np.concatenate(temp_pos), kind="stable")
+        idx = np.concatenate(temp_idx)[order]
+        temp = cs.writable("temp_c")
+        np.add.at(temp, idx, np.concatenate(temp_delta)[order])
+
+    if before is not None:
+        _report(cs, before, on_delta)
+    return log
+
+
+# Fields each tool reports through on_delta, by tool kind.
+_DELTA_FIELDS = {
+    COOLING: ("cooling_online_kw", "temp_c"),
+    BATTERY: ("battery_kw", "battery_out_kw"),
+    REDISTRIBUTE: ("power_draw_kw", "temp_c"),
+}
+
+
+def _snapshot_touched(cs, log):
+    parts = {}
+    for kind, fields in _DELTA_FIELDS.items():
+        rows = log.tool == kind
+        if not rows.any():
+            continue
+        idx = log.cluster[rows] if kind != REDISTRIBUTE else np.concatenate((log.cluster[rows], log.dst[rows]))
+        for field in fields:
+            parts.setdefault(field, []).append(idx)
+    out = {}
+    for field, idx in parts.items():
+        idx = np.unique(np.concatenate(idx))
+        out[field] = (idx, cs.column(field)[idx].copy())
+    return out
+
+
+def _report(cs, before, on_delta):
+    # one net delta per (cluster, field) instead of one per tool call
+    names = cs.registry.names
+    for field, (idx, old) in before.items():
+        delta = cs.column(field)[idx] - old
+        changed = np.flatnonzero(delta)
+        for i, d in zip(idx[changed].tolist(), delta[changed].tolist()):
+            on_delta(names[i], field, d)
+
+
+def apply_plan(state, plan, cooling_cap, on_delta=None, batched=None):
+    """Execute `plan["actions"]` (action dicts or agents.actions records) in order.
+
+    ClusterState targets use the batched executor by default: actions are grouped
+    by type and applied in vectorized passes (repeated clusters go to later
+    rounds, so results equal one-at-a-time execution) and logged to an
+    `ActionLog`; plans under BATCH_MIN_ACTIONS run action by action into the
+    same log. Dict states, or `batched=False`, run the tools one by one and
+    return a list of log dicts.
+    """
+    if batched is None:
+        batched = isinstance(state, ClusterState)
+    if batched:
+        actions = plan["actions"]
+        apply = _apply_batched if len(actions) >= BATCH_MIN_ACTIONS else _apply_each
+        return apply(state, actions, cooling_cap, on_delta), state
     logs = []
+    handlers = _HANDLERS
     for action in plan["actions"]:
-        action_type = action["type"]
-        if action_type == "cooling":
-            msg, actual = boost(state, action["cluster"], action["kw"], cooling_cap)
-            _log(
-                logs,
-                "cooling_tool",
-                cluster=action["cluster"],
-                kw=action["kw"],
-                actual=actual,
-                msg=msg,
-            )
-        elif action_type == "battery":
-            msg, actual = discharge(state, action["cluster"], action["kw"])
-            _log(
-                logs,
-                "battery_tool",
-                cluster=action["cluster"],
-                kw=action["kw"],
-                actual=actual,
-                msg=msg,
-            )
-        elif action_type == "redistribute":
-            msg, actual = redistribute(state, action["from"], action["to"], action["kw"])
-            _log(
-                logs,
-                "redistribute_tool",
-                src=action["from"],
-                dst=action["to"],
-                kw=action["kw"],
-                actual=actual,
-                msg=msg,
-            )
-        else:
-            _log(logs, "unknown_tool", raw=action, msg="Unknown action")
+        handler = handlers.get(type(action))
+        if handler is None:
+            record = from_dict(action) if isinstance(action, dict) else None
+            handler = handlers.get(type(record))
+            if handler is None:
+                _log(logs, "unknown_tool", raw=action, msg="Unknown action")
+                continue
+            action = record
+        handler(state, action, cooling_cap, on_delta, logs)
     return logs, state
@@ -0,0 +1,158 @@
+import math
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+
+from core.state import TEMP_LIMIT, ALPHA, BETA, MAX_UTIL, UTIL_PER_KW
+
+# Per-kW costs. Redistribution is cheapest, battery the most expensive real
+# action; the slack penalties only bind when the fleet cannot be balanced.
+COSTS = {
+    "redistribute": 1.0,
+    "cooling": 1.5,
+    "battery": 2.0,
+    "unmet_power": 1000.0,
+    "unmet_thermal": 1000.0,
+}
+EPS_KW = 0.005
+
+
+def _column(values, keys, default=0.0):
+    return np.fromiter((float(values.get(k, default)) for k in keys), dtype=np.float64, count=len(keys))
+
+
+def _pair_transfers(keys, out, inn):
+    """Split bus flow into from→to transfers (north-west corner, index order)."""
+    src = [(keys[i], out[i].item()) for i in np.flatnonzero(out > EPS_KW).tolist()]
+    dst = [(keys[j], inn[j].item()) for j in np.flatnonzero(inn > EPS_KW).tolist()]
+    actions = []
+    si = di = 0
+    s_left = src[0][1] if src else 0.0
+    d_left = dst[0][1] if dst else 0.0
+    while si < len(src) and di < len(dst):
+        kw = min(s_left, d_left)
+        if round(kw, 2) > 0:
+            actions.append({"type": "redistribute", "from": src[si][0], "to": dst[di][0], "kw": round(kw, 2)})
+        s_left -= kw
+        d_left -= kw
+        if s_left <= EPS_KW:
+            si += 1
+            s_left = src[si][1] if si < len(src) else 0.0
+        if d_left <= EPS_KW:
+            di += 1
+            d_left = dst[di][1] if di < len(dst) else 0.0
+    return actions
+
+
+def flow_plan(
+    power_defs,
+    therm_viol,
+    balance,
+    battery_kw,
+    cooling_cap,
+    cooling_on,
+    base_grid,
+    power_draw,
+    temp=None,
+    utilization=None,
+):
+    """Solve redistribution, battery discharge and cooling boost jointly as one LP.
+
+    All load moved off a cluster goes through a single bus and is picked up by
+    clusters with spare grid headroom, so the network is a min-cost flow with
+    O(N) arcs. Per cluster i:
+
+        balance_i + out_i - in_i + battery_i + unmet_i >= floor_i
+        temp_i - ALPHA*cool_i - BETA*out_i + BETA*in_i - slack_i <= TEMP_LIMIT
+        sum(out) == sum(in)
+
+    floor_i is 0 for deficit clusters and min(balance_i, 0) elsewhere. `in_i` is
+    capped by the utilization left below MAX_UTIL. When `temp` is omitted only the
+    clusters in `therm_viol` are thermally constrained.
+    """
+    keys = list(balance.keys())
+    n = len(keys)
+    if n == 0 or (not power_defs and not therm_viol):
+        return {"actions": []}
+
+    bal = _column(balance, keys)
+    draw = _column(power_draw, keys)
+    batt = np.maximum(_column(battery_kw, keys), 0.0)
+    cool_head = np.maximum(_column(cooling_cap, keys) - _column(cooling_on, keys), 0.0)
+    deficit = np.fromiter((k in power_defs for k in keys), dtype=bool, count=n)
+    hot = np.fromiter((k in therm_viol for k in keys), dtype=bool, count=n)
+    if temp is not None:
+        temps = _column(temp, keys)
+        thermal_rows = np.ones(n, dtype=bool)
+    else:
+        temps = _column(therm_viol, keys, TEMP_LIMIT)
+        thermal_rows = hot
+    if utilization is not None:
+        util_head = np.maximum(MAX_UTIL - _column(utilization, keys), 0.0) / UTIL_PER_KW
+    else:
+        util_head = np.full(n, np.inf)
+
+    sender = deficit | hot
+    floor = np.where(deficit, 0.0, np.minimum(bal, 0.0))
+    out_ub = np.where(sender, np.maximum(draw, 0.0), 0.0)
+    in_ub = np.where(sender, 0.0, np.minimum(np.maximum(bal - floor, 0.0), util_head))
+    bat_ub = np.where(deficit, batt, 0.0)
+    unmet_ub = np.where(deficit, np.inf, 0.0)
+
+    # variable blocks: out, in, battery, cooling, unmet power, thermal slack
+    OUT, IN, BAT, COOL, UNMET, SLACK = (k * n for k in range(6))
+    idx = np.arange(n)
+
+    # power rows: -out + in - battery - unmet <= balance - floor
+    p_rows = np.concatenate([idx] * 4)
+    p_cols = np.concatenate([OUT + idx, IN + idx, BAT + idx, UNMET + idx])
+    p_vals = np.concatenate([-np.ones(n), np.ones(n), -np.ones(n), -np.ones(n)])
+    p_rhs = bal - floor
+
+    # thermal rows: -ALPHA*cool - BETA*out + BETA*in - slack <= TEMP_LIMIT - temp
+    t_idx = np.flatnonzero(thermal_rows)
+    m = len(t_idx)
+    t_row = np.arange(m) + n
+    t_rows = np.concatenate([t_row] * 4)
+    t_cols = np.concatenate([COOL + t_idx, OUT + t_idx, IN + t_idx, SLACK + t_idx])
+    t_vals = np.concatenate([np.full(m, -ALPHA), np.full(m, -BETA), np.full(m, BETA), -np.ones(m)])
+    t_rhs = TEMP_LIMIT - temps[t_idx]
+
+    a_ub = coo_matrix(
+        (np.concatenate([p_vals, t_vals]), (np.concatenate([p_rows, t_rows]), np.concatenate([p_cols, t_cols]))),
+        shape=(n + m, 6 * n),
+    ).tocsr()
+    b_ub = np.concatenate([p_rhs, t_rhs])
+    a_eq = coo_matrix(
+        (np.concatenate([np.ones(n), -np.ones(n)]), (np.zeros(2 * n, dtype=int), np.concatenate([OUT + idx, IN + idx]))),
+        shape=(1, 6 * n),
+    ).tocsr()
+
+    cost = np.concatenate(
+        [
+            np.full(n, COSTS["redistribute"]),
+            np.zeros(n),
+            np.full(n, COSTS["battery"]),
+            np.full(n, COSTS["cooling"]),
+            np.full(n, COSTS["unmet_power"]),
+            np.full(n, COSTS["unmet_thermal"]),
+        ]
+    )
+    lower = np.zeros(6 * n)
+    upper = np.concatenate([out_ub, in_ub, bat_ub, cool_head, unmet_ub, np.full(n, np.inf)])
+    res = linprog(cost, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=[0.0], bounds=np.column_stack([lower, upper]), method="highs-ds")
+    if res.status != 0:
+        raise RuntimeError(f"Flow planner failed: {res.message}")
+
+    x = res.x
+    out, inn, bat, cool = x[OUT:IN], x[IN:BAT], x[BAT:COOL], x[COOL:UNMET]
+    plan = []
+    for i in np.flatnonzero(cool > EPS_KW).tolist():
+        # round cooling up so the thermal target is not missed by rounding
+        kw = min(math.ceil(cool[i].item() * 100) / 100, math.floor(cool_head[i].item() * 100) / 100)
+        plan.append({"type": "cooling", "cluster": keys[i], "kw": kw})
+    plan.extend(_pair_transfers(keys, out, inn))
+    for i in np.flatnonzero(bat > EPS_KW).tolist():
+        plan.append({"type": "battery", "cluster": keys[i], "kw": round(bat[i].item(), 2)})
+    return {"actions": plan}
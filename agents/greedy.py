@@ -0,0 +1,89 @@
+import heapq
+
+from core.state import TEMP_LIMIT, ALPHA
+
+
+class DonorPool:
+    """Max-heap of donor clusters keyed on spare grid headroom (base_grid - power_draw).
+
+    Donor policy: largest headroom first, ties broken by cluster name. Built once per
+    planning call; headroom is updated in place as redistributions consume it, with
+    stale heap entries discarded lazily.
+    """
+
+    def __init__(self, base_grid, power_draw):
+        self._base = base_grid
+        self._draw = power_draw
+        self._head = {}
+        for d in power_draw:
+            h = base_grid[d] - power_draw[d]
+            if h > 0:
+                self._head[d] = h
+        self._heap = [(-h, d) for d, h in self._head.items()]
+        heapq.heapify(self._heap)
+
+    def refresh(self, cluster):
+        h = self._base[cluster] - self._draw[cluster]
+        if h > 0:
+            self._head[cluster] = h
+            heapq.heappush(self._heap, (-h, cluster))
+        else:
+            self._head.pop(cluster, None)
+
+    def draw(self, exclude, need, limit):
+        """Yield (donor, kw) pairs covering up to min(need, limit) kW, excluding `exclude`."""
+        skipped = []
+        while need > 0 and limit > 0 and self._heap:
+            neg_h, d = heapq.heappop(self._heap)
+            if self._head.get(d) != -neg_h:
+                continue
+            if d == exclude:
+                skipped.append((neg_h, d))
+                continue
+            take = min(need, -neg_h, limit)
+            if take > 0:
+                yield d, take
+                need -= take
+                limit -= take
+            self.refresh(d)
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+
+
+def greedy_plan(
+    power_defs, therm_viol, balance, battery_kw, cooling_cap, cooling_on, base_grid, power_draw, leftover=None
+):
+    # `leftover`, if given, receives the deficit (kW) each cluster still has after the plan
+    plan = []
+    # 1) Thermal corrections sized to hit TEMP_LIMIT
+    for c in therm_viol:
+        need_kw = max(0.0, (therm_viol[c] - TEMP_LIMIT) / ALPHA)
+        head = max(0.0, cooling_cap[c] - cooling_on[c])
+        if head > 0 and need_kw > 0:
+            plan.append({"type": "cooling", "cluster": c, "kw": round(min(need_kw, head), 2)})
+
+    # 2) Power: move workload away from deficits, then use battery/cooling
+    donors = DonorPool(base_grid, power_draw)
+    for c, bal in power_defs.items():
+        need = -bal  # kW needed to close the gap at c
+
+        for d, take in donors.draw(c, need, power_draw[c]):
+            plan.append({"type": "redistribute", "from": c, "to": d, "kw": round(take, 2)})
+            power_draw[c] = max(0.0, power_draw[c] - take)
+            power_draw[d] += take
+            need -= take
+        donors.refresh(c)
+
+        if need > 0:
+            take = min(need, battery_kw[c])
+            if take > 0:
+                plan.append({"type": "battery", "cluster": c, "kw": round(take, 2)})
+                need -= take
+        if leftover is not None and need > 0:
+            leftover[c] = need
+
+        if c in therm_viol and need > 0:
+            head = max(0.0, cooling_cap[c] - cooling_on[c])
+            if head > 0:
+                plan.append({"type": "cooling", "cluster": c, "kw": round(min(need, head, 5.0), 2)})
+    return {"actions": plan}
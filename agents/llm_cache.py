@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+MODES = ("readwrite", "replay", "off")
+DEFAULT_DIR = Path.home() / ".cache" / "gridguardian" / "nemotron"
+DEFAULT_MEMORY_ENTRIES = 512
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CacheMiss(RuntimeError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+def _canonical(text):
+    try:
+        return json.dumps(json.loads(text), sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return text
+
+
+def request_key(model, system, user):
+    """SHA-256 over (model, system prompt, canonicalized user JSON)."""
+    blob = json.dumps([model, system, _canonical(user)], separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of raw response content: in-memory LRU over an on-disk store.
+
+    Disk entries expire after `ttl_s` and the directory is trimmed oldest-first
+    once it exceeds `max_bytes`. `mode="replay"` serves from cache only.
+    """
+
+    def __init__(
+        self,
+        directory=DEFAULT_DIR,
+        mode="readwrite",
+        memory_entries=DEFAULT_MEMORY_ENTRIES,
+        ttl_s=DEFAULT_TTL_S,
+        max_bytes=DEFAULT_MAX_BYTES,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.directory = Path(directory) if directory else None
+        self.memory_entries = memory_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "saved_s": 0.0,
+        }
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            st = path.stat()
+            if time.time() - st.st_mtime > self.ttl_s:
+                path.unlink()
+                self._forget_disk(st.st_size)
+                return None
+            with open(path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _forget_disk(self, size):
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes = max(0, self._disk_bytes - size)
+
+    def get(self, key):
+        """Cached content string for `key`, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                self.stats["saved_s"] += entry["latency_s"]
+                return entry["content"]
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._remember(key, entry)
+            self.stats["disk_hits"] += 1
+            self.stats["saved_s"] += entry["latency_s"]
+        return entry["content"]
+
+    def put(self, key, content, latency_s=0.0):
+        if self.mode != "readwrite":
+            return
+        entry = {"content": content, "latency_s": float(latency_s), "created": time.time()}
+        with self._lock:
+            self._remember(key, entry)
+            self.stats["stores"] += 1
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh)
+            os.replace(tmp, path)
+            self._account(path.stat().st_size)
+        except OSError:
+            pass
+
+    def discard(self, key):
+        """Drop `key` from memory and disk (e.g. a response that failed validation)."""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        self._forget_disk(size)
+
+    def _account(self, added):
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.directory.glob("*/*.json"))
+            else:
+                self._disk_bytes += added
+            over = self._disk_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        files = []
+        for p in self.directory.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total = sum(f[1] for f in files)
+        now = time.time()
+        for mtime, size, p in files:
+            if total <= self.max_bytes * 0.9 and now - mtime <= self.ttl_s:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.stats["evictions"] += 1
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = None
+        if self.directory is not None:
+            for p in self.directory.glob("*/*.json"):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+
+    def snapshot_stats(self):
+        with self._lock:
+            out = dict(self.stats)
+        lookups = out["memory_hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = (out["memory_hits"] + out["disk_hits"]) / lookups if lookups else 0.0
+        out["mode"] = self.mode
+        return out
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache configured from NEMOTRON_CACHE_MODE / NEMOTRON_CACHE_DIR."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                directory=os.getenv("NEMOTRON_CACHE_DIR") or DEFAULT_DIR,
+                mode=os.getenv("NEMOTRON_CACHE_MODE", "readwrite"),
+            )
+        return _cache
+
+
+def set_cache(cache):
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def cache_stats():
+    return get_cache().snapshot_stats()
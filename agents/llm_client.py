@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.llm_cache import CacheMiss, get_cache, request_key
+
+DEFAULT_URL = "https://integrate.api.nvidia.com/v1/chat/completions"
+DEFAULT_MODEL = "nvidia/nvidia-nemotron-nano-9b-v2"
+TIMEOUT_S = 30
+POOL_SIZE = 16
+DEFAULT_CONCURRENCY = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def endpoint():
+    # NEMOTRON_URL points the client at a local stub server (see bench/stub_llm.py)
+    return os.getenv("NEMOTRON_URL", DEFAULT_URL)
+
+
+def api_key():
+    return os.getenv("NEMOTRON_KEY")
+
+
+def concurrency(value=None):
+    if value is None:
+        raw = os.getenv("NEMOTRON_CONCURRENCY", DEFAULT_CONCURRENCY)
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            warnings.warn(f"Ignoring NEMOTRON_CONCURRENCY={raw!r}; using {DEFAULT_CONCURRENCY}")
+            value = DEFAULT_CONCURRENCY
+    return max(1, int(value))
+
+
+def session():
+    """Process-wide requests.Session with a keep-alive connection pool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def close():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def available():
+    """True when chat_json can answer: a key is set, or replay mode serves from cache."""
+    return bool(api_key()) or get_cache().mode == "replay"
+
+
+def chat_json(system, user, model=DEFAULT_MODEL, key=None, timeout=TIMEOUT_S, validate=None):
+    """POST one JSON-mode chat completion and return the parsed message content.
+
+    Responses are looked up in / stored to the shared ResponseCache keyed on
+    (model, system, user); in replay mode a miss raises CacheMiss. With
+    `validate`, a response is only cached once `validate(parsed)` returns; if it
+    raises, the error propagates and a cached copy is evicted.
+    """
+    cache = get_cache()
+    cache_key = request_key(model, system, user)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        parsed = json.loads(cached)
+        if validate is not None:
+            try:
+                validate(parsed)
+            except Exception:
+                cache.discard(cache_key)
+                raise
+        return parsed
+    if cache.mode == "replay":
+        raise CacheMiss(f"No cached response for request {cache_key[:12]}")
+    key = key or api_key()
+    if not key:
+        raise RuntimeError("Missing NEMOTRON_KEY")
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        "response_format": {"type": "json_object"},
+    }
+    started = time.perf_counter()
+    resp = session().post(
+        endpoint(),
+        headers={"Authorization": f"Bearer {key}"},
+        json=payload,
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    content = resp.json()["choices"][0]["message"]["content"]
+    parsed = json.loads(content)
+    if validate is not None:
+        validate(parsed)
+    cache.put(cache_key, content, time.perf_counter() - started)
+    return parsed
+
+
+def map_concurrent(fn, items, limit=None):
+    """Apply `fn` to `items` on a bounded thread pool; results keep input order."""
+    items = list(items)
+    limit = min(concurrency(limit), max(len(items), 1))
+    if limit == 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="nemotron") as pool:
+        return list(pool.map(fn, items))
+
+
+def iter_concurrent(fn, items, limit=None):
+    """Like `map_concurrent`, but yield `(index, result)` pairs as each call finishes."""
+    items = list(items)
+    limit = min(concurrency(limit), max(len(items), 1))
+    if limit == 1:
+        for i, item in enumerate(items):
+            yield i, fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="nemotron") as pool:
+        futures = {pool.submit(fn, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
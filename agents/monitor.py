@@ -1,3 +1,7 @@
+import os
+
+import numpy as np
+
 from core.state import TEMP_LIMIT, POWER_MARGIN
 
 
@@ -21,3 +25,113 @@ def power_deficits(balance):
 
 def donor_headroom(balance):
     return {c: max(0.0, v) for c, v in balance.items()}
+
+
+# Vectorized counterparts over a ClusterState (see core/cluster_state.py).
+
+
+def balance_array(cs):
+    return cs.column("base_grid_kw") + cs.column("battery_out_kw") - cs.column("power_draw_kw")
+
+
+def thermal_mask(temp):
+    return temp > TEMP_LIMIT
+
+
+def deficit_mask(balance, threshold=-POWER_MARGIN):
+    return balance < threshold
+
+
+def monitor_state(cs):
+    """Balance, thermal violations and power deficits of a ClusterState, as dicts."""
+    bal = balance_array(cs)
+    temp = cs.column("temp_c")
+    return (
+        cs.mapping(bal),
+        cs.masked_mapping(temp, thermal_mask(temp)),
+        cs.masked_mapping(bal, deficit_mask(bal)),
+    )
+
+
+# Fields whose changes affect balance or thermal state.
+BALANCE_FIELDS = ("base_grid_kw", "battery_out_kw", "power_draw_kw")
+THERMAL_FIELDS = ("temp_c",)
+
+
+def monitor_debug():
+    # MONITOR_DEBUG=1 cross-checks every incremental refresh against a full recompute
+    return os.getenv("MONITOR_DEBUG", "") not in ("", "0")
+
+
+class IncrementalMonitor:
+    """Balance, thermal and deficit state of a ClusterState kept current from actuator deltas.
+
+    Pass `record` as the `on_delta` callback of the tools (or `apply_plan`); each
+    delta marks its cluster dirty, and `refresh()` recomputes only the dirty
+    clusters' balance and masks from the state columns, so results match
+    `monitor_state` exactly. Whole-column writes (e.g. simulator physics) are not
+    seen as deltas; call `recompute()` after them. With `debug=True` every
+    refresh is checked against a full recompute.
+    """
+
+    def __init__(self, cs, debug=None):
+        self.cs = cs
+        self.debug = monitor_debug() if debug is None else debug
+        self._dirty = set()
+        self._deficits = {-POWER_MARGIN: None}
+        self.recompute()
+
+    def recompute(self):
+        self.balance = balance_array(self.cs)
+        self.thermal = thermal_mask(self.cs.column("temp_c"))
+        self._deficits = {t: deficit_mask(self.balance, t) for t in self._deficits}
+        self._dirty.clear()
+
+    def record(self, cluster, field, delta):
+        if delta and (field in BALANCE_FIELDS or field in THERMAL_FIELDS):
+            self._dirty.add(cluster)
+
+    def refresh(self):
+        """Bring balance and masks up to date for the dirty clusters; returns their indices."""
+        if not self._dirty:
+            return np.empty(0, dtype=np.intp)
+        index = self.cs.registry.index
+        idx = np.fromiter((index[c] for c in self._dirty), dtype=np.intp, count=len(self._dirty))
+        self._dirty.clear()
+        cs = self.cs
+        self.balance[idx] = cs.column("base_grid_kw")[idx] + cs.column("battery_out_kw")[idx] - cs.column("power_draw_kw")[idx]
+        self.thermal[idx] = thermal_mask(cs.column("temp_c")[idx])
+        for threshold, mask in self._deficits.items():
+            mask[idx] = deficit_mask(self.balance[idx], threshold)
+        if self.debug:
+            self.check()
+        return idx
+
+    def deficits(self, threshold=-POWER_MARGIN):
+        """Deficit mask at `threshold`; tracked incrementally from the first request on."""
+        self.refresh()
+        mask = self._deficits.get(threshold)
+        if mask is None:
+            mask = self._deficits[threshold] = deficit_mask(self.balance, threshold)
+        return mask
+
+    def state(self):
+        """Same (balance, thermal, deficits) dicts as `monitor_state`."""
+        self.refresh()
+        cs = self.cs
+        temp = cs.column("temp_c")
+        return (
+            cs.mapping(self.balance),
+            cs.masked_mapping(temp, self.thermal),
+            cs.masked_mapping(self.balance, self.deficits()),
+        )
+
+    def check(self):
+        bal = balance_array(self.cs)
+        bad = self.balance != bal
+        bad |= self.thermal != thermal_mask(self.cs.column("temp_c"))
+        for threshold, mask in self._deficits.items():
+            bad |= mask != deficit_mask(bal, threshold)
+        if bad.any():
+            names = [self.cs.registry.names[i] for i in np.flatnonzero(bad)[:10]]
+            raise RuntimeError(f"Incremental monitor diverged from full recompute on {names}")
@@ -1,3 +1,6 @@
+from collections.abc import Sequence
+
+
 def narrate_react(reasoning, tool_logs, verify):
     trace = []
     for r in reasoning:
@@ -15,3 +18,31 @@ def narrate_react(reasoning, tool_logs, verify):
         }
     )
     return trace
+
+
+class ReactTrace(Sequence):
+    """`narrate_react` output, rendered on first access rather than on every run.
+
+    `to_list()` gives the plain rows, e.g. for `json.dumps(..., default=core_app.json_default)`.
+    """
+
+    def __init__(self, reasoning, tool_logs, verify):
+        self._args = (reasoning, tool_logs, verify)
+        self._rows = None
+
+    def _render(self):
+        if self._rows is None:
+            self._rows = narrate_react(*self._args)
+        return self._rows
+
+    def __getitem__(self, i):
+        return self._render()[i]
+
+    def __len__(self):
+        return len(self._render())
+
+    def to_list(self):
+        return list(self._render())
+
+    def __repr__(self):
+        return repr(self._render()) if self._rows is not None else "ReactTrace(unrendered)"
@@ -1,9 +1,18 @@
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
-import requests
-from jsonschema import validate, ValidationError
-from core.state import TEMP_LIMIT, ALPHA
+from jsonschema import validators, ValidationError
+from jsonschema.exceptions import best_match
+from agents.actions import plan_is_valid
+from agents.flow_planner import flow_plan
+from agents.greedy import greedy_plan
+from agents.zone_planner import zone_plan
+from agents.llm_client import chat_json, available as llm_available
+from core import metrics
+
+LOCAL_PLANNERS = ("greedy", "flow", "zone")
 
 PLAN_SCHEMA = {
     "type": "object",
@@ -60,7 +69,7 @@ def _nemotron_plan(
     power_draw,
 ):
     api_key = os.getenv("NEMOTRON_KEY")
-    if not api_key:
+    if not llm_available():
         raise RuntimeError("Missing NEMOTRON_KEY")
     system = (
         "You are a datacenter planner. Choose actions from {cooling,battery,redistribute}.\n"
@@ -69,37 +78,20 @@ def _nemotron_plan(
     )
     user = json.dumps(
         {
-            "power_defs": power_defs,
-            "thermal_viol": therm_viol,
-            "balance": balance,
+            "power_defs": dict(power_defs),
+            "thermal_viol": dict(therm_viol),
+            "balance": dict(balance),
             "caps": {
-                "battery_kw": battery_kw,
-                "cooling_cap": cooling_cap,
-                "cooling_on": cooling_on,
+                "battery_kw": dict(battery_kw),
+                "cooling_cap": dict(cooling_cap),
+                "cooling_on": dict(cooling_on),
             },
-            "grid": {"base_grid": base_grid},
-            "power_draw": power_draw,
+            "grid": {"base_grid": dict(base_grid)},
+            "power_draw": dict(power_draw),
             "goal": "Eliminate thermal violations and raise balances >= tau with minimal battery/cooling.",
         }
     )
-    payload = {
-        "model": "nvidia/nvidia-nemotron-nano-9b-v2",
-        "messages": [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        "response_format": {"type": "json_object"},
-    }
-    resp = requests.post(
-        "https://integrate.api.nvidia.com/v1/chat/completions",
-        headers={"Authorization": f"Bearer {api_key}"},
-        json=payload,
-        timeout=30,
-    )
-    resp.raise_for_status()
-    content = resp.json()["choices"][0]["message"]["content"]
-    plan = json.loads(content)
-    validate(plan, PLAN_SCHEMA)
+    plan = chat_json(system, user, key=api_key, validate=validate_plan)
     reasoning = [
         "Nemotron planned actions with constraints enforced.",
         f"Thermal clusters: {list(therm_viol.keys())}",
@@ -108,48 +100,17 @@ def _nemotron_plan(
     return plan, reasoning
 
 
-def greedy_plan(power_defs, therm_viol, balance, battery_kw, cooling_cap, cooling_on, base_grid, power_draw):
-    plan = []
-    # 1) Thermal corrections sized to hit TEMP_LIMIT
-    for c in therm_viol:
-        need_kw = max(0.0, (therm_viol[c] - TEMP_LIMIT) / ALPHA)
-        head = max(0.0, cooling_cap[c] - cooling_on[c])
-        if head > 0 and need_kw > 0:
-            plan.append({"type": "cooling", "cluster": c, "kw": round(min(need_kw, head), 2)})
-
-    # 2) Power: move workload away from deficits, then use battery/cooling
-    for c, bal in power_defs.items():
-        need = -bal  # kW needed to close the gap at c
-
-        donors = {d: max(0.0, base_grid[d] - power_draw[d]) for d in balance.keys() if d != c}
-
-        for d, s in list(donors.items()):
-            if s <= 0:
-                continue
-            take = min(need, s, power_draw[c])
-            if take > 0:
-                plan.append({"type": "redistribute", "from": c, "to": d, "kw": round(take, 2)})
-                power_draw[c] = max(0.0, power_draw[c] - take)
-                power_draw[d] += take
-                need -= take
-            if need <= 0:
-                break
-
-        if need > 0:
-            take = min(need, battery_kw[c])
-            if take > 0:
-                plan.append({"type": "battery", "cluster": c, "kw": round(take, 2)})
-                need -= take
-
-        if c in therm_viol and need > 0:
-            head = max(0.0, cooling_cap[c] - cooling_on[c])
-            if head > 0:
-                plan.append({"type": "cooling", "cluster": c, "kw": round(min(need, head, 5.0), 2)})
-    return {"actions": plan}
+_PLAN_VALIDATOR = validators.validator_for(PLAN_SCHEMA)(PLAN_SCHEMA)
 
 
 def validate_plan(p):
-    validate(p, PLAN_SCHEMA)
+    # fast path for well-formed plans; anything else gets the compiled validator's
+    # error, identical to jsonschema.validate but without re-checking the schema
+    if plan_is_valid(p):
+        return True
+    error = best_match(_PLAN_VALIDATOR.iter_errors(p))
+    if error is not None:
+        raise error
     return True
 
 
@@ -164,11 +125,38 @@ def plan_actions(
     power_draw,
     use_llm=False,
     llm=None,
+    planner="greedy",
+    temp=None,
+    utilization=None,
+    zones=None,
 ):
+    if planner not in LOCAL_PLANNERS:
+        raise ValueError(f"Unknown planner {planner!r}; expected one of {LOCAL_PLANNERS}")
     reasoning = []
     if use_llm:
+        metrics.incr("llm_plan_call")
         try:
-            return _nemotron_plan(
+            with metrics.span("llm_plan"):
+                return _nemotron_plan(
+                    power_defs,
+                    therm_viol,
+                    balance,
+                    battery_kw,
+                    cooling_cap,
+                    cooling_on,
+                    base_grid,
+                    power_draw,
+                )
+        except Exception as exc:
+            metrics.incr("llm_fallback")
+            if isinstance(exc, ValidationError):
+                metrics.incr("schema_rejection")
+            reasoning.append(
+                f"Nemotron error: {type(exc).__name__}: {exc}. Falling back to {planner} planner."
+            )
+    if planner == "flow":
+        try:
+            plan = flow_plan(
                 power_defs,
                 therm_viol,
                 balance,
@@ -177,10 +165,46 @@ def plan_actions(
                 cooling_on,
                 base_grid,
                 power_draw,
+                temp=temp,
+                utilization=utilization,
             )
+            validate_plan(plan)
+            reasoning.append("Min-cost flow planner solved redistribution, battery and cooling jointly.")
+            return plan, reasoning
         except Exception as exc:
+            metrics.incr("flow_fallback")
+            if isinstance(exc, ValidationError):
+                metrics.incr("schema_rejection")
             reasoning.append(
-                f"Nemotron error: {type(exc).__name__}: {exc}. Falling back to greedy planner."
+                f"Flow planner error: {type(exc).__name__}: {exc}. Falling back to greedy planner."
+            )
+    if planner == "zone":
+        try:
+            stats = {}
+            plan = zone_plan(
+                power_defs,
+                therm_viol,
+                balance,
+                battery_kw,
+                cooling_cap,
+                cooling_on,
+                base_grid,
+                power_draw,
+                zones=zones,
+                stats=stats,
+            )
+            validate_plan(plan)
+            note = f"Zone planner planned {stats['zones']} zone(s)"
+            if stats["cross_zone"]:
+                note += f"; the coordinator added {stats['cross_zone']} cross-zone transfer(s)"
+            reasoning.append(note + ".")
+            return plan, reasoning
+        except Exception as exc:
+            metrics.incr("zone_fallback")
+            if isinstance(exc, ValidationError):
+                metrics.incr("schema_rejection")
+            reasoning.append(
+                f"Zone planner error: {type(exc).__name__}: {exc}. Falling back to greedy planner."
             )
     plan = greedy_plan(
         power_defs,
@@ -195,8 +219,96 @@ def plan_actions(
     try:
         validate_plan(plan)
     except ValidationError:
+        metrics.incr("schema_rejection")
         reasoning.append("Greedy plan invalid; returning empty plan.")
         plan = {"actions": []}
     if not reasoning:
         reasoning = ["Greedy planner selected minimal valid actions."]
     return plan, reasoning
+
+
+def llm_deadline():
+    """Default speculative LLM deadline in seconds (GRIDGUARDIAN_LLM_DEADLINE); None blocks on the LLM."""
+    value = os.getenv("GRIDGUARDIAN_LLM_DEADLINE", "").strip()
+    return float(value) if value else None
+
+
+def _timed_nemotron(*args):
+    t0 = time.perf_counter()
+    try:
+        return _nemotron_plan(*args), None, time.perf_counter() - t0
+    except Exception as exc:
+        return None, exc, time.perf_counter() - t0
+
+
+def _observe_llm(future):
+    if metrics.enabled() and not future.cancelled():
+        metrics.REGISTRY.observe("llm_plan", future.result()[2])
+
+
+class DeadlinePlanner:
+    """Speculative `plan_actions`: the LLM plan is only used if it is valid by the deadline.
+
+    With `use_llm` the Nemotron call starts on a worker thread while the local
+    `planner` plans on the caller's; at `deadline` (a time.monotonic() value)
+    a validated LLM plan wins, otherwise the local plan is committed. A late
+    call is left to finish in the background and no new one is started until
+    it has, so slow responses never queue up. After each plan, `speculation`
+    records the winner, the outcome (won/late/busy/error) and the LLM time, and
+    `degraded` tells whether the deadline forced the local plan.
+    """
+
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-plan")
+        self._pending = None
+        self.degraded = False
+        self.speculation = None
+
+    def bind(self, deadline):
+        """Callable with `plan_actions`' signature that honours `deadline`."""
+        return lambda *args, **kwargs: self.plan(deadline, *args, **kwargs)
+
+    def plan(self, deadline, *args, use_llm=False, planner="greedy", **kwargs):
+        self.degraded = False
+        self.speculation = None
+        if not use_llm:
+            return plan_actions(*args, planner=planner, **kwargs)
+        metrics.incr("llm_plan_call")
+        future = None
+        if self._pending is None or self._pending.done():
+            self._pending = None
+            # private copies: the local planner below edits its dicts (power_draw) in place
+            llm_args = tuple(dict(a) if isinstance(a, dict) else a for a in args)
+            future = self._pool.submit(_timed_nemotron, *llm_args)
+            future.add_done_callback(_observe_llm)
+        plan, reasoning = plan_actions(*args, planner=planner, **kwargs)
+        llm_s = None
+        if future is None:
+            outcome = "busy"
+            note = f"Nemotron call from an earlier plan still running; committed {planner} plan."
+        else:
+            try:
+                llm_plan, exc, llm_s = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                self._pending = future
+                outcome = "late"
+                note = f"Nemotron plan missed the deadline; committed {planner} plan."
+            else:
+                if exc is None:
+                    self.speculation = {"winner": "nemotron", "outcome": "won", "llm_ms": llm_s * 1000.0}
+                    metrics.incr("llm_speculative_win")
+                    plan, llm_reasoning = llm_plan
+                    return plan, [f"Nemotron plan arrived in {llm_s * 1000.0:.0f} ms, before the deadline."] + llm_reasoning
+                outcome = "error"
+                metrics.incr("llm_fallback")
+                if isinstance(exc, ValidationError):
+                    metrics.incr("schema_rejection")
+                note = f"Nemotron error after {llm_s * 1000.0:.0f} ms: {type(exc).__name__}: {exc}. Committed {planner} plan."
+        if outcome != "error":
+            metrics.incr("llm_deadline_fallback")
+            self.degraded = True
+        self.speculation = {"winner": planner, "outcome": outcome, "llm_ms": None if llm_s is None else llm_s * 1000.0}
+        return plan, [note] + reasoning
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,33 @@
 import os
 import json
-import requests
 import random
 
+import numpy as np
+
+from agents.llm_client import available, chat_json, map_concurrent
+
+GEN_FIELDS = ("power_draw_kw", "cooling_online_kw", "battery_kw", "utilization", "temp_c")
+# inclusive ranges, as drawn by _nemotron_gen_payload; utilization is continuous, the rest integer kW / °C
+BASE_RANGES = {
+    "power_draw_kw": (10, 65),
+    "cooling_online_kw": (5, 20),
+    "battery_kw": (3, 12),
+    "utilization": (0.2, 0.9),
+    "temp_c": (55, 90),
+}
+HOT_RANGES = {"power_draw_kw": (55, 80), "utilization": (0.85, 1.0), "temp_c": (86, 100)}
+DONOR_RANGES = {"power_draw_kw": (10, 25), "battery_kw": (10, 20), "utilization": (0.1, 0.4), "temp_c": (50, 65)}
+# clusters per snapshot given the hot / donor ranges; a value below 1 is a share of the fleet
+STRESS_PROFILES = {
+    "uniform": {},
+    "hot": {"hot": 1},
+    "hot_donor": {"hot": 1, "donor": 1},
+    "heatwave": {"hot": 0.25},
+    "donor_rich": {"hot": 1, "donor": 0.5},
+}
+SAMPLE_BLOCK = 256
+SNAPSHOTS_PER_REQUEST = 4
+
 
 def _nemotron_gen_payload(meta, seed=None):
     clusters = meta["clusters"]
@@ -17,40 +42,139 @@ def _nemotron_gen_payload(meta, seed=None):
     return base
 
 
-def nemotron_generate_scenarios(meta, n=3, seed=None):
-    """Calls Nemotron to propose scenarios; fallback to random sampler."""
+def _draw(rng, field, bounds, size):
+    lo, hi = bounds
+    if field == "utilization":
+        return np.round(rng.uniform(lo, hi, size), 2)
+    return rng.integers(lo, hi + 1, size).astype(np.float64)
+
+
+def _role_count(value, n_clusters):
+    if not value or not n_clusters:
+        return 0
+    return min(n_clusters, int(value) if value >= 1 else max(1, round(value * n_clusters)))
+
+
+def _sample_block(n_clusters, seed, block, profile):
+    rng = np.random.default_rng([seed, block])
+    shape = (SAMPLE_BLOCK, n_clusters)
+    out = {f: _draw(rng, f, BASE_RANGES[f], shape) for f in GEN_FIELDS}
+    hot = _role_count(profile.get("hot"), n_clusters)
+    donor = _role_count(profile.get("donor"), n_clusters - hot)
+    if hot or donor:
+        # random rank per cluster: the lowest `hot` run hot, the next `donor` are donors
+        rank = rng.random(shape).argsort(axis=1).argsort(axis=1)
+        for mask, ranges in ((rank < hot, HOT_RANGES), ((rank >= hot) & (rank < hot + donor), DONOR_RANGES)):
+            for f, bounds in ranges.items():
+                out[f][mask] = _draw(rng, f, bounds, int(mask.sum()))
+    return out
+
+
+def sample_batch(meta, start, stop, seed=0, profile="uniform"):
+    """Scenarios `start..stop` as (scenarios × clusters) arrays per field in GEN_FIELDS.
+
+    Scenarios come from fixed blocks of SAMPLE_BLOCK, each with its own seeded
+    generator, so scenario i depends only on (`seed`, `profile`, i) and any
+    slicing of a run yields the same values. `profile` is a STRESS_PROFILES
+    name or a {"hot": k, "donor": k} dict.
+    """
+    profile = STRESS_PROFILES[profile] if isinstance(profile, str) else profile
+    n_clusters = len(meta["clusters"])
+    first, last = start // SAMPLE_BLOCK, -(-stop // SAMPLE_BLOCK)
+    blocks = [_sample_block(n_clusters, seed, b, profile) for b in range(first, last)]
+    lo = start - first * SAMPLE_BLOCK
+    return {
+        f: (np.concatenate([blk[f] for blk in blocks]) if blocks else np.zeros((0, n_clusters)))[lo : lo + stop - start]
+        for f in GEN_FIELDS
+    }
+
+
+def iter_sample_batches(meta, n, seed=None, profile="uniform", batch_size=SAMPLE_BLOCK):
+    """Yield `(start, batch)` for n sampled scenarios, `batch_size` at a time (see sample_batch)."""
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    for start in range(0, n, batch_size):
+        yield start, sample_batch(meta, start, min(start + batch_size, n), seed, profile)
+
+
+def iter_sampled_scenarios(meta, n, seed=None, profile="uniform", batch_size=SAMPLE_BLOCK):
+    """Stream n sampled scenarios in `_nemotron_gen_payload` shape without building the list."""
+    clusters = meta["clusters"]
+    for _, batch in iter_sample_batches(meta, n, seed, profile, batch_size):
+        rows = {f: batch[f].tolist() for f in GEN_FIELDS}
+        for j in range(len(rows["temp_c"])):
+            yield {f: dict(zip(clusters, rows[f][j])) for f in GEN_FIELDS}
+
+
+def _check_snapshots(payload, clusters):
+    """Usable snapshots of a multi-snapshot response, validated together in one array pass."""
+    snaps = payload.get("snapshots") if isinstance(payload, dict) else None
+    if not isinstance(snaps, list):
+        raise ValueError("response has no 'snapshots' list")
+    values = np.full((len(snaps), len(GEN_FIELDS), len(clusters)), np.nan)
+    for i, snap in enumerate(snaps):
+        try:
+            values[i] = [[float(snap[f][c]) for c in clusters] for f in GEN_FIELDS]
+        except (KeyError, TypeError, ValueError):
+            pass  # left NaN, rejected below
+    util = GEN_FIELDS.index("utilization")
+    ok = np.isfinite(values).all(axis=(1, 2)) & (values >= 0).all(axis=(1, 2)) & (values[:, util] <= 1).all(axis=1)
+    return [{f: dict(zip(clusters, row)) for f, row in zip(GEN_FIELDS, values[i].tolist())} for i in np.flatnonzero(ok)]
+
+
+def _require_snapshots(payload, clusters):
+    if not _check_snapshots(payload, clusters):
+        raise ValueError("response has no usable snapshots")
+
+
+def nemotron_generate_scenarios(meta, n=3, seed=None, concurrency=None, per_request=SNAPSHOTS_PER_REQUEST):
+    """Calls Nemotron to propose scenarios; fallback to random sampler.
+
+    Each request asks for up to `per_request` snapshots, so n scenarios take
+    ceil(n / per_request) requests; a response is validated as a whole and any
+    snapshot missing or rejected is replaced by a local sample. Requests are
+    issued concurrently on the shared client, at most `concurrency` in flight
+    (default: NEMOTRON_CONCURRENCY or llm_client.DEFAULT_CONCURRENCY).
+    """
     key = os.getenv("NEMOTRON_KEY")
-    url = "https://integrate.api.nvidia.com/v1/chat/completions"
     system = (
         "You generate realistic datacenter stress snapshots. "
-        "Output strictly JSON with fields: power_draw_kw, cooling_online_kw, battery_kw, utilization, temp_c. "
-        "Raise heat and load on 1-2 clusters per snapshot; others moderate."
+        "Output strictly JSON: {\"snapshots\": [...]} with exactly `count` objects, each with fields "
+        "power_draw_kw, cooling_online_kw, battery_kw, utilization, temp_c keyed by cluster. "
+        "Raise heat and load on 1-2 clusters per snapshot; others moderate; vary the snapshots."
     )
     scenarios = []
-    if not key:
+    if not available():
         for i in range(n):
             scenarios.append(_nemotron_gen_payload(meta, None if seed is None else seed + i))
         return scenarios, ["Nemotron key missing; returned locally sampled scenarios."]
-    headers = {"Authorization": f"Bearer {key}"}
-    notes = []
-    for i in range(n):
-        user = json.dumps({"clusters": meta["clusters"], "hint": "one hot GPU cluster, one donor"})
-        payload = {
-            "model": "nvidia/nvidia-nemotron-nano-9b-v2",
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            "response_format": {"type": "json_object"},
-        }
+    per_request = max(1, int(per_request))
+
+    def _local(i):
+        return _nemotron_gen_payload(meta, None if seed is None else seed + i)
+
+    def _request(r):
+        first = r * per_request
+        count = min(per_request, n - first)
+        # the variant index keeps the requests (and their cache keys) distinct
+        user = json.dumps(
+            {"clusters": meta["clusters"], "hint": "one hot GPU cluster, one donor", "variant": r, "count": count}
+        )
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            content = resp.json()["choices"][0]["message"]["content"]
-            scenarios.append(json.loads(content))
+            payload = chat_json(system, user, key=key, validate=lambda p: _require_snapshots(p, meta["clusters"]))
+            snaps = _check_snapshots(payload, meta["clusters"])[:count]
         except Exception as exc:
-            notes.append(f"Nemotron error on scenario {i}: {type(exc).__name__}")
-            scenarios.append(_nemotron_gen_payload(meta, None if seed is None else seed + i))
+            return [_local(first + j) for j in range(count)], f"Nemotron error on request {r}: {type(exc).__name__}"
+        note = None
+        if len(snaps) < count:
+            note = f"Nemotron request {r}: {count - len(snaps)} of {count} snapshots missing or invalid"
+        return snaps + [_local(first + j) for j in range(len(snaps), count)], note
+
+    notes = []
+    for batch, note in map_concurrent(_request, range(-(-n // per_request)), concurrency):
+        scenarios.extend(batch)
+        if note:
+            notes.append(note)
     if not notes:
         notes.append("Generated scenarios via Nemotron where possible; fell back to local sampler if errors.")
     return scenarios, notes
@@ -1,12 +1,38 @@
-import json
-from agents.monitor import power_balance, thermal_violations
+from agents.monitor import power_balance, thermal_violations, balance_array, thermal_mask, deficit_mask
+from core.alerts import get_sink
+from core.cluster_state import ClusterState
 
 
-def verify(state, tau=-2.0):
+def _check(state, tau, monitor=None):
+    if monitor is not None:
+        # only clusters touched since the monitor's last refresh are re-examined
+        power = monitor.deficits(tau)
+        bal, therm = monitor.balance, monitor.thermal
+        ok = not (therm.any() or power.any())
+        temp = state.column("temp_c")
+        return ok, state.mapping(bal), state.masked_mapping(temp, therm), state.masked_mapping(bal, power)
+    if isinstance(state, ClusterState):
+        bal = balance_array(state)
+        temp = state.column("temp_c")
+        therm = thermal_mask(temp)
+        power = deficit_mask(bal, tau)
+        ok = not (therm.any() or power.any())
+        return ok, state.mapping(bal), state.masked_mapping(temp, therm), state.masked_mapping(bal, power)
     bal = power_balance(state["base_grid_kw"], state["power_draw_kw"], state["battery_out_kw"])
     therm_bad = thermal_violations(state["temp_c"])
     power_bad = {c: v for c, v in bal.items() if v < tau}
     ok = len(therm_bad) == 0 and len(power_bad) == 0
+    return ok, bal, therm_bad, power_bad
+
+
+def _alert(issues):
+    if issues:
+        return {"level": "CRITICAL", "message": f"Issues detected in {issues}"}
+    return {"level": "OK", "message": "All clusters stable"}
+
+
+def verify(state, tau=-2.0, sink=None, monitor=None):
+    ok, bal, therm_bad, power_bad = _check(state, tau, monitor)
     result = {
         "stable": ok,
         "tau": tau,
@@ -14,13 +40,18 @@ def verify(state, tau=-2.0):
         "thermal_violations": therm_bad,
         "power_deficits": power_bad,
     }
-    if not ok:
-        result["alert"] = {
-            "level": "CRITICAL",
-            "message": f"Issues detected in {list(therm_bad.keys()) + list(power_bad.keys())}",
-        }
-    else:
-        result["alert"] = {"level": "OK", "message": "All clusters stable"}
-    with open("alerts.log", "a") as f:
-        f.write(json.dumps(result["alert"]) + "\n")
+    result["alert"] = _alert(list(therm_bad.keys()) + list(power_bad.keys()))
+    (sink or get_sink()).emit(result["alert"])
     return result
+
+
+def verify_stable(cs, tau, monitor, sink=None):
+    """`verify(cs, tau, sink, monitor)["stable"]`, emitting the same alert without building the result dicts."""
+    power = monitor.deficits(tau)
+    therm = monitor.thermal
+    issues = []
+    if therm.any() or power.any():
+        names = cs.registry.names
+        issues = [names[i] for i in therm.nonzero()[0].tolist() + power.nonzero()[0].tolist()]
+    (sink or get_sink()).emit(_alert(issues))
+    return not issues
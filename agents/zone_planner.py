@@ -0,0 +1,135 @@
+import atexit
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from agents.greedy import DonorPool, greedy_plan
+
+UNZONED = "_unzoned"
+COORDINATOR_DONORS = 32  # best remaining donors each zone offers for cross-zone transfers
+PARALLEL_MIN_CLUSTERS = 20000  # below this, pickling zones to workers costs more than it saves
+
+_pool = None
+_pool_workers = 0
+
+
+def zone_members(clusters, zones):
+    """Ordered {zone: [clusters]} with every cluster in exactly one zone.
+
+    `zones` is the optional `clusters.json` topology `{zone: [cluster, ...]}`;
+    unknown names are ignored, a cluster listed twice stays in its first zone,
+    and clusters in no zone share an implicit `_unzoned` zone.
+    """
+    known = set(clusters)
+    members = {}
+    seen = set()
+    for zone, names in (zones or {}).items():
+        picked = [c for c in names if c in known and c not in seen]
+        seen.update(picked)
+        if picked:
+            members[zone] = picked
+    rest = [c for c in clusters if c not in seen]
+    if rest:
+        members[UNZONED] = rest
+    return members
+
+
+def _plan_zone(power_defs, therm_viol, power_draw, balance, battery_kw, cooling_cap, cooling_on, base_grid):
+    # greedy_plan only iterates power_defs, therm_viol and power_draw (the zone's
+    # own clusters); the other mappings are lookups and may cover the whole fleet
+    leftover = {}
+    plan = greedy_plan(
+        power_defs, therm_viol, balance, battery_kw, cooling_cap, cooling_on, base_grid, power_draw, leftover
+    )
+    spare = heapq.nsmallest(
+        COORDINATOR_DONORS,
+        ((power_draw[d] - base_grid[d], d) for d in power_draw if base_grid[d] - power_draw[d] > 0),
+    )
+    donors = {d: (base_grid[d], power_draw[d]) for _, d in spare}
+    return plan["actions"], leftover, donors, {c: power_draw[c] for c in leftover}
+
+
+def _plan_zone_remote(shard):
+    return _plan_zone(*shard)
+
+
+def _executor(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+@atexit.register
+def _shutdown():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def zone_plan(
+    power_defs,
+    therm_viol,
+    balance,
+    battery_kw,
+    cooling_cap,
+    cooling_on,
+    base_grid,
+    power_draw,
+    zones=None,
+    workers=None,
+    stats=None,
+):
+    """Greedy plan per zone, then a coordinator pass for cross-zone transfers.
+
+    Each zone is planned with `greedy_plan` restricted to its own clusters, so
+    redistribution stays inside the zone; zones run on a process pool when the
+    fleet is large enough to pay for it (`workers` caps the pool, 1 forces
+    serial). Deficits a zone could not cover are then served from the best
+    remaining donors of all zones. The result is one plan: zone actions in zone
+    order followed by the cross-zone redistributions. `stats`, if given,
+    receives the number of zones planned (including the implicit `_unzoned`
+    one) and of cross-zone actions the coordinator added.
+    """
+    members = zone_members(list(power_draw), zones)
+    if stats is not None:
+        stats.update(zones=len(members), cross_zone=0)
+    shared = (balance, battery_kw, cooling_cap, cooling_on, base_grid)
+    shards = [
+        (
+            {c: power_defs[c] for c in names if c in power_defs},
+            {c: therm_viol[c] for c in names if c in therm_viol},
+            {c: power_draw[c] for c in names},
+        )
+        for names in members.values()
+    ]
+    workers = min(os.cpu_count() or 1, len(shards)) if workers is None else min(workers, len(shards))
+    if workers > 1 and len(power_draw) >= PARALLEL_MIN_CLUSTERS:
+        # workers get only their zone's slice of each mapping
+        jobs = [shard + tuple({c: m[c] for c in shard[2]} for m in shared) for shard in shards]
+        results = list(_executor(workers).map(_plan_zone_remote, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        results = [_plan_zone(*shard, *shared) for shard in shards]
+
+    actions, leftover, donor_base, donor_draw, draw = [], {}, {}, {}, {}
+    for zone_actions, zone_left, donors, left_draw in results:
+        actions.extend(zone_actions)
+        leftover.update(zone_left)
+        draw.update(left_draw)
+        for d, (base, cur) in donors.items():
+            donor_base[d], donor_draw[d] = base, cur
+    if not leftover or not donor_draw:
+        return {"actions": actions}
+
+    # coordinator: cross-zone transfers for what the zones could not cover
+    pool = DonorPool(donor_base, donor_draw)
+    for c, need in leftover.items():
+        for d, take in pool.draw(c, need, draw[c]):
+            actions.append({"type": "redistribute", "from": c, "to": d, "kw": round(take, 2)})
+            draw[c] = max(0.0, draw[c] - take)
+            donor_draw[d] += take
+            if stats is not None:
+                stats["cross_zone"] += 1
+    return {"actions": actions}
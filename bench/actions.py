@@ -0,0 +1,74 @@
+"""Plan validation and action dispatch cost for large plans.
+
+    python -m bench.actions --actions 1000 10000 --repeat 5
+
+Compares jsonschema.validate (schema re-checked per call), the compiled
+validator, and validate_plan's fast path; then apply_plan on action dicts
+against pre-parsed agents.actions records.
+"""
+import argparse
+import random
+import time
+
+from jsonschema import validate
+
+from agents.actions import parse_actions
+from agents.executor import apply_plan
+from agents.planner import PLAN_SCHEMA, _PLAN_VALIDATOR, validate_plan
+from bench.fleet import synthetic_fleet
+from core_app import _normalize_cluster_state
+
+
+def synthetic_plan(names, n, seed=0):
+    rnd = random.Random(seed)
+    actions = []
+    for _ in range(n):
+        kind = rnd.choice(("cooling", "battery", "redistribute"))
+        kw = round(rnd.uniform(0.0, 5.0), 2)
+        if kind == "redistribute":
+            src, dst = rnd.sample(names, 2)
+            actions.append({"type": kind, "from": src, "to": dst, "kw": kw})
+        else:
+            actions.append({"type": kind, "cluster": rnd.choice(names), "kw": kw})
+    return {"actions": actions}
+
+
+def _best(fn, setup, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_plan(n, repeat=5, seed=0):
+    cs = _normalize_cluster_state(*synthetic_fleet(max(n // 4, 4), seed))
+    plan = synthetic_plan(list(cs.names), n, seed)
+    records = {"actions": parse_actions(plan)}
+    cap = cs["cooling_capacity_kw"]
+    return {
+        "jsonschema.validate": _best(validate, lambda: (plan, PLAN_SCHEMA), repeat),
+        "compiled validator": _best(_PLAN_VALIDATOR.validate, lambda: (plan,), repeat),
+        "validate_plan": _best(validate_plan, lambda: (plan,), repeat),
+        "parse_actions": _best(parse_actions, lambda: (plan,), repeat),
+        "apply_plan(dicts)": _best(apply_plan, lambda: (cs.copy(), plan, cap), repeat),
+        "apply_plan(records)": _best(apply_plan, lambda: (cs.copy(), records, cap), repeat),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"{'actions':>8} {'stage':>22} {'best_ms':>10} {'us/action':>10}")
+    for n in args.actions:
+        for stage, secs in bench_plan(n, args.repeat, args.seed).items():
+            print(f"{n:>8} {stage:>22} {secs * 1000:>10.3f} {secs / n * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import random
+
+from agents.scenario_gen import _nemotron_gen_payload
+
+
+def synthetic_meta(n, seed=0, zone_size=None):
+    """Cluster metadata for `n` clusters, sampled around the ranges in data/clusters.json.
+
+    With `zone_size`, consecutive clusters are grouped into zones of that size.
+    """
+    rnd = random.Random(seed)
+    clusters = [f"CL{i:06d}" for i in range(n)]
+    meta = {
+        "clusters": clusters,
+        "base_grid_kw": {c: rnd.randint(15, 40) for c in clusters},
+        "cooling_capacity_kw": {c: rnd.randint(15, 50) for c in clusters},
+        "battery_max_kw": {c: rnd.randint(6, 25) for c in clusters},
+    }
+    if zone_size:
+        meta["zones"] = {f"Z{i // zone_size:04d}": clusters[i : i + zone_size] for i in range(0, n, zone_size)}
+    return meta
+
+
+def synthetic_fleet(n, seed=0, zone_size=None):
+    """(meta, snapshot) pair for `n` clusters using the scenario generator's sampler."""
+    meta = synthetic_meta(n, seed, zone_size)
+    state = _nemotron_gen_payload(meta, seed)
+    state["timestep"] = 0
+    return meta, state
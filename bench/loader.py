@@ -0,0 +1,94 @@
+"""Snapshot loading cost: JSON parse + normalize against .ggs binary files.
+
+    python -m bench.loader --sizes 1000 100000 --frames 100 --repeat 3
+
+For each fleet size a scenario is written as pretty-printed JSON (like
+data/scenario_DC_*.json) and as .ggs (float64 and float32). Stages: JSON
+load + normalize, .ggs load (memory-mapped and fully read), and reading the
+last frame of a `--frames` long history (NDJSON scan vs .ggs mmap).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from bench.fleet import synthetic_fleet
+from core.snapfile import SnapshotFile, write_snapshot
+from core_app import _normalize_cluster_state
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _json_load(meta, path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return _normalize_cluster_state(meta, json.load(fh))
+
+
+def _ndjson_last(meta, path):
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            last = line
+    return _normalize_cluster_state(meta, json.loads(last))
+
+
+def _touch(cs):
+    # force mmap pages in, as a planner would
+    return sum(float(cs.column(f).sum()) for f in ("power_draw_kw", "temp_c"))
+
+
+def bench_size(n, frames, repeat, tmp):
+    meta, snap = synthetic_fleet(n)
+    cs = _normalize_cluster_state(meta, snap)
+    paths = {k: os.path.join(tmp, f"{n}{k}") for k in (".json", ".ndjson", "64.ggs", "32.ggs", "hist.ggs")}
+    with open(paths[".json"], "w", encoding="utf-8") as fh:
+        json.dump(snap, fh, indent=2)
+    write_snapshot(paths["64.ggs"], cs)
+    write_snapshot(paths["32.ggs"], cs, "float32")
+
+    history = []
+    for t in range(frames):
+        frame = cs.copy()
+        frame.extra["timestep"] = t
+        history.append(frame)
+    write_snapshot(paths["hist.ggs"], history)
+    with open(paths[".ndjson"], "w", encoding="utf-8") as fh:
+        for t in range(frames):
+            fh.write(json.dumps(dict(snap, timestep=t)) + "\n")
+
+    rows = {
+        "json": _best(lambda: _touch(_json_load(meta, paths[".json"])), repeat),
+        "ggs f64 mmap": _best(lambda: _touch(SnapshotFile(paths["64.ggs"]).state()), repeat),
+        "ggs f64 read": _best(lambda: _touch(SnapshotFile(paths["64.ggs"], mmap=False).state()), repeat),
+        "ggs f32 mmap": _best(lambda: _touch(SnapshotFile(paths["32.ggs"]).state()), repeat),
+        f"ndjson frame {frames - 1}": _best(lambda: _touch(_ndjson_last(meta, paths[".ndjson"])), repeat),
+        f"ggs frame {frames - 1}": _best(lambda: _touch(SnapshotFile(paths["hist.ggs"]).state(-1)), repeat),
+    }
+    sizes = {k: os.path.getsize(p) for k, p in paths.items()}
+    return rows, sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    print(f"{'clusters':>9} {'stage':>18} {'best_ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            rows, sizes = bench_size(n, args.frames, args.repeat, tmp)
+            for stage, secs in rows.items():
+                print(f"{n:>9} {stage:>18} {secs * 1000:>10.2f}")
+            print(f"{n:>9} {'file bytes':>18} " + ", ".join(f"{k}={v}" for k, v in sizes.items()))
+
+
+if __name__ == "__main__":
+    main()
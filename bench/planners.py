@@ -0,0 +1,91 @@
+"""Greedy vs min-cost-flow vs zone-sharded planner: solve time and residual deficit per fleet size.
+
+    python -m bench.planners --sizes 100 1000 10000 --seed 0 --zone-size 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+from agents.executor import apply_plan
+from agents.flow_planner import flow_plan
+from agents.monitor import balance_array, monitor_state
+from agents.planner import greedy_plan
+from agents.zone_planner import zone_plan
+from bench.fleet import synthetic_fleet
+from core.state import TEMP_LIMIT
+from core_app import _normalize_cluster_state
+
+
+def _plan_inputs(cs):
+    bal, therm, defs = monitor_state(cs)
+    return (
+        defs,
+        therm,
+        bal,
+        cs["battery_kw"].copy(),
+        cs["cooling_capacity_kw"].copy(),
+        cs["cooling_online_kw"].copy(),
+        cs["base_grid_kw"].copy(),
+        cs["power_draw_kw"].copy(),
+    )
+
+
+def _outcome(cs, plan):
+    after = cs.copy()
+    apply_plan(after, plan, after["cooling_capacity_kw"])
+    bal = balance_array(after)
+    return float(np.clip(-bal, 0.0, None).sum()), int((after.column("temp_c") > TEMP_LIMIT).sum())
+
+
+PLANNERS = {"greedy": greedy_plan, "flow": flow_plan, "zone": zone_plan}
+
+
+def bench_size(n, seed=0, zone_size=500, planners=("greedy", "flow", "zone")):
+    cs = _normalize_cluster_state(*synthetic_fleet(n, seed, zone_size))
+    before = float(np.clip(-balance_array(cs), 0.0, None).sum())
+    rows = []
+    for name in planners:
+        args = _plan_inputs(cs)
+        kwargs = {}
+        if name == "flow":
+            kwargs = {"temp": cs["temp_c"].copy(), "utilization": cs["utilization"].copy()}
+        elif name == "zone":
+            kwargs = {"zones": cs.extra.get("zones")}
+        fn = PLANNERS[name]
+        t0 = time.perf_counter()
+        plan = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - t0
+        residual, hot = _outcome(cs, plan)
+        rows.append(
+            {
+                "clusters": n,
+                "planner": name,
+                "solve_s": elapsed,
+                "actions": len(plan["actions"]),
+                "deficit_before_kw": before,
+                "residual_deficit_kw": residual,
+                "thermal_violations": hot,
+            }
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zone-size", type=int, default=500, help="clusters per zone for the zone planner")
+    parser.add_argument("--planners", nargs="+", default=list(PLANNERS), choices=list(PLANNERS))
+    args = parser.parse_args(argv)
+    print(f"{'clusters':>9} {'planner':>7} {'solve_s':>9} {'actions':>8} {'deficit_kw':>11} {'residual_kw':>12} {'hot':>6}")
+    for n in args.sizes:
+        for r in bench_size(n, args.seed, args.zone_size, args.planners):
+            print(
+                f"{r['clusters']:>9} {r['planner']:>7} {r['solve_s']:>9.4f} {r['actions']:>8} "
+                f"{r['deficit_before_kw']:>11.1f} {r['residual_deficit_kw']:>12.1f} {r['thermal_violations']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
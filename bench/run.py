@@ -0,0 +1,179 @@
+"""Control-pipeline benchmark: per-stage time and peak memory across fleet sizes.
+
+    python -m bench.run --sizes 4 100 1000 10000 100000 --out bench.json
+    python -m bench.run --baseline bench.json --threshold 0.25
+
+Fleets are sampled with bench.fleet (scenario_gen-style). Every stage is timed
+`--repeat` times (min and median kept), then run once more under tracemalloc
+for its peak allocation. LLM stages talk to a local bench.stub_llm server with
+the response cache off, so the suite runs offline. With `--baseline`, stages
+whose median grew by more than `--threshold` (and by more than `--min-delta-ms`)
+are reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from agents.critic import nemotron_grade
+from agents.executor import apply_plan
+from agents.llm_cache import ResponseCache, set_cache
+from agents.monitor import monitor_state
+from agents.planner import _nemotron_plan, greedy_plan
+from agents.scenario_gen import nemotron_generate_scenarios
+from agents.verifier import verify
+from bench.fleet import synthetic_fleet
+from bench.planners import _plan_inputs
+from bench.stub_llm import serve
+from core.alerts import NULL_SINK
+from core_app import _control_step, _normalize_cluster_state, _normalize_state
+
+DEFAULT_SIZES = [4, 100, 1000, 10000, 100000]
+LLM_STAGES = ("llm_plan", "llm_grade", "llm_scenarios")
+
+
+def _stages(n, seed, tau):
+    """(name, setup, fn) triples for one fleet; `fn(*setup())` is the timed call."""
+    meta, state = synthetic_fleet(n, seed)
+    cs = _normalize_cluster_state(meta, state)
+    # greedy_plan edits power_draw in place, so every call gets fresh inputs
+    plan = greedy_plan(*_plan_inputs(cs))
+    after = cs.copy()
+    apply_plan(after, plan, after["cooling_capacity_kw"])
+    summary = {"stable": False, "balance_after": {}, "plan": plan, "tau": tau}
+    return [
+        ("normalize_state", lambda: (meta, dict(state)), _normalize_state),
+        ("normalize_cluster_state", lambda: (meta, state), _normalize_cluster_state),
+        ("monitor", lambda: (cs,), monitor_state),
+        ("greedy_plan", lambda: _plan_inputs(cs), greedy_plan),
+        ("apply_plan", lambda: (cs.copy(), plan, cs["cooling_capacity_kw"]), apply_plan),
+        ("verify", lambda: (after, tau, NULL_SINK), verify),
+        ("control_step", lambda: (cs.copy(), tau), lambda s, t: _control_step(s, t, sink=NULL_SINK)),
+        ("llm_plan", lambda: _plan_inputs(cs), _nemotron_plan),
+        ("llm_grade", lambda: ({"result": summary},), nemotron_grade),
+        ("llm_scenarios", lambda: (meta,), lambda m: nemotron_generate_scenarios(m, n=1)),
+    ]
+
+
+def _measure(setup, fn, repeat):
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    args = setup()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"min_s": min(times), "median_s": statistics.median(times), "peak_kb": peak / 1024.0}
+
+
+def run(sizes=DEFAULT_SIZES, repeat=3, seed=0, tau=-2.0, stages=None, llm_max=1000, llm_latency=0.0):
+    server = serve(0, llm_latency)
+    os.environ["NEMOTRON_URL"] = server.url
+    os.environ["NEMOTRON_KEY"] = "stub"
+    set_cache(ResponseCache(directory=None, mode="off"))
+    rows = []
+    try:
+        for n in sizes:
+            for name, setup, fn in _stages(n, seed, tau):
+                if stages and name not in stages:
+                    continue
+                if name in LLM_STAGES and n > llm_max:
+                    continue
+                row = {"clusters": n, "stage": name}
+                row.update(_measure(setup, fn, repeat))
+                rows.append(row)
+                print(
+                    f"{n:>7} {name:>24} {row['median_s'] * 1000:>11.3f} {row['min_s'] * 1000:>11.3f} {row['peak_kb']:>11.1f}",
+                    flush=True,
+                )
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+            "repeat": repeat,
+            "tau": tau,
+            "llm_latency_s": llm_latency,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": rows,
+    }
+
+
+def compare(current, baseline, threshold=0.25, min_delta_s=0.0005):
+    """Stages whose median time regressed past `threshold` relative to `baseline`."""
+    base = {(r["clusters"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get((r["clusters"], r["stage"]))
+        if b is None:
+            continue
+        delta = r["median_s"] - b["median_s"]
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] > 0 else float("inf")
+        if ratio > 1.0 + threshold and delta > min_delta_s:
+            regressions.append(
+                {
+                    "clusters": r["clusters"],
+                    "stage": r["stage"],
+                    "baseline_s": b["median_s"],
+                    "current_s": r["median_s"],
+                    "ratio": ratio,
+                }
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tau", type=float, default=-2.0)
+    parser.add_argument("--stages", nargs="+", default=None)
+    parser.add_argument("--llm-max", type=int, default=1000, help="largest fleet sent to the LLM stub")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="stub response delay in seconds")
+    parser.add_argument("--out", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    print(f"{'clusters':>7} {'stage':>24} {'median_ms':>11} {'min_ms':>11} {'peak_kb':>11}")
+    result = run(args.sizes, args.repeat, args.seed, args.tau, args.stages, args.llm_max, args.llm_latency)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(result, baseline, args.threshold, args.min_delta_ms / 1000.0)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['stage']} @ {r['clusters']}: "
+                f"{r['baseline_s'] * 1000:.3f} ms -> {r['current_s'] * 1000:.3f} ms ({r['ratio']:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Local stand-in for the Nemotron chat-completions endpoint.
+
+    python -m bench.stub_llm --port 8808 --latency 0.05
+    export NEMOTRON_URL=http://127.0.0.1:8808/v1/chat/completions NEMOTRON_KEY=stub
+
+Answers planner, critic and scenario-generator prompts with schema-valid JSON
+after an optional fixed latency, and counts requests and TCP connections so
+connection reuse can be checked.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents.scenario_gen import _nemotron_gen_payload
+
+
+def _answer(system, user):
+    if "planner" in system:
+        return {"actions": []}
+    if "auditor" in system:
+        stable = bool(user.get("result", {}).get("stable"))
+        return {"score": 1.0 if stable else 0.0, "notes": "stub critic", "risks": [], "suggestions": []}
+    if "snapshots" in system:
+        meta = {"clusters": user.get("clusters", [])}
+        variant = user.get("variant", 0)
+        # seeded per (variant, index): every request of a batch returns different
+        # snapshots, even when the last request asks for fewer
+        return {"snapshots": [_nemotron_gen_payload(meta, seed=f"{variant}:{i}") for i in range(user.get("count", 1))]}
+    return {}
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, latency=0.0):
+        super().__init__(addr, _Handler)
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.count("requests")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        messages = {m["role"]: m["content"] for m in body.get("messages", [])}
+        try:
+            user = json.loads(messages.get("user", "{}"))
+        except ValueError:
+            user = {}
+        content = _answer(messages.get("system", ""), user)
+        out = json.dumps({"choices": [{"message": {"role": "assistant", "content": json.dumps(content)}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=0, latency=0.0):
+    """Start a stub server on a background thread; returns the server (see `.url`)."""
+    server = StubServer(("127.0.0.1", port), latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Nemotron stub endpoint")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    server = StubServer(("127.0.0.1", args.port), args.latency)
+    print(f"Serving stub Nemotron on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
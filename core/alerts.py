@@ -0,0 +1,177 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+DEFAULT_LOG = "alerts.log"
+
+
+class AlertSink:
+    """Destination for verifier alerts (`{"level": ..., "message": ...}` dicts)."""
+
+    def emit(self, alert):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class NullSink(AlertSink):
+    """Discards alerts; for benchmarks, simulations and batch evaluations."""
+
+    def __init__(self):
+        self.count = 0
+
+    def emit(self, alert):
+        self.count += 1
+
+
+class MemorySink(AlertSink):
+    """Keeps the last `maxlen` alerts in memory."""
+
+    def __init__(self, maxlen=1000):
+        self.maxlen = maxlen
+        self.alerts = []
+        self._lock = threading.Lock()
+
+    def emit(self, alert):
+        with self._lock:
+            self.alerts.append(alert)
+            if len(self.alerts) > self.maxlen:
+                del self.alerts[: len(self.alerts) - self.maxlen]
+
+
+class BufferedFileSink(AlertSink):
+    """JSON-lines alert log with batched writes, size rotation and duplicate suppression.
+
+    Lines are buffered and written once `max_buffer` lines are pending or
+    `flush_interval_s` has passed since the last write; a logged CRITICAL alert
+    is written at once, so it never waits in memory for the next alert. An alert identical to
+    one logged less than `dedupe_window_s` ago is only counted; when the window
+    closes a single `{"level", "message", "repeated": n}` line records how many
+    were suppressed. Before the file would grow past `max_bytes` it is rotated to
+    `path.1` … `path.<backups>`.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_LOG,
+        max_buffer=256,
+        flush_interval_s=1.0,
+        dedupe_window_s=10.0,
+        max_bytes=5 * 1024 * 1024,
+        backups=3,
+    ):
+        self.path = os.fspath(path)
+        self.max_buffer = max_buffer
+        self.flush_interval_s = flush_interval_s
+        self.dedupe_window_s = dedupe_window_s
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.suppressed = 0
+        self._buffer = []
+        self._recent = {}  # (level, message) -> [first_seen, suppressed_count]
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def emit(self, alert):
+        now = time.monotonic()
+        key = (alert.get("level"), alert.get("message"))
+        with self._lock:
+            seen = self._recent.get(key)
+            if seen is not None and now - seen[0] < self.dedupe_window_s:
+                seen[1] += 1
+                self.suppressed += 1
+            else:
+                if seen is not None and seen[1]:
+                    self._buffer.append(self._repeat_line(key, seen[1]))
+                self._recent[key] = [now, 0]
+                self._buffer.append(json.dumps(alert))
+                if key[0] == "CRITICAL":
+                    self._flush_locked(now)
+                    return
+            if len(self._buffer) >= self.max_buffer or now - self._last_flush >= self.flush_interval_s:
+                self._flush_locked(now)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked(time.monotonic())
+
+    def close(self):
+        with self._lock:
+            for key, seen in self._recent.items():
+                if seen[1]:
+                    self._buffer.append(self._repeat_line(key, seen[1]))
+                    seen[1] = 0
+            self._flush_locked(time.monotonic())
+
+    def _repeat_line(self, key, count):
+        return json.dumps({"level": key[0], "message": key[1], "repeated": count, "window_s": self.dedupe_window_s})
+
+    def _flush_locked(self, now):
+        # close finished dedupe windows so their counts are not held forever
+        for key in [k for k, seen in self._recent.items() if now - seen[0] >= self.dedupe_window_s]:
+            count = self._recent.pop(key)[1]
+            if count:
+                self._buffer.append(self._repeat_line(key, count))
+        self._last_flush = now
+        if not self._buffer:
+            return
+        data = "\n".join(self._buffer) + "\n"
+        self._buffer.clear()
+        self._rotate_if_needed(len(data.encode("utf-8")))
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(data)
+
+    def _rotate_if_needed(self, incoming):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    """Process-wide default sink: a BufferedFileSink on alerts.log, flushed at exit."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = BufferedFileSink(DEFAULT_LOG)
+        return _sink
+
+
+def set_sink(sink):
+    """Replace the default sink, closing the previous one."""
+    global _sink
+    with _sink_lock:
+        previous, _sink = _sink, sink
+    if previous is not None and previous is not sink:
+        previous.close()
+
+
+@atexit.register
+def _close_default():
+    with _sink_lock:
+        sink = _sink
+    if sink is not None:
+        sink.close()
+
+
+NULL_SINK = NullSink()
@@ -0,0 +1,203 @@
+import json
+import sys
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+STATIC_FIELDS = ("base_grid_kw", "cooling_capacity_kw", "battery_max_kw")
+DYNAMIC_FIELDS = (
+    "power_draw_kw",
+    "cooling_online_kw",
+    "battery_kw",
+    "utilization",
+    "temp_c",
+    "battery_out_kw",
+)
+FIELDS = STATIC_FIELDS + DYNAMIC_FIELDS
+
+_REGISTRY_CACHE_MAX = 64
+_registries = {}
+
+
+class ClusterRegistry:
+    """Interned cluster names mapped to stable column indices."""
+
+    __slots__ = ("names", "index")
+
+    def __init__(self, names):
+        self.names = tuple(sys.intern(str(n)) for n in names)
+        self.index = {n: i for i, n in enumerate(self.names)}
+
+    @classmethod
+    def get(cls, names):
+        key = tuple(names)
+        reg = _registries.get(key)
+        if reg is None:
+            if len(_registries) >= _REGISTRY_CACHE_MAX:
+                _registries.clear()
+            reg = _registries[key] = cls(key)
+        return reg
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+
+def ensure_column(val, keys, default=0.0):
+    """Array counterpart of `_ensure_map`: mapping → per-key values, scalar → first key only."""
+    n = len(keys)
+    if isinstance(val, Mapping):
+        return np.fromiter((float(val.get(k, default)) for k in keys), dtype=np.float64, count=n)
+    if isinstance(val, np.ndarray) and val.shape == (n,):
+        return val.astype(np.float64)
+    col = np.full(n, float(default), dtype=np.float64)
+    try:
+        scalar = float(val)
+    except Exception:
+        return col
+    if n:
+        col[0] = scalar
+    return col
+
+
+def json_safe(value):
+    """True if `value` serializes with json.dumps (extras kept by shared memory and .ggs files)."""
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class ColumnView(MutableMapping):
+    """Dict-style `state[field][cluster]` access onto one ClusterState column."""
+
+    __slots__ = ("_state", "_field")
+
+    def __init__(self, state, field):
+        self._state = state
+        self._field = field
+
+    def __getitem__(self, cluster):
+        return float(self._state.column(self._field)[self._state.registry.index[cluster]])
+
+    def __setitem__(self, cluster, value):
+        self._state.writable(self._field)[self._state.registry.index[cluster]] = value
+
+    def __delitem__(self, cluster):
+        raise TypeError("ClusterState columns have a fixed cluster layout")
+
+    def __iter__(self):
+        return iter(self._state.registry.names)
+
+    def __len__(self):
+        return len(self._state.registry)
+
+    def __contains__(self, cluster):
+        return cluster in self._state.registry.index
+
+    def copy(self):
+        return self._state.mapping(self._state.column(self._field))
+
+    def array(self):
+        return self._state.column(self._field)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+class ClusterState:
+    """Fleet state stored as one contiguous float64 column per field.
+
+    Indexing by field name returns a `ColumnView`, so code written against the
+    dict-of-dicts state (tools, planners) keeps working unchanged.
+
+    `freeze()` makes every column read-only so a state can be cached and shared;
+    `overlay()` gives a copy-on-write state that borrows the parent's columns and
+    copies one only when it is first written through `writable()`.
+    """
+
+    def __init__(self, registry, columns, extra=None, shared=()):
+        self.registry = registry
+        self._columns = columns
+        self._shared = set(shared)
+        self.extra = dict(extra or {})
+
+    @classmethod
+    def from_dict(cls, state, keys=None):
+        keys = list(keys if keys is not None else state["clusters"])
+        registry = ClusterRegistry.get(keys)
+        columns = {f: ensure_column(state.get(f), registry.names, 0.0) for f in FIELDS}
+        extra = {k: v for k, v in state.items() if k not in columns and k != "clusters"}
+        return cls(registry, columns, extra)
+
+    @property
+    def names(self):
+        return self.registry.names
+
+    @property
+    def size(self):
+        return len(self.registry)
+
+    def column(self, field):
+        """Current array for `field`; may be a read-only array shared with a snapshot."""
+        return self._columns[field]
+
+    def writable(self, field):
+        """Array for `field` that is safe to modify in place (copied on first write)."""
+        if field in self._shared:
+            self._columns[field] = self._columns[field].copy()
+            self._shared.discard(field)
+        return self._columns[field]
+
+    def freeze(self):
+        for col in self._columns.values():
+            col.flags.writeable = False
+        self._shared.clear()
+        return self
+
+    def overlay(self):
+        return ClusterState(self.registry, dict(self._columns), self.extra, shared=self._columns)
+
+    def mapping(self, values):
+        return dict(zip(self.registry.names, values.tolist()))
+
+    def masked_mapping(self, values, mask):
+        names = self.registry.names
+        return {names[i]: v for i, v in zip(mask.nonzero()[0].tolist(), values[mask].tolist())}
+
+    def copy(self):
+        return ClusterState(self.registry, {f: c.copy() for f, c in self._columns.items()}, self.extra)
+
+    def to_dict(self):
+        out = dict(self.extra)
+        out.update({f: self.mapping(c) for f, c in self._columns.items()})
+        out["clusters"] = list(self.registry.names)
+        return out
+
+    def __getitem__(self, key):
+        if key in self._columns:
+            return ColumnView(self, key)
+        if key == "clusters":
+            return list(self.registry.names)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key == "clusters":
+            raise TypeError("ClusterState cluster layout is fixed; build a new state instead")
+        if key in self._columns:
+            self._columns[key] = ensure_column(value, self.registry.names, 0.0)
+            self._shared.discard(key)
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._columns or key == "clusters" or key in self.extra
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
@@ -0,0 +1,101 @@
+"""N-1 / N-2 contingency screening over a shared base state.
+
+A fault removes one resource of one cluster:
+
+    cooling   cooling unit lost: online and capacity go to 0 and the cluster
+              heats up by ALPHA per lost kW (the tools' per-kW effect)
+    battery   battery lost: stored energy and capacity go to 0
+    grid      grid feed lost: base_grid_kw goes to 0
+
+Every combination is applied to an overlay of the frozen base (only the faulted
+columns are copied), then planned, executed and verified like a normal control
+step. It is critical when the controlled state is worse than the controlled
+base: a violation the base does not have, or more deficit or heat. Faults that
+change nothing (a battery the cluster does not have) are dropped, and since
+faults only remove capacity, a combination containing a critical one is
+dominated by it and not evaluated.
+"""
+import itertools
+import math
+
+import numpy as np
+
+from agents.monitor import balance_array, deficit_mask, thermal_mask
+from core.state import ALPHA, TEMP_LIMIT
+
+FAULT_KINDS = ("cooling", "battery", "grid")
+WORSE_EPS = 1e-6
+_FAULT_FIELDS = {
+    "cooling": ("cooling_online_kw", "cooling_capacity_kw"),
+    "battery": ("battery_kw", "battery_max_kw"),
+    "grid": ("base_grid_kw",),
+}
+
+
+def apply_fault(cs, kind, i):
+    """Apply fault `kind` to cluster index `i` of `cs` in place."""
+    if kind == "cooling":
+        cs.writable("temp_c")[i] += ALPHA * cs.column("cooling_online_kw")[i]
+    for f in _FAULT_FIELDS[kind]:
+        cs.writable(f)[i] = 0.0
+
+
+def single_faults(base, kinds=FAULT_KINDS):
+    """`(kind, index)` faults that change `base`; returns (faults, number dropped as no-ops)."""
+    faults, dropped = [], 0
+    for kind in kinds:
+        if kind not in _FAULT_FIELDS:
+            raise ValueError(f"Unknown fault {kind!r}; expected one of {FAULT_KINDS}")
+        live = np.zeros(base.size, dtype=bool)
+        for f in _FAULT_FIELDS[kind]:
+            live |= base.column(f) != 0
+        faults.extend((kind, int(i)) for i in np.flatnonzero(live))
+        dropped += int(base.size - live.sum())
+    return faults, dropped
+
+
+def combinations(faults, order, critical):
+    """Combinations of `order` faults, minus those containing a critical (lower-order) combination.
+
+    Returns (combos, number dominated).
+    """
+    critical = {frozenset(c) for c in critical}
+    singles = {f for c in critical if len(c) == 1 for f in c}
+    eligible = [f for f in faults if f not in singles]
+    combos = [
+        combo
+        for combo in itertools.combinations(eligible, order)
+        if not any(frozenset(sub) in critical for r in range(2, order) for sub in itertools.combinations(combo, r))
+    ]
+    return combos, math.comb(len(faults), order) - len(combos)
+
+
+def outcome(cs, tau, base=None):
+    """Severity of a controlled state; with `base` (the base's outcome) also whether it is critical."""
+    bal = balance_array(cs)
+    temp = cs.column("temp_c")
+    bad = thermal_mask(temp) | deficit_mask(bal, tau)
+    result = {
+        "stable": not bad.any(),
+        "violations": [cs.names[i] for i in np.flatnonzero(bad).tolist()],
+        "deficit_kw": float(np.clip(tau - bal, 0.0, None).sum()),
+        "heat_c": float(np.clip(temp - TEMP_LIMIT, 0.0, None).sum()),
+        "min_balance_kw": float(bal.min()) if len(bal) else 0.0,
+        "max_temp_c": float(temp.max()) if len(temp) else 0.0,
+    }
+    if base is not None:
+        known = set(base["violations"])
+        result["new_violations"] = [c for c in result["violations"] if c not in known]
+        result["critical"] = bool(
+            result["new_violations"]
+            or result["deficit_kw"] > base["deficit_kw"] + WORSE_EPS
+            or result["heat_c"] > base["heat_c"] + WORSE_EPS
+        )
+    return result
+
+
+def rank(results):
+    """Critical results, most severe first: new violations, then deficit, then heat, then fewer faults."""
+    critical = [r for r in results if r["critical"]]
+    critical.sort(key=lambda r: (-len(r["new_violations"]), -r["deficit_kw"], -r["heat_c"], len(r["faults"])))
+    return critical
@@ -0,0 +1,175 @@
+"""Headless fixed-rate controller.
+
+    python -m core.daemon --scenario A --period 1.0
+    python -m core.daemon --source unix:/run/gg.sock --period 0.5 --use-llm --metrics-port 9464
+
+Runs monitor → plan → execute → verify once per control period on a drifting
+plant (`--scenario`) or on the newest telemetry snapshot (`--source`, see
+core/ingest.py). Each tick prints one JSON line. SIGINT/SIGTERM finish the
+current tick, then flush alerts, history and metrics and print final stats.
+"""
+import argparse
+import json
+import math
+import signal
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from core import metrics
+
+DEFAULT_PERIOD_S = 1.0
+PLAN_BUDGET = 0.8  # share of the period an LLM plan may take before the tick degrades
+STAT_SAMPLES = 10000
+
+
+def _ms(values):
+    if not len(values):
+        return {}
+    arr = np.asarray(values) * 1000.0
+    p50, p99 = np.percentile(arr, [50, 99]).tolist()
+    return {"mean": float(arr.mean()), "p50": p50, "p99": p99, "max": float(arr.max())}
+
+
+class FixedRateLoop:
+    """Call `tick(deadline)` every `period_s` on the monotonic clock.
+
+    Tick k is scheduled at start + k·period and must finish by the next slot
+    (`deadline`). Jitter (actual minus scheduled start) and duration are kept
+    per tick; a tick that ends after its deadline is a miss, and any slots it
+    overran are skipped rather than run back to back, so latency never
+    accumulates. A tick may return a dict with `"degraded": True` to report
+    that it cut corners to stay on time. `on_stop` runs once the loop ends, for
+    flushing state. Spans `tick` / `tick_jitter` and counters
+    `tick_deadline_miss`, `tick_skipped`, `tick_degraded` go to core/metrics.py.
+    """
+
+    def __init__(self, tick, period_s=DEFAULT_PERIOD_S, max_ticks=None, on_tick=None, on_stop=None):
+        if period_s <= 0:
+            raise ValueError("period_s must be positive")
+        self.tick = tick
+        self.period_s = period_s
+        self.max_ticks = max_ticks
+        self.on_tick = on_tick
+        self.on_stop = on_stop
+        self.counters = {"ticks": 0, "deadline_misses": 0, "skipped": 0, "degraded": 0, "errors": 0}
+        self._jitter = deque(maxlen=STAT_SAMPLES)
+        self._duration = deque(maxlen=STAT_SAMPLES)
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        """Tick until `stop()` (or `max_ticks`), then call `on_stop`; returns `stats()`."""
+        try:
+            self._loop()
+        finally:
+            if self.on_stop is not None:
+                self.on_stop()
+        return self.stats()
+
+    def _loop(self):
+        start = time.monotonic()
+        slot = 0
+        while not self._stop.is_set():
+            if self.max_ticks is not None and self.counters["ticks"] >= self.max_ticks:
+                break
+            scheduled = start + slot * self.period_s
+            if self._stop.wait(max(0.0, scheduled - time.monotonic())):
+                break
+            began = time.monotonic()
+            deadline = scheduled + self.period_s
+            try:
+                with metrics.span("tick"):
+                    result = self.tick(deadline)
+            except Exception as exc:
+                self.counters["errors"] += 1
+                metrics.incr("tick_error")
+                result = {"error": f"{type(exc).__name__}: {exc}"}
+            ended = time.monotonic()
+            jitter, duration = began - scheduled, ended - began
+            self._jitter.append(jitter)
+            self._duration.append(duration)
+            self.counters["ticks"] += 1
+            if metrics.enabled():
+                metrics.REGISTRY.observe("tick_jitter", jitter)
+            missed = ended > deadline
+            if missed:
+                self.counters["deadline_misses"] += 1
+                metrics.incr("tick_deadline_miss")
+            if isinstance(result, dict) and result.get("degraded"):
+                self.counters["degraded"] += 1
+                metrics.incr("tick_degraded")
+            # next slot that has not started yet; overrun slots are dropped
+            following = max(slot + 1, math.ceil((ended - start) / self.period_s))
+            if following > slot + 1:
+                self.counters["skipped"] += following - slot - 1
+                metrics.incr("tick_skipped", following - slot - 1)
+            slot = following
+            if self.on_tick is not None:
+                self.on_tick(
+                    {"tick": self.counters["ticks"], "jitter_ms": jitter * 1000.0, "duration_ms": duration * 1000.0,
+                     "deadline_miss": missed, "result": result}
+                )
+
+    def stats(self):
+        out = dict(self.counters)
+        out["period_s"] = self.period_s
+        out["jitter_ms"] = _ms(self._jitter)
+        out["duration_ms"] = _ms(self._duration)
+        return out
+
+
+def main(argv=None):
+    # the control step itself lives in core_app (daemon_dc)
+    import core_app
+
+    parser = argparse.ArgumentParser(description="Headless fixed-rate GridGuardian controller")
+    parser.add_argument("--scenario", default="A", help="scenario id or .ggs path for the simulated plant")
+    parser.add_argument("--source", help="telemetry spec (NDJSON path, unix:/path, tcp:host:port) instead of the plant")
+    parser.add_argument("--period", type=float, default=DEFAULT_PERIOD_S)
+    parser.add_argument("--tau", type=float, default=-2.0)
+    parser.add_argument("--planner", default="greedy")
+    parser.add_argument("--use-llm", action="store_true")
+    parser.add_argument("--ticks", type=int, default=None, help="stop after this many ticks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--metrics-port", type=int, default=None)
+    parser.add_argument("--metrics-file", default=None, help="Prometheus textfile written every tick and on exit")
+    parser.add_argument("--quiet", action="store_true", help="no per-tick lines")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port)
+
+    def on_tick(info):
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file)
+        if not args.quiet:
+            sys.stdout.write(json.dumps(info, default=str) + "\n")
+            sys.stdout.flush()
+
+    daemon = core_app.daemon_dc(
+        args.scenario,
+        tau=args.tau,
+        use_llm=args.use_llm,
+        planner=args.planner,
+        period_s=args.period,
+        source=args.source,
+        seed=args.seed,
+        max_ticks=args.ticks,
+        on_tick=on_tick,
+    )
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: daemon.stop())
+    stats = daemon.run()
+    if args.metrics_file:
+        metrics.write_textfile(args.metrics_file)
+    sys.stdout.write(json.dumps({"stats": stats}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import json
+import os
+import queue
+import socket
+import stat
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+OVERLOAD_POLICIES = ("block", "drop_oldest", "coalesce")
+LATENCY_SAMPLES = 10000
+
+
+def _parse_lines(lines, errors):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            snap = json.loads(line)
+        except ValueError:
+            errors[0] += 1
+            continue
+        if isinstance(snap, dict):
+            yield snap
+        else:
+            errors[0] += 1
+
+
+def ndjson_source(path, follow=False, poll_s=0.1, errors=None):
+    """Yield snapshots from an NDJSON file or named pipe (one JSON object per line).
+
+    With `follow=True` the file is tailed like `tail -f`; a line still being
+    written (no trailing newline yet) is held until it is complete. A FIFO
+    simply blocks until a writer sends data and ends when the last writer
+    closes, with or without `follow`.
+    """
+    errors = errors if errors is not None else [0]
+    with open(path, "r", encoding="utf-8") as fh:
+        if not follow:
+            yield from _parse_lines(fh, errors)
+            return
+        fifo = stat.S_ISFIFO(os.fstat(fh.fileno()).st_mode)
+        partial = ""
+        while True:
+            line = fh.readline()
+            if line:
+                partial += line
+            elif fifo:
+                yield from _parse_lines([partial], errors)
+                return
+            if not partial.endswith("\n"):
+                time.sleep(poll_s)
+                continue
+            line, partial = partial, ""
+            yield from _parse_lines([line], errors)
+
+
+def socket_source(address, errors=None):
+    """Listen on `unix:/path` or `tcp:host:port` and yield NDJSON snapshots from each client in turn."""
+    errors = errors if errors is not None else [0]
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if os.path.exists(path):
+            os.remove(path)
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        srv.bind(path)
+    elif address.startswith("tcp:"):
+        host, port = address[len("tcp:"):].rsplit(":", 1)
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((host, int(port)))
+    else:
+        raise ValueError(f"Unsupported socket address {address!r}; use unix:/path or tcp:host:port")
+    srv.listen(1)
+    try:
+        while True:
+            conn, _ = srv.accept()
+            with conn, conn.makefile("r", encoding="utf-8") as fh:
+                yield from _parse_lines(fh, errors)
+    finally:
+        srv.close()
+
+
+def open_source(spec, follow=False, errors=None):
+    """Source from a spec string: `unix:/path`, `tcp:host:port`, or a file / FIFO path."""
+    if spec.startswith(("unix:", "tcp:")):
+        return socket_source(spec, errors=errors)
+    return ndjson_source(spec, follow=follow, errors=errors)
+
+
+def _coalesce(older, newer):
+    merged = dict(older)
+    for k, v in newer.items():
+        if isinstance(v, dict) and isinstance(merged.get(k), dict):
+            merged[k] = {**merged[k], **v}
+        else:
+            merged[k] = v
+    return merged
+
+
+class TelemetryPipeline:
+    """Bounded ingestion stage between a snapshot source and a `process` callback.
+
+    A reader thread pulls snapshots from `source` into a queue of `maxsize`
+    items. When the queue is full, `overload` decides what happens: "block"
+    stops reading (backpressure on the producer), "drop_oldest" discards the
+    stalest pending snapshot, and "coalesce" folds the stalest pending snapshot
+    into the new one field by field, so partial updates are not lost. Iterating
+    the pipeline runs `process(snapshot)` for every snapshot that gets through
+    and yields its result with `seq` and end-to-end `latency_ms` (arrival to
+    processed; for a coalesced snapshot, arrival of its oldest part) added.
+    """
+
+    def __init__(self, source, process, maxsize=64, overload="drop_oldest", parse_errors=None):
+        if overload not in OVERLOAD_POLICIES:
+            raise ValueError(f"Unknown overload policy {overload!r}; expected one of {OVERLOAD_POLICIES}")
+        self.source = source
+        self.process = process
+        self.overload = overload
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._error = None
+        self._parse_errors = parse_errors if parse_errors is not None else [0]
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._started = None
+        self._finished = None
+        self.counters = {"received": 0, "processed": 0, "dropped": 0, "coalesced": 0, "high_water": 0}
+
+    def _offer(self, item):
+        if self.overload == "block":
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            return
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            try:
+                stale = self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            with self._lock:
+                if self.overload == "coalesce":
+                    # keep the older arrival so latency covers the longest-waiting data
+                    item = (stale[0], _coalesce(stale[1], item[1]))
+                    self.counters["coalesced"] += 1
+                else:
+                    self.counters["dropped"] += 1
+
+    def _read(self):
+        try:
+            for snap in self.source:
+                if self._stop.is_set():
+                    break
+                with self._lock:
+                    self.counters["received"] += 1
+                self._offer((time.perf_counter(), snap))
+                with self._lock:
+                    self.counters["high_water"] = max(self.counters["high_water"], self._queue.qsize())
+        except Exception as exc:
+            self._error = exc
+        finally:
+            # end-of-stream marker; give up once the consumer has gone, so a full queue cannot block forever
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def __iter__(self):
+        self._started = time.perf_counter()
+        threading.Thread(target=self._read, name="telemetry-reader", daemon=True).start()
+        seq = 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                arrived, snap = item
+                result = self.process(snap)
+                latency = time.perf_counter() - arrived
+                with self._lock:
+                    self.counters["processed"] += 1
+                    self._latencies.append(latency)
+                result["seq"] = seq
+                result["latency_ms"] = latency * 1000.0
+                seq += 1
+                yield result
+        finally:
+            self._stop.set()
+            self._finished = time.perf_counter()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        self._stop.set()
+
+    def stats(self):
+        with self._lock:
+            out = dict(self.counters)
+            out["parse_errors"] = self._parse_errors[0]
+            lat = np.array(self._latencies) * 1000.0
+        end = self._finished or time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        out["elapsed_s"] = elapsed
+        out["throughput_per_s"] = out["processed"] / elapsed if elapsed > 0 else 0.0
+        if len(lat):
+            p50, p90, p99 = np.percentile(lat, [50, 90, 99]).tolist()
+            out["latency_ms"] = {"mean": float(lat.mean()), "p50": p50, "p90": p90, "p99": p99, "max": float(lat.max())}
+        else:
+            out["latency_ms"] = {}
+        return out
+
+
+class LatestSnapshot:
+    """Reader thread keeping only the newest state from `source`, for fixed-rate consumers.
+
+    Snapshots that arrive between two `take()` calls are coalesced like the
+    pipeline's "coalesce" policy, so a partial update is never lost, only
+    merged into the next one.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.error = None
+        self.finished = False
+        self.counters = {"received": 0, "taken": 0, "coalesced": 0}
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        threading.Thread(target=self._read, name="telemetry-latest", daemon=True).start()
+
+    def _read(self):
+        try:
+            for snap in self.source:
+                if self._stop.is_set():
+                    break
+                with self._lock:
+                    self.counters["received"] += 1
+                    if self._pending is not None:
+                        snap = _coalesce(self._pending, snap)
+                        self.counters["coalesced"] += 1
+                    self._pending = snap
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.finished = True
+
+    def take(self):
+        """Newest snapshot since the last call, or None if nothing new arrived."""
+        with self._lock:
+            snap, self._pending = self._pending, None
+            if snap is not None:
+                self.counters["taken"] += 1
+        return snap
+
+    def close(self):
+        self._stop.set()
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import deque
+
+DEFAULT_INTERVAL_S = 1.0
+DEFAULT_KEEP = 300
+
+
+class LiveController:
+    """Background thread calling `step()` every `interval_s` and publishing its results.
+
+    The newest result and the last `keep` results are readable from any thread
+    through `latest()` / `recent()`; `tick` counts completed steps, so readers can
+    cheaply tell whether anything changed since they last looked. `history` is
+    an optional time-series store the steps record into, for readers to chart.
+    An exception from `step` is kept in `error` and stops the loop.
+    """
+
+    def __init__(self, step, interval_s=DEFAULT_INTERVAL_S, keep=DEFAULT_KEEP, name="gridguardian-live", history=None):
+        self.step = step
+        self.interval_s = interval_s
+        self.history = history
+        self.tick = 0
+        self.error = None
+        self._results = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                result = self.step()
+            except Exception as exc:  # surfaced to readers via .error
+                self.error = exc
+                return
+            with self._lock:
+                self._results.append(result)
+                self.tick += 1
+            deadline += self.interval_s
+            # fixed rate; after an overrun, restart the schedule from now
+            deadline = max(deadline, time.monotonic())
+            self._stop.wait(deadline - time.monotonic())
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def latest(self):
+        with self._lock:
+            return self._results[-1] if self._results else None
+
+    def recent(self):
+        with self._lock:
+            return list(self._results)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -0,0 +1,283 @@
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS_S = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+WINDOW_S = 300.0
+WINDOW_SLOTS = 10
+WINDOW_QUANTILES = (0.5, 0.9, 0.99)
+PREFIX = "gridguardian"
+
+# GRIDGUARDIAN_METRICS=0 turns spans and counters into no-ops
+_enabled = os.getenv("GRIDGUARDIAN_METRICS", "1").lower() not in ("0", "false", "off")
+_current = contextvars.ContextVar("gridguardian_trace", default=None)
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(flag):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def _cumulate(counts):
+    cumulative = []
+    running = 0
+    for c in counts:
+        running += c
+        cumulative.append(running)
+    return cumulative
+
+
+class RollingHistogram:
+    """Histogram over the last `window_s` seconds, kept as `slots` rotating sub-histograms.
+
+    A lifetime histogram that never rotates is kept alongside (`lifetime()`),
+    since only monotonic bucket counts are valid Prometheus histograms.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_S, window_s=WINDOW_S, slots=WINDOW_SLOTS):
+        self.buckets = tuple(buckets)
+        self.slot_s = window_s / slots
+        self._slots = [[0] * (len(self.buckets) + 1) + [0.0] for _ in range(slots)]
+        self._epochs = [-1] * slots
+        self._lifetime = [0] * (len(self.buckets) + 1) + [0.0]
+
+    def _slot(self, now):
+        epoch = int(now // self.slot_s)
+        i = epoch % len(self._slots)
+        if self._epochs[i] != epoch:
+            # slot last used a full window ago; start it over
+            self._slots[i] = [0] * (len(self.buckets) + 1) + [0.0]
+            self._epochs[i] = epoch
+        return self._slots[i]
+
+    def observe(self, value, now=None):
+        slot = self._slot(time.monotonic() if now is None else now)
+        i = bisect_left(self.buckets, value)
+        slot[i] += 1
+        slot[-1] += value
+        self._lifetime[i] += 1
+        self._lifetime[-1] += value
+
+    def lifetime(self):
+        """(cumulative counts per bucket incl. +Inf, sum, count) since creation; never decreases."""
+        cumulative = _cumulate(self._lifetime[:-1])
+        return cumulative, self._lifetime[-1], cumulative[-1]
+
+    def snapshot(self, now=None):
+        """(cumulative counts per bucket incl. +Inf, sum, count) over the live window."""
+        now = time.monotonic() if now is None else now
+        oldest = int(now // self.slot_s) - len(self._slots) + 1
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for epoch, slot in zip(self._epochs, self._slots):
+            if epoch < oldest:
+                continue
+            for i in range(len(counts)):
+                counts[i] += slot[i]
+            total += slot[-1]
+        cumulative = _cumulate(counts)
+        return cumulative, total, cumulative[-1]
+
+    def quantile(self, q, now=None):
+        """Estimated `q` quantile over the live window (linear within a bucket), None if empty."""
+        cumulative, _, count = self.snapshot(now)
+        if not count:
+            return None
+        rank = q * count
+        i = next(i for i, c in enumerate(cumulative) if c >= rank)
+        if i >= len(self.buckets):
+            return self.buckets[-1]
+        lower = self.buckets[i - 1] if i else 0.0
+        below = cumulative[i - 1] if i else 0
+        in_bucket = cumulative[i] - below
+        return lower + (self.buckets[i] - lower) * ((rank - below) / in_bucket if in_bucket else 1.0)
+
+
+class Registry:
+    """Process-wide phase histograms and event counters."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_S, window_s=WINDOW_S, slots=WINDOW_SLOTS):
+        self.buckets = buckets
+        self.window_s = window_s
+        self.slots = slots
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            hist = self.histograms.get(phase)
+            if hist is None:
+                hist = self.histograms[phase] = RollingHistogram(self.buckets, self.window_s, self.slots)
+            hist.observe(seconds)
+
+    def incr(self, event, n=1):
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self):
+        """Prometheus text exposition (format 0.0.4)."""
+        now = time.monotonic()
+        with self._lock:
+            hists = {p: h.lifetime() for p, h in self.histograms.items()}
+            window = {
+                p: (h.snapshot(now)[2], [(q, h.quantile(q, now)) for q in WINDOW_QUANTILES])
+                for p, h in self.histograms.items()
+            }
+            counters = dict(self.counters)
+        name = f"{PREFIX}_phase_seconds"
+        lines = [
+            f"# HELP {name} Control pipeline phase durations since process start.",
+            f"# TYPE {name} histogram",
+        ]
+        for phase in sorted(hists):
+            cumulative, total, count = hists[phase]
+            for bound, c in zip(self.buckets, cumulative):
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound:g}"}} {c}')
+            lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {cumulative[-1]}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {total:.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {count}')
+        # the rolling window goes down as slots rotate, so it is published as gauges
+        name = f"{PREFIX}_phase_window_seconds"
+        lines += [
+            f"# HELP {name} Estimated phase duration quantiles over the last {self.window_s:g}s.",
+            f"# TYPE {name} gauge",
+        ]
+        for phase in sorted(window):
+            for q, value in window[phase][1]:
+                if value is not None:
+                    lines.append(f'{name}{{phase="{phase}",quantile="{q:g}"}} {value:.6f}')
+        name = f"{PREFIX}_phase_window_count"
+        lines += [f"# HELP {name} Phase observations over the last {self.window_s:g}s.", f"# TYPE {name} gauge"]
+        for phase in sorted(window):
+            lines.append(f'{name}{{phase="{phase}"}} {window[phase][0]}')
+        name = f"{PREFIX}_events_total"
+        lines += [f"# HELP {name} Control pipeline events since process start.", f"# TYPE {name} counter"]
+        for event in sorted(counters):
+            lines.append(f'{name}{{event="{event}"}} {counters[event]}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Trace:
+    """Phase timings (ms, summed per phase) and event counts for one call."""
+
+    __slots__ = ("timings", "counters")
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+
+
+class _Span:
+    __slots__ = ("phase", "trace", "t0")
+
+    def __init__(self, phase, trace):
+        self.phase = phase
+        self.trace = trace
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self.t0
+        REGISTRY.observe(self.phase, dt)
+        if self.trace is not None:
+            self.trace.timings[self.phase] = self.trace.timings.get(self.phase, 0.0) + dt * 1000.0
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(phase):
+    """Context manager timing `phase` into the registry and the active trace."""
+    if not _enabled:
+        return _NOOP
+    return _Span(phase, _current.get())
+
+
+def incr(event, n=1):
+    if not _enabled:
+        return
+    REGISTRY.incr(event, n)
+    trace = _current.get()
+    if trace is not None:
+        trace.counters[event] = trace.counters.get(event, 0) + n
+
+
+@contextmanager
+def tracing():
+    """Collect spans and counters of the enclosed code into a Trace (None when disabled)."""
+    if not _enabled:
+        yield None
+        return
+    trace = Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def render():
+    return REGISTRY.render()
+
+
+def write_textfile(path):
+    """Atomically write the current metrics, e.g. for node_exporter's textfile collector."""
+    path = os.fspath(path)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(render())
+    os.replace(tmp, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        out = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=9464, host="127.0.0.1"):
+    """Serve /metrics on a background thread; returns the server (call `.shutdown()` to stop)."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
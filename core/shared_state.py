@@ -0,0 +1,176 @@
+import json
+import secrets
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from core.cluster_state import FIELDS, ClusterRegistry, ClusterState, json_safe
+
+MAGIC = b"GGSHM\x00\x00\x01"
+LAYOUT_VERSION = 1
+HEADER_BYTES = 64
+SNAPSHOT_RETRIES = 10000
+
+# Header, as uint64 words after the 8-byte magic:
+#   [0] layout version  [1] seqlock counter (odd while a write is in progress)
+#   [2] generation (completed writes)  [3] cluster count  [4] field count
+#   [5] metadata bytes  [6] timestep
+_LAYOUT, _SEQ, _GENERATION, _CLUSTERS, _FIELDS, _META, _TIMESTEP = range(7)
+
+
+def _align(n, to=8):
+    return (n + to - 1) // to * to
+
+
+def _open(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # attaching must not hand the block to this process's resource tracker,
+        # or it is unlinked when the reader exits
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class SharedClusterState:
+    """ClusterState columns published in a `multiprocessing.shared_memory` block.
+
+    Layout: a 64-byte header (magic, layout version, seqlock counter,
+    generation, sizes, timestep), a JSON metadata block (cluster names, field
+    order, JSON-safe extras such as zones), then one float64 row per field.
+
+    One writer owns the block (`create`) and its `state` is a ClusterState whose
+    columns are views into shared memory, so plans apply in place; wrap every
+    mutation in `write()`. Readers `attach` zero-copy and use `snapshot()` for a
+    consistent copy: the seqlock counter is odd during a write, and a copy is
+    retried until it started and ended on the same even value.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf
+        if bytes(buf[:8]) != MAGIC:
+            raise ValueError(f"Shared block {shm.name!r} is not a GridGuardian cluster state")
+        self._header = np.ndarray((7,), dtype=np.uint64, buffer=buf, offset=8)
+        if int(self._header[_LAYOUT]) != LAYOUT_VERSION:
+            raise ValueError(f"Unsupported shared state layout {int(self._header[_LAYOUT])}")
+        n, nf, meta_len = (int(self._header[i]) for i in (_CLUSTERS, _FIELDS, _META))
+        meta = json.loads(bytes(buf[HEADER_BYTES : HEADER_BYTES + meta_len]).decode("utf-8"))
+        self.fields = tuple(meta["fields"])
+        self.registry = ClusterRegistry.get(meta["clusters"])
+        self.extra = meta.get("extra", {})
+        offset = HEADER_BYTES + _align(meta_len)
+        self._data = np.ndarray((nf, n), dtype=np.float64, buffer=buf, offset=offset)
+        if not owner:
+            self._data.flags.writeable = False
+        columns = {f: self._data[i] for i, f in enumerate(self.fields)}
+        self.state = ClusterState(self.registry, columns, dict(self.extra))
+
+    @classmethod
+    def create(cls, cs, name=None):
+        """Publish `cs` into a new block; the returned object is the single writer."""
+        extra = {k: v for k, v in cs.extra.items() if k != "timestep" and json_safe(v)}
+        meta = json.dumps({"clusters": list(cs.names), "fields": list(FIELDS), "extra": extra}).encode("utf-8")
+        size = HEADER_BYTES + _align(len(meta)) + len(FIELDS) * cs.size * 8
+        shm = shared_memory.SharedMemory(
+            name=name or f"gg_{secrets.token_hex(6)}", create=True, size=max(size, 1)
+        )
+        buf = shm.buf
+        buf[:8] = MAGIC
+        header = np.ndarray((7,), dtype=np.uint64, buffer=buf, offset=8)
+        header[:] = 0
+        header[_LAYOUT] = LAYOUT_VERSION
+        header[_CLUSTERS] = cs.size
+        header[_FIELDS] = len(FIELDS)
+        header[_META] = len(meta)
+        buf[HEADER_BYTES : HEADER_BYTES + len(meta)] = meta
+        shared = cls(shm, owner=True)
+        with shared.write():
+            for i, f in enumerate(FIELDS):
+                shared._data[i] = cs.column(f)
+            shared.timestep = int(cs.extra.get("timestep", 0))
+        return shared
+
+    @classmethod
+    def attach(cls, name):
+        """Read-only, zero-copy view of a block published by another process."""
+        return cls(_open(name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def generation(self):
+        """Number of completed writes; compare to skip unchanged snapshots."""
+        return int(self._header[_GENERATION])
+
+    @property
+    def timestep(self):
+        return int(self._header[_TIMESTEP].view(np.int64))
+
+    @timestep.setter
+    def timestep(self, value):
+        self._header[_TIMESTEP] = np.int64(value).view(np.uint64)
+
+    @contextmanager
+    def write(self, tick=False):
+        """Seqlock write section; readers retry snapshots that overlap it.
+
+        With `tick=True` the state's timestep advances by one inside the section.
+        """
+        if not self.owner:
+            raise PermissionError("Only the process that created the shared state may write to it")
+        header = self._header
+        header[_SEQ] += 1
+        try:
+            if tick:
+                self.state.extra["timestep"] = int(self.state.extra.get("timestep", self.timestep)) + 1
+            yield self.state
+        finally:
+            self.timestep = int(self.state.extra.get("timestep", self.timestep))
+            header[_GENERATION] += 1
+            header[_SEQ] += 1
+
+    def snapshot(self, retries=SNAPSHOT_RETRIES):
+        """Consistent private copy of the state as a ClusterState."""
+        header = self._header
+        out = np.empty_like(self._data)
+        for attempt in range(retries):
+            seq = int(header[_SEQ])
+            if seq & 1:
+                time.sleep(0 if attempt < 100 else 0.0001)
+                continue
+            np.copyto(out, self._data)
+            timestep = self.timestep
+            if int(header[_SEQ]) == seq:
+                extra = dict(self.extra)
+                extra["timestep"] = timestep
+                return ClusterState(self.registry, {f: out[i] for i, f in enumerate(self.fields)}, extra)
+        raise TimeoutError(f"No consistent snapshot of {self.name!r} after {retries} attempts")
+
+    def close(self):
+        self.state = None
+        self._data = self._header = None
+        self.shm.close()
+
+    def unlink(self):
+        """Remove the block (writer only); attached readers keep their mapping until they close."""
+        if self.owner:
+            # a forked reader shares this process's resource tracker and may have
+            # unregistered the name on attach; registering again is idempotent
+            resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self.owner:
+            self.unlink()
+        return False
@@ -0,0 +1,138 @@
+import time
+
+import numpy as np
+
+from agents.monitor import IncrementalMonitor
+from agents.verifier import verify_stable
+from core.state import (
+    ALPHA,
+    BETA,
+    COOLING_DECAY,
+    LOAD_DRIFT_KW,
+    LOAD_REVERSION,
+    RECHARGE_KW,
+    THERMAL_RELAX,
+)
+
+NOISE_BLOCK = 1 << 18  # random draws generated per refill
+
+
+def step_physics(cs, nominal, temp_offset, noise):
+    """Advance one tick of plant dynamics on `cs` in place.
+
+    Load and utilization follow a mean-reverting random walk around `nominal`
+    (the starting snapshot), boosted cooling spins down toward its nominal level,
+    temperature relaxes toward `temp_offset + BETA*draw - ALPHA*cooling` (the same
+    per-kW effects the tools apply instantly), last tick's battery output ends and
+    surplus grid power recharges the battery up to `battery_max_kw`.
+    """
+    draw = cs.writable("power_draw_kw")
+    cool = cs.writable("cooling_online_kw")
+    util = cs.writable("utilization")
+    temp = cs.writable("temp_c")
+    batt = cs.writable("battery_kw")
+    draw += noise + LOAD_REVERSION * (nominal["power_draw_kw"] - draw)
+    np.maximum(draw, 0.0, out=draw)
+    util += LOAD_REVERSION * (nominal["utilization"] - util)
+    cool += COOLING_DECAY * (nominal["cooling_online_kw"] - cool)
+    temp += THERMAL_RELAX * (temp_offset + BETA * draw - ALPHA * cool - temp)
+    cs.writable("battery_out_kw").fill(0.0)
+    surplus = cs.column("base_grid_kw") - draw
+    room = cs.column("battery_max_kw") - batt
+    # minimum/maximum rather than np.clip, whose Python-level dispatch costs more than the math here
+    batt += np.minimum(np.maximum(np.minimum(surplus, room), 0.0), RECHARGE_KW)
+
+
+def plant_baseline(cs):
+    """(nominal, temp_offset) for `step_physics`, taken from the starting state `cs`."""
+    nominal = {f: cs.column(f).copy() for f in ("power_draw_kw", "cooling_online_kw", "utilization")}
+    temp_offset = cs.column("temp_c") - BETA * nominal["power_draw_kw"] + ALPHA * nominal["cooling_online_kw"]
+    return nominal, temp_offset
+
+
+def _reduce_block(metrics, t0, bal, temp, batt, out, record_clusters):
+    # per-tick fleet metrics for buffered rows t0..t0+len(bal), reduced in one pass per array
+    t1 = t0 + len(bal)
+    if bal.shape[1]:
+        metrics["deficit_kw"][t0:t1] = np.clip(-bal, 0.0, None).sum(axis=1)
+        metrics["min_balance_kw"][t0:t1] = bal.min(axis=1)
+        metrics["max_temp_c"][t0:t1] = temp.max(axis=1)
+        metrics["battery_kw"][t0:t1] = batt.sum(axis=1)
+        metrics["battery_out_kw"][t0:t1] = out.sum(axis=1)
+    if record_clusters:
+        metrics["balance_kw"][t0:t1] = bal
+        metrics["temp_c"][t0:t1] = temp
+
+
+def simulate(cs, ticks, act, tau=-2.0, seed=0, record_clusters=False, sink=None):
+    """Run `ticks` control periods on `cs` in place.
+
+    Each tick advances the plant, then (only when the monitor reports a deficit or
+    thermal violation) calls `act(cs, monitor)`, which must plan and apply actions
+    (reporting tool deltas to `monitor.record`) and return the plan, and finally
+    checks stability on the monitor's incrementally refreshed masks, emitting the
+    same alert as `verify` to `sink`.
+    The per-tick loop only copies balance, temperature and battery columns into
+    a block buffer; fleet metrics are reduced per block into preallocated
+    arrays. `record_clusters` additionally keeps per-cluster balance and
+    temperature as float32 (ticks × clusters).
+    """
+    n = cs.size
+    rng = np.random.default_rng(seed)
+    nominal, temp_offset = plant_baseline(cs)
+    start = int(cs.extra.get("timestep", 0))
+
+    metrics = {
+        "stable": np.zeros(ticks, dtype=bool),
+        "actions": np.zeros(ticks, dtype=np.int32),
+        "deficit_kw": np.zeros(ticks),
+        "min_balance_kw": np.zeros(ticks),
+        "max_temp_c": np.zeros(ticks),
+        "battery_kw": np.zeros(ticks),
+        "battery_out_kw": np.zeros(ticks),
+    }
+    if record_clusters:
+        metrics["balance_kw"] = np.zeros((ticks, n), dtype=np.float32)
+        metrics["temp_c"] = np.zeros((ticks, n), dtype=np.float32)
+
+    monitor = IncrementalMonitor(cs)
+    rows = max(1, NOISE_BLOCK // max(n, 1))
+    block = min(rows, ticks)
+    bal_buf, temp_buf, batt_buf, out_buf = (np.empty((block, n)) for _ in range(4))
+    stable, actions = metrics["stable"], metrics["actions"]
+    noise = None
+    t0 = time.perf_counter()
+    for t in range(ticks):
+        j = t % rows
+        if j == 0:
+            if t:
+                _reduce_block(metrics, t - rows, bal_buf, temp_buf, batt_buf, out_buf, record_clusters)
+            noise = rng.normal(0.0, LOAD_DRIFT_KW, size=(rows, n))
+        step_physics(cs, nominal, temp_offset, noise[j])
+        cs.extra["timestep"] = start + t + 1
+
+        monitor.recompute()
+        if monitor.deficits().any() or monitor.thermal.any():
+            actions[t] = len(act(cs, monitor)["actions"])
+        stable[t] = verify_stable(cs, tau, monitor, sink=sink)
+
+        bal_buf[j] = monitor.balance
+        temp_buf[j] = cs.column("temp_c")
+        batt_buf[j] = cs.column("battery_kw")
+        out_buf[j] = cs.column("battery_out_kw")
+    if ticks:
+        last = (ticks - 1) % rows + 1
+        _reduce_block(
+            metrics, ticks - last, bal_buf[:last], temp_buf[:last], batt_buf[:last], out_buf[:last], record_clusters
+        )
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "ticks": ticks,
+        "seed": seed,
+        "tau": tau,
+        "clusters": list(cs.registry.names),
+        "pass_rate": float(metrics["stable"].mean()) if ticks else 0.0,
+        "elapsed_s": elapsed,
+        "metrics": metrics,
+    }
@@ -0,0 +1,256 @@
+"""Binary columnar snapshot / history files (`.ggs`).
+
+Layout (little-endian):
+
+    header      64 bytes: magic, then uint64 layout version, value itemsize
+                (4 = float32, 8 = float64), cluster count, frame count,
+                name-table bytes, metadata bytes, data offset
+    names       cluster names, UTF-8, newline separated
+    metadata    JSON: field order and JSON-safe state extras (e.g. zones)
+    data        at `data offset` (64-byte aligned): STATIC_FIELDS once
+                (fields × clusters), then one DYNAMIC_FIELDS block per frame
+    timesteps   int64 per frame, after the data
+
+A single scenario is a one-frame file; a history is many frames with the same
+clusters. Files are memory-mapped by default, so reading one frame of a long
+history touches only that frame. Convert JSON with
+
+    python -m core.snapfile to-bin data/scenario_DC_A.json A.ggs
+    python -m core.snapfile to-bin telemetry.ndjson history.ggs --float32
+    python -m core.snapfile to-json history.ggs --frame -1
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from core.cluster_state import DYNAMIC_FIELDS, STATIC_FIELDS, ClusterRegistry, ClusterState, json_safe
+
+MAGIC = b"GGSNAP\x00\x01"
+LAYOUT_VERSION = 1
+HEADER_BYTES = 64
+SUFFIX = ".ggs"
+DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+_HEADER = np.dtype([("magic", "S8")] + [(k, "<u8") for k in (
+    "version", "itemsize", "clusters", "frames", "names", "meta", "data"
+)])
+
+
+class SnapshotWriter:
+    """Append ClusterState frames to a `.ggs` file; statics come from the first frame.
+
+    Used as a context manager, the file is finalized on a clean exit and
+    deleted if the block raised, so a half-written frame is never published.
+    """
+
+    def __init__(self, path, dtype="float64"):
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        if self.dtype.itemsize not in DTYPES:
+            raise ValueError(f"Unsupported snapshot dtype {dtype!r}; use float32 or float64")
+        self.fh = open(path, "wb")
+        self.registry = None
+        self.timesteps = []
+
+    def _start(self, cs):
+        self.registry = cs.registry
+        names = "\n".join(cs.names).encode("utf-8")
+        extra = {k: v for k, v in cs.extra.items() if k != "timestep" and json_safe(v)}
+        meta = json.dumps({"static": list(STATIC_FIELDS), "dynamic": list(DYNAMIC_FIELDS), "extra": extra}).encode("utf-8")
+        data = -(-(HEADER_BYTES + len(names) + len(meta)) // 64) * 64
+        self.header = np.zeros((), dtype=_HEADER)
+        self.header["magic"] = MAGIC
+        self.header["version"] = LAYOUT_VERSION
+        self.header["itemsize"] = self.dtype.itemsize
+        self.header["clusters"] = cs.size
+        self.header["names"] = len(names)
+        self.header["meta"] = len(meta)
+        self.header["data"] = data
+        self.fh.write(self.header.tobytes())
+        self.fh.write(names)
+        self.fh.write(meta)
+        self.fh.write(b"\x00" * (data - self.fh.tell()))
+        for f in STATIC_FIELDS:
+            self.fh.write(cs.column(f).astype(self.dtype, copy=False).tobytes())
+
+    def append(self, cs):
+        if self.registry is None:
+            self._start(cs)
+        elif cs.names != self.registry.names:
+            raise ValueError("Every frame of a snapshot history must have the same clusters")
+        for f in DYNAMIC_FIELDS:
+            self.fh.write(cs.column(f).astype(self.dtype, copy=False).tobytes())
+        self.timesteps.append(int(cs.extra.get("timestep", len(self.timesteps))))
+
+    def close(self):
+        if self.fh.closed:
+            return
+        if self.registry is None:
+            self.abort()
+            raise ValueError("A snapshot file needs at least one frame")
+        self.fh.write(np.asarray(self.timesteps, dtype="<i8").tobytes())
+        self.header["frames"] = len(self.timesteps)
+        self.fh.seek(0)
+        self.fh.write(self.header.tobytes())
+        self.fh.close()
+
+    def abort(self):
+        """Close and delete the file without finalizing it (e.g. after a failed append)."""
+        if not self.fh.closed:
+            self.fh.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
+
+
+def write_snapshot(path, states, dtype="float64"):
+    """Write one ClusterState, or an iterable of them (a history), to `path`."""
+    if isinstance(states, ClusterState):
+        states = [states]
+    with SnapshotWriter(path, dtype) as w:
+        for cs in states:
+            w.append(cs)
+    return path
+
+
+class SnapshotFile:
+    """Read side of a `.ggs` file.
+
+    With `mmap=True` (default) columns are read-only views of the mapped file and
+    nothing is read until used; float64 frames come back as zero-copy
+    ClusterStates, float32 frames are widened to float64 on access.
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        with open(path, "rb") as fh:
+            header = np.frombuffer(fh.read(HEADER_BYTES), dtype=_HEADER)[0]
+            if header["magic"] != MAGIC:
+                raise ValueError(f"{path} is not a GridGuardian snapshot file")
+            if int(header["version"]) != LAYOUT_VERSION:
+                raise ValueError(f"Unsupported snapshot layout {int(header['version'])} in {path}")
+            names = fh.read(int(header["names"])).decode("utf-8")
+            meta = json.loads(fh.read(int(header["meta"])).decode("utf-8"))
+        n, frames, offset = int(header["clusters"]), int(header["frames"]), int(header["data"])
+        self.dtype = DTYPES[int(header["itemsize"])]
+        self.registry = ClusterRegistry.get(names.split("\n") if n else [])
+        self.static_fields = tuple(meta["static"])
+        self.dynamic_fields = tuple(meta["dynamic"])
+        self.extra = meta.get("extra", {})
+        count = (len(self.static_fields) + frames * len(self.dynamic_fields)) * n
+        if mmap and count:
+            data = np.memmap(path, dtype=self.dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            data = np.fromfile(path, dtype=self.dtype, count=count, offset=offset)
+            data.flags.writeable = False
+        split = len(self.static_fields) * n
+        self.static = data[:split].reshape(len(self.static_fields), n)
+        self.frames = data[split:].reshape(frames, len(self.dynamic_fields), n)
+        self.timesteps = np.fromfile(path, dtype="<i8", count=frames, offset=offset + count * self.dtype.itemsize)
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def names(self):
+        return self.registry.names
+
+    def _col(self, values):
+        return values if self.dtype == np.float64 else values.astype(np.float64)
+
+    def state(self, frame=0):
+        """Frozen ClusterState for one frame (negative indices count from the end)."""
+        block = self.frames[frame]
+        columns = {f: self._col(self.static[i]) for i, f in enumerate(self.static_fields)}
+        columns.update({f: self._col(block[i]) for i, f in enumerate(self.dynamic_fields)})
+        extra = dict(self.extra)
+        extra["timestep"] = int(self.timesteps[frame])
+        return ClusterState(self.registry, columns, extra).freeze()
+
+    def states(self, start=0, stop=None):
+        for frame in range(*slice(start, stop).indices(len(self))):
+            yield self.state(frame)
+
+    def history(self, field, start=0, stop=None):
+        """(frames × clusters) view of one dynamic field over a frame range."""
+        return self.frames[start:stop, self.dynamic_fields.index(field)]
+
+
+def load_snapshot(path, frame=0, mmap=True):
+    return SnapshotFile(path, mmap=mmap).state(frame)
+
+
+def to_meta(cs):
+    """clusters.json-shaped dict (cluster list, capacities, zones) for a state."""
+    meta = {"clusters": list(cs.names)}
+    meta.update({f: cs.mapping(cs.column(f)) for f in STATIC_FIELDS})
+    if cs.extra.get("zones"):
+        meta["zones"] = cs.extra["zones"]
+    return meta
+
+
+def to_scenario(cs):
+    """Scenario-file-shaped dict (timestep and per-cluster readings) for a state."""
+    out = {"timestep": int(cs.extra.get("timestep", 0))}
+    out.update({f: cs.mapping(cs.column(f)) for f in DYNAMIC_FIELDS if f != "battery_out_kw"})
+    return out
+
+
+def main(argv=None):
+    # JSON input is normalized against clusters.json exactly like run_dc / stream_dc
+    from core.ingest import ndjson_source
+    from core_app import DATA_DIR, _normalize_cluster_state
+
+    parser = argparse.ArgumentParser(description="Convert scenarios between JSON and the .ggs binary format")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    to_bin = sub.add_parser("to-bin", help="scenario .json or NDJSON history -> .ggs")
+    to_bin.add_argument("src")
+    to_bin.add_argument("dst")
+    to_bin.add_argument("--meta", default=str(DATA_DIR / "clusters.json"))
+    to_bin.add_argument("--float32", action="store_true")
+    to_json = sub.add_parser("to-json", help=".ggs -> scenario JSON (one frame) or NDJSON (all frames)")
+    to_json.add_argument("src")
+    to_json.add_argument("--frame", type=int, default=None, help="frame to print; all frames as NDJSON if omitted")
+    to_json.add_argument("--meta-out", help="also write a clusters.json-shaped file here")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "to-bin":
+        with open(args.meta, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if args.src.endswith(".ndjson"):
+            snaps = ndjson_source(args.src)
+        else:
+            with open(args.src, "r", encoding="utf-8") as fh:
+                snaps = [json.load(fh)]
+        states = (_normalize_cluster_state(meta, snap) for snap in snaps)
+        write_snapshot(args.dst, states, "float32" if args.float32 else "float64")
+        return
+
+    snap = SnapshotFile(args.src)
+    if args.meta_out:
+        with open(args.meta_out, "w", encoding="utf-8") as fh:
+            json.dump(to_meta(snap.state(0)), fh, indent=2)
+            fh.write("\n")
+    if args.frame is not None:
+        json.dump(to_scenario(snap.state(args.frame)), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for cs in snap.states():
+            sys.stdout.write(json.dumps(to_scenario(cs)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
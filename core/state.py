@@ -4,3 +4,11 @@ COP = 0.30             # cooling kW → effective heat removal
 ALPHA = 0.25           # temp drop per kW cooling
 BETA  = 0.06           # temp rise per added kW compute
 MAX_UTIL = 0.90
+UTIL_PER_KW = 0.01     # utilization change per kW of moved workload
+
+# Simulation dynamics (per control tick)
+LOAD_DRIFT_KW = 0.5    # std-dev of random load walk
+LOAD_REVERSION = 0.05  # pull of load back toward its nominal level
+RECHARGE_KW = 0.5      # max battery recharge from grid surplus
+THERMAL_RELAX = 0.10   # share of the gap to equilibrium temperature closed
+COOLING_DECAY = 0.05   # spin-down of boosted cooling toward nominal
@@ -0,0 +1,356 @@
+import atexit
+import json
+import os
+import threading
+import time
+import warnings
+import zipfile
+
+import numpy as np
+
+# (resolution_s, slots): 1 h of seconds, 1 day of minutes, 30 days of hours
+DEFAULT_TIERS = ((1.0, 3600), (60.0, 1440), (3600.0, 720))
+INITIAL_SLOTS = 16  # rings start this small and grow as buckets close
+DEFAULT_PATH = "history.npz"
+FLEET = "fleet"  # pseudo-cluster for fleet-wide series (stable, violation counts)
+
+# GRIDGUARDIAN_HISTORY=<path> moves the persisted store; 0/off keeps no history
+_setting = os.getenv("GRIDGUARDIAN_HISTORY", DEFAULT_PATH)
+_enabled = _setting.lower() not in ("", "0", "false", "off")
+
+_RING = ("t", "mean", "min", "max", "count")
+_ACC = ("acc_sum", "acc_min", "acc_max", "acc_count")
+
+
+def _pad(a, extra, fill):
+    return np.concatenate((a, np.full(a.shape[:-1] + (extra,), fill, dtype=a.dtype)), axis=-1)
+
+
+class _Tier:
+    """Ring of bucket rows (time, mean/min/max/count per column) at one resolution.
+
+    Rows are allocated as buckets close, doubling up to `slots`; after that the
+    oldest bucket is overwritten. Values are stored as float32.
+    """
+
+    def __init__(self, res, slots, n):
+        self.res = float(res)
+        self.slots = int(slots)
+        cap = min(self.slots, INITIAL_SLOTS)
+        self.t = np.zeros(cap)
+        self.mean = np.full((cap, n), np.nan, dtype=np.float32)
+        self.min = np.full((cap, n), np.nan, dtype=np.float32)
+        self.max = np.full((cap, n), np.nan, dtype=np.float32)
+        self.count = np.zeros((cap, n), dtype=np.int32)
+        self.head = 0
+        self.size = 0
+        self.bucket = None  # bucket number of the running (not yet flushed) bucket
+
+    def _grow(self):
+        # only called while the ring has never wrapped, so rows are in time order
+        extra = min(len(self.t), self.slots - len(self.t))
+        self.t = np.concatenate((self.t, np.zeros(extra)))
+        for k in ("mean", "min", "max", "count"):
+            a = getattr(self, k)
+            fill = 0 if k == "count" else np.nan
+            setattr(self, k, np.concatenate((a, np.full((extra,) + a.shape[1:], fill, dtype=a.dtype))))
+        self.head = self.size
+
+    def widen(self, extra):
+        self.mean, self.min, self.max = (_pad(a, extra, np.nan) for a in (self.mean, self.min, self.max))
+        self.count = _pad(self.count, extra, 0)
+
+    def push(self, total, lo, hi, count):
+        if self.size == len(self.t) < self.slots:
+            self._grow()
+        i = self.head
+        seen = count > 0
+        self.t[i] = self.bucket * self.res
+        self.count[i] = count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean[i] = np.where(seen, total / count, np.nan)
+        self.min[i] = np.where(seen, lo, np.nan)
+        self.max[i] = np.where(seen, hi, np.nan)
+        self.head = (i + 1) % len(self.t)
+        self.size = min(self.size + 1, len(self.t))
+
+    def rows(self, start, end, running):
+        """(t, mean, min, max, count) for buckets starting in [start, end), oldest first.
+
+        `running` is the tier's (sum, min, max, count) accumulator, included as the
+        newest row so the latest samples are queryable before their bucket closes;
+        at most `slots` rows are returned either way.
+        """
+        order = (self.head - self.size + np.arange(self.size)) % len(self.t)
+        t, mean, lo, hi, count = (getattr(self, k)[order] for k in _RING)
+        total, rmin, rmax, rcount = running
+        if self.bucket is not None and rcount.any():
+            seen = rcount > 0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                cur = np.where(seen, total / rcount, np.nan)
+            t = np.append(t, self.bucket * self.res)
+            mean = np.vstack((mean, cur))
+            lo = np.vstack((lo, np.where(seen, rmin, np.nan)))
+            hi = np.vstack((hi, np.where(seen, rmax, np.nan)))
+            count = np.vstack((count, rcount))
+            if len(t) > self.slots:
+                # the running bucket takes the place of the oldest closed one
+                t, mean, lo, hi, count = t[1:], mean[1:], lo[1:], hi[1:], count[1:]
+        keep = np.ones(len(t), dtype=bool)
+        if start is not None:
+            keep &= t >= self.res * np.floor(start / self.res)
+        if end is not None:
+            keep &= t < end
+        return t[keep], mean[keep], lo[keep], hi[keep], count[keep]
+
+    def oldest(self):
+        if self.size:
+            return self.t[(self.head - self.size) % len(self.t)]
+        return None if self.bucket is None else self.bucket * self.res
+
+
+class _Series:
+    """All tiers of one metric; one column per cluster, added as clusters first appear.
+
+    Running buckets of every tier are stacked (tiers × clusters) so a sample
+    updates all tiers with one vectorized pass.
+    """
+
+    def __init__(self, tiers, names=()):
+        self.names = list(names)
+        self.index = {c: i for i, c in enumerate(self.names)}
+        n, k = len(self.names), len(tiers)
+        self.tiers = [_Tier(res, slots, n) for res, slots in tiers]
+        self.acc_sum = np.zeros((k, n))
+        self.acc_min = np.full((k, n), np.inf)
+        self.acc_max = np.full((k, n), -np.inf)
+        self.acc_count = np.zeros((k, n), dtype=np.int64)
+        self._key = None
+        self._cols = None
+
+    def columns(self, names):
+        key = tuple(names)
+        if key == self._key:
+            return self._cols
+        if len(set(key)) != len(key):
+            raise ValueError("Duplicate cluster names in one sample")
+        new = [c for c in key if c not in self.index]
+        if new:
+            for c in new:
+                self.index[c] = len(self.names)
+                self.names.append(c)
+            for tier in self.tiers:
+                tier.widen(len(new))
+            self.acc_sum, self.acc_count = _pad(self.acc_sum, len(new), 0.0), _pad(self.acc_count, len(new), 0)
+            self.acc_min, self.acc_max = _pad(self.acc_min, len(new), np.inf), _pad(self.acc_max, len(new), -np.inf)
+        cols = np.fromiter((self.index[c] for c in key), dtype=np.intp, count=len(key))
+        if len(key) == len(self.names) and (cols == np.arange(len(key))).all():
+            cols = slice(None)  # the common case: same clusters in the same order
+        self._key, self._cols = key, cols
+        return cols
+
+    def running(self, k):
+        return self.acc_sum[k], self.acc_min[k], self.acc_max[k], self.acc_count[k]
+
+    def add(self, ts, names, values):
+        cols = self.columns(names)
+        for k, tier in enumerate(self.tiers):
+            bucket = int(ts // tier.res)
+            if tier.bucket is None:
+                tier.bucket = bucket
+            elif bucket > tier.bucket:
+                tier.push(*self.running(k))
+                tier.bucket = bucket
+                self.acc_sum[k] = 0.0
+                self.acc_min[k] = np.inf
+                self.acc_max[k] = -np.inf
+                self.acc_count[k] = 0
+            # samples older than the running bucket fold into it
+        nan = np.isnan(values)
+        if nan.any():
+            cols = np.arange(len(self.names))[cols][~nan]
+            values = values[~nan]
+        if type(cols) is slice:
+            np.add(self.acc_sum, values, out=self.acc_sum)
+            np.add(self.acc_count, 1, out=self.acc_count)
+            np.minimum(self.acc_min, values, out=self.acc_min)
+            np.maximum(self.acc_max, values, out=self.acc_max)
+            return
+        self.acc_sum[:, cols] += values
+        self.acc_count[:, cols] += 1
+        self.acc_min[:, cols] = np.minimum(self.acc_min[:, cols], values)
+        self.acc_max[:, cols] = np.maximum(self.acc_max[:, cols], values)
+
+
+class TimeSeriesStore:
+    """Bounded in-process history of per-cluster metrics with downsampling tiers.
+
+    Every metric keeps, per tier, a ring of `slots` buckets of `resolution_s`
+    seconds (see DEFAULT_TIERS) holding mean/min/max/count per cluster; each
+    sample updates every tier, so coarse tiers are exact aggregates rather than
+    averages of averages. Memory is capped per (metric, cluster) regardless of
+    uptime: 16 bytes per slot, about 92 KB with the default tiers. `range` and
+    `aggregate` answer from the finest tier that still covers the start of the
+    query. `save`/`load` persist the whole store to an `.npz` file.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = tuple((float(r), int(s)) for r, s in tiers)
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def record(self, metric, values, names=None, ts=None):
+        """Add one sample per cluster: `values` is {cluster: value}, or an array aligned with `names`."""
+        if names is None:
+            names = list(values)
+            values = list(values.values())
+        values = np.asarray(values, dtype=np.float64)
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            series = self.series.get(metric)
+            if series is None:
+                series = self.series[metric] = _Series(self.tiers)
+            series.add(ts, names, values)
+
+    def metrics(self):
+        return sorted(self.series)
+
+    def clusters(self, metric):
+        return list(self.series[metric].names)
+
+    def _tier(self, series, start, tier):
+        if tier is not None:
+            return series.tiers[tier]
+        if start is not None:
+            for t in series.tiers:
+                oldest = t.oldest()
+                if oldest is not None and oldest <= start:
+                    return t
+            # nothing reaches back that far: the coarsest tier holding any data
+            for t in reversed(series.tiers):
+                if t.oldest() is not None:
+                    return t
+        return series.tiers[0]
+
+    def range(self, metric, start=None, end=None, cluster=None, tier=None):
+        """Buckets in [start, end) as {"resolution_s", "t", "mean", "min", "max", "count"}.
+
+        Value arrays are (buckets × clusters) in `clusters(metric)` order, or one
+        column when `cluster` is given. `tier` forces a tier index.
+        """
+        with self._lock:
+            series = self.series[metric]
+            chosen = self._tier(series, start, tier)
+            t, mean, lo, hi, count = chosen.rows(start, end, series.running(series.tiers.index(chosen)))
+            col = None if cluster is None else series.index[cluster]
+        out = {"resolution_s": chosen.res, "t": t, "mean": mean, "min": lo, "max": hi, "count": count}
+        if col is not None:
+            for k in ("mean", "min", "max", "count"):
+                out[k] = out[k][:, col]
+        return out
+
+    def aggregate(self, metric, start=None, end=None, cluster=None, tier=None):
+        """Count-weighted mean, min, max, sample count and last bucket mean over [start, end)."""
+        rows = self.range(metric, start, end, cluster, tier)
+        count, mean, lo, hi = (np.atleast_2d(rows[k].T).T for k in ("count", "mean", "min", "max"))
+        seen = count > 0
+        n = count.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = np.where(seen, mean * count, 0.0).sum(axis=0) / n
+        out = {
+            "mean": avg,
+            "min": np.where(n > 0, np.where(seen, lo, np.inf).min(axis=0, initial=np.inf), np.nan),
+            "max": np.where(n > 0, np.where(seen, hi, -np.inf).max(axis=0, initial=-np.inf), np.nan),
+            "count": n,
+            "last": np.full(n.shape, np.nan),
+        }
+        if len(count):
+            last = len(count) - 1 - np.argmax(seen[::-1], axis=0)
+            out["last"] = np.where(n > 0, np.take_along_axis(mean, last[None], axis=0)[0], np.nan)
+        if cluster is not None:
+            out = {k: v[0].item() for k, v in out.items()}
+        out["resolution_s"] = rows["resolution_s"]
+        return out
+
+    def nbytes(self):
+        total = 0
+        for series in self.series.values():
+            total += sum(getattr(series, a).nbytes for a in _ACC)
+            total += sum(getattr(t, a).nbytes for t in series.tiers for a in _RING)
+        return total
+
+    def save(self, path):
+        """Write the store (rings and running buckets) to `path` atomically."""
+        arrays, meta = {}, {"tiers": self.tiers, "series": {}}
+        with self._lock:
+            for m, (metric, series) in enumerate(self.series.items()):
+                info = meta["series"][metric] = {"names": series.names, "tiers": []}
+                for attr in _ACC:
+                    arrays[f"{m}_{attr}"] = getattr(series, attr)
+                for k, t in enumerate(series.tiers):
+                    info["tiers"].append({"head": t.head, "size": t.size, "bucket": t.bucket})
+                    for attr in _RING:
+                        arrays[f"{m}_{k}_{attr}"] = getattr(t, attr)
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            store = cls(meta["tiers"])
+            for m, (metric, info) in enumerate(meta["series"].items()):
+                series = store.series[metric] = _Series(store.tiers, info["names"])
+                for attr in _ACC:
+                    setattr(series, attr, data[f"{m}_{attr}"].copy())
+                for k, (t, state) in enumerate(zip(series.tiers, info["tiers"])):
+                    t.head, t.size, t.bucket = state["head"], state["size"], state["bucket"]
+                    for attr in _RING:
+                        setattr(t, attr, data[f"{m}_{k}_{attr}"].copy())
+        return store
+
+
+_store = None
+_store_path = None
+_store_lock = threading.Lock()
+
+
+def enabled():
+    return _enabled
+
+
+def get_store():
+    """Process-wide store, reloaded from GRIDGUARDIAN_HISTORY (history.npz) and saved at exit."""
+    global _store, _store_path
+    with _store_lock:
+        if _store is None:
+            _store_path = _setting if _enabled else None
+            if _store_path and os.path.exists(_store_path):
+                try:
+                    _store = TimeSeriesStore.load(_store_path)
+                except (OSError, ValueError, KeyError, zipfile.BadZipFile) as exc:
+                    warnings.warn(f"Ignoring unreadable history {_store_path}: {type(exc).__name__}: {exc}")
+                    _store = TimeSeriesStore()
+            else:
+                _store = TimeSeriesStore()
+        return _store
+
+
+def set_store(store, path=None):
+    """Replace the default store; `path` (or None for no persistence) is where it is saved at exit."""
+    global _store, _store_path
+    with _store_lock:
+        _store, _store_path = store, path
+
+
+@atexit.register
+def flush():
+    """Save the default store to its path now (also runs at exit)."""
+    with _store_lock:
+        store, path = _store, _store_path
+    if store is not None and path and store.series:
+        store.save(path)
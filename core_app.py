@@ -1,16 +1,31 @@
-import copy
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from functools import lru_cache
 from pathlib import Path
 
-from agents.monitor import power_balance, thermal_violations, power_deficits
-from agents.planner import plan_actions
+import numpy as np
+
+from agents.monitor import IncrementalMonitor, balance_array, thermal_mask
+from agents.planner import DeadlinePlanner, llm_deadline, plan_actions
 from agents.executor import apply_plan
 from agents.verifier import verify
-from agents.narrator import narrate_react
-from agents.scenario_gen import nemotron_generate_scenarios
+from agents.narrator import ReactTrace
+from agents.scenario_gen import GEN_FIELDS, nemotron_generate_scenarios, sample_batch, _nemotron_gen_payload
 from agents.critic import nemotron_grade
+from agents.llm_client import iter_concurrent
+from core import contingency, metrics, timeseries
+from core.alerts import NULL_SINK, get_sink
+from core.cluster_state import STATIC_FIELDS, ClusterRegistry, ClusterState, ensure_column
+from core.daemon import DEFAULT_PERIOD_S, PLAN_BUDGET, FixedRateLoop
+from core.ingest import LatestSnapshot, TelemetryPipeline, open_source
+from core.shared_state import SharedClusterState
+from core.snapfile import SUFFIX, SnapshotFile
+from core.live import DEFAULT_INTERVAL_S, LiveController
+from core.simulator import plant_baseline, simulate, step_physics
+from core.state import LOAD_DRIFT_KW
 
 CLUSTERS_DEFAULT = ["GPU_A", "CPU_B", "STORAGE_C", "EDGE_D"]
 DATA_DIR = Path(__file__).resolve().parent / "data"
@@ -37,20 +52,61 @@ def _ensure_map(val, keys, default=0.0):
         return {k: default for k in keys}
 
 
+def _file_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _scenario_paths(scenario_id):
+    return str(DATA_DIR / "clusters.json"), str(DATA_DIR / f"scenario_DC_{scenario_id}.json")
+
+
 @lru_cache(maxsize=8)
-def _cached_load(meta_path: str, scenario_path: str):
-    with open(meta_path, "r", encoding="utf-8") as mf:
-        meta = json.load(mf)
-    with open(scenario_path, "r", encoding="utf-8") as sf:
-        state = json.load(sf)
+def _read_files(meta_path: str, scenario_path: str, stamps):
+    # `stamps` (mtime, size of both files) is part of the cache key, so edited files reload
+    with metrics.span("read"):
+        with open(meta_path, "r", encoding="utf-8") as mf:
+            meta = json.load(mf)
+        with open(scenario_path, "r", encoding="utf-8") as sf:
+            state = json.load(sf)
     return meta, state
 
 
-def _load_state(scenario_id: str):
-    meta_path = DATA_DIR / "clusters.json"
-    scenario_path = DATA_DIR / f"scenario_DC_{scenario_id}.json"
-    meta, state = _cached_load(str(meta_path), str(scenario_path))
-    return copy.deepcopy(meta), copy.deepcopy(state)
+@lru_cache(maxsize=8)
+def _frozen_snapshot(meta_path: str, scenario_path: str, stamps):
+    metrics.incr("snapshot_reload")
+    meta, state = _read_files(meta_path, scenario_path, stamps)
+    with metrics.span("normalize"):
+        return _normalize_cluster_state(meta, state).freeze()
+
+
+@lru_cache(maxsize=8)
+def _snapshot_file(path: str, stamp):
+    metrics.incr("snapshot_reload")
+    with metrics.span("read"):
+        return SnapshotFile(path)
+
+
+def _load_snapshot(scenario_id: str, frame=0):
+    """Normalized, read-only ClusterState for a scenario, shared across calls.
+
+    `scenario_id` is a scenario letter (data/scenario_DC_<id>.json, normalized
+    against clusters.json) or a path to a `.ggs` file (core/snapfile.py), which
+    is memory-mapped and carries its own capacities; `frame` picks one frame of
+    a history. Reloaded whenever the files change on disk. Callers that mutate
+    state take `.overlay()`, which copies only the columns written.
+    """
+    if str(scenario_id).endswith(SUFFIX):
+        path = str(scenario_id)
+        return _snapshot_file(path, scenario_stamp(path)).state(frame)
+    return _frozen_snapshot(*_scenario_paths(scenario_id), scenario_stamp(scenario_id))
+
+
+def scenario_stamp(scenario_id):
+    """(mtime_ns, size) of every file a scenario is loaded from; changes whenever they are edited."""
+    if str(scenario_id).endswith(SUFFIX):
+        return _file_stamp(str(scenario_id))
+    return tuple(_file_stamp(p) for p in _scenario_paths(scenario_id))
 
 
 def _normalize_state(meta, state):
@@ -68,6 +124,101 @@ def _normalize_state(meta, state):
     return state
 
 
+def _normalize_cluster_state(meta, state):
+    """Columnar equivalent of `_normalize_state`; metadata capacities win over the snapshot."""
+    merged = dict(state)
+    for field in ("base_grid_kw", "cooling_capacity_kw", "battery_max_kw"):
+        merged[field] = meta.get(field) or state.get(field)
+    merged["battery_out_kw"] = None
+    if meta.get("zones"):
+        merged["zones"] = meta["zones"]
+    return ClusterState.from_dict(merged, _cluster_keys(meta))
+
+
+def _snapshot_state(snap, meta, keys):
+    """ClusterState for a generated snapshot (scenario_gen shape) under cluster metadata `meta`."""
+    state = {
+        "timestep": snap.get("timestep", 0),
+        "power_draw_kw": snap.get("power_draw_kw", {}),
+        "cooling_online_kw": snap.get("cooling_online_kw", {}),
+        "battery_kw": snap.get("battery_kw", {}),
+        "utilization": snap.get("utilization", {}),
+        "temp_c": snap.get("temp_c", {}),
+        "cooling_capacity_kw": meta.get("cooling_capacity_kw", {}),
+        "battery_max_kw": meta.get("battery_max_kw", {}),
+        "base_grid_kw": meta.get("base_grid_kw", {}),
+    }
+    if meta.get("zones"):
+        state["zones"] = meta["zones"]
+    return ClusterState.from_dict(state, keys)
+
+
+def _plan_step(cs, use_llm=False, planner="greedy", monitor=None, guard=None, plan_fn=None):
+    with metrics.span("monitor"):
+        if monitor is None:
+            monitor = IncrementalMonitor(cs)
+        bal0, therm0, powdef0 = monitor.state()
+    with metrics.span("plan"):
+        plan, reasoning = (plan_fn or plan_actions)(
+            powdef0,
+            therm0,
+            bal0,
+            cs["battery_kw"].copy(),
+            cs["cooling_capacity_kw"].copy(),
+            cs["cooling_online_kw"].copy(),
+            cs["base_grid_kw"].copy(),
+            cs["power_draw_kw"].copy(),
+            use_llm=use_llm,
+            planner=planner,
+            # read-only planner inputs (never sent to the LLM): live views, not copies
+            temp=cs["temp_c"],
+            utilization=cs["utilization"],
+            zones=cs.extra.get("zones"),
+        )
+    with metrics.span("actuate"), guard or nullcontext():
+        logs, cs = apply_plan(cs, plan, cs["cooling_capacity_kw"], on_delta=monitor.record)
+    return bal0, plan, reasoning, logs
+
+
+def _control_step(cs, tau, use_llm=False, planner="greedy", sink=None, guard=None, plan_fn=None):
+    with metrics.span("monitor"):
+        monitor = IncrementalMonitor(cs)
+    bal0, plan, reasoning, logs = _plan_step(
+        cs, use_llm=use_llm, planner=planner, monitor=monitor, guard=guard, plan_fn=plan_fn
+    )
+    with metrics.span("verify"):
+        verification = verify(cs, tau, sink=sink, monitor=monitor)
+    return bal0, plan, reasoning, logs, verification
+
+
+def _record_history(cs, bal0, temp0, verification, store=None):
+    # per-cluster before/after readings and fleet-level verify outcomes; see core/timeseries.py
+    if store is None:
+        if not timeseries.enabled():
+            return
+        store = timeseries.get_store()
+    with metrics.span("history"):
+        names, now = cs.names, time.time()
+        for metric, values in (
+            ("balance_before_kw", bal0),
+            ("balance_after_kw", verification["balance_after"]),
+            ("temp_before_c", temp0),
+        ):
+            store.record(metric, np.fromiter(values.values(), dtype=float, count=len(values)), names, now)
+        store.record("temp_after_c", cs.column("temp_c"), names, now)
+        fleet = (timeseries.FLEET,)
+        store.record("stable", [float(verification["stable"])], fleet, now)
+        store.record("thermal_violations", [len(verification["thermal_violations"])], fleet, now)
+        store.record("power_deficits", [len(verification["power_deficits"])], fleet, now)
+
+
+def json_default(obj):
+    """`json.dumps(result, default=json_default)`: renders lazy ActionLog / ReactTrace entries."""
+    if hasattr(obj, "to_list"):
+        return obj.to_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def _summarize_for_critic(res, scenario, induce_failure, tau, planner):
     return {
         "scenario": scenario,
@@ -78,54 +229,287 @@ def _summarize_for_critic(res, scenario, induce_failure, tau, planner):
         "thermal_violations": res["verify"]["thermal_violations"],
         "power_deficits": res["verify"]["power_deficits"],
         "plan": res["plan"],
-        "logs": res["logs"],
+        "logs": list(res["logs"]),
         "planner": planner,
     }
 
 
-def run_dc(scenario_id="A", tau=-2.0, induce_failure=False, use_llm=False):
-    meta, state = _load_state(scenario_id)
-    state = _normalize_state(meta, state)
-    keys = state["clusters"]
-    if induce_failure and "GPU_A" in keys:
-        state["power_draw_kw"]["GPU_A"] += 8.0
-        state["temp_c"]["GPU_A"] += 4.0
-    bal0 = power_balance(state["base_grid_kw"], state["power_draw_kw"], state["battery_out_kw"])
-    therm0 = thermal_violations(state["temp_c"])
-    powdef0 = power_deficits(bal0)
-    plan, reasoning = plan_actions(
-        powdef0,
-        therm0,
-        bal0,
-        state["battery_kw"],
-        state["cooling_capacity_kw"],
-        state["cooling_online_kw"],
-        state["base_grid_kw"],
-        state["power_draw_kw"].copy(),
-        use_llm=use_llm,
-    )
-    logs, new_state = apply_plan(state, plan, state["cooling_capacity_kw"])
-    verification = verify(new_state, tau)
-    trace = narrate_react(reasoning, logs, verification)
-    return {
+def _induce_failure(cs):
+    if "GPU_A" in cs.registry:
+        cs["power_draw_kw"]["GPU_A"] += 8.0
+        cs["temp_c"]["GPU_A"] += 4.0
+
+
+def run_dc(
+    scenario_id="A", tau=-2.0, induce_failure=False, use_llm=False, planner="greedy", frame=0, llm_deadline_s=None
+):
+    """One control pass over a scenario snapshot (or `frame` of a `.ggs` history).
+
+    With `use_llm` and an `llm_deadline_s` (default GRIDGUARDIAN_LLM_DEADLINE),
+    planning is speculative: `planner` plans while Nemotron is asked, and the
+    LLM plan is committed only if it validates within the deadline. The
+    result's `speculation` records the winner and the LLM time.
+
+    Unless metrics are disabled (GRIDGUARDIAN_METRICS=0), the result also carries
+    `timings_ms` per phase (load/read/normalize/monitor/plan/llm_plan/actuate/
+    verify/history/total) and event `counters` such as llm_fallback and
+    schema_rejection; see core/metrics.py for the process-wide exporter.
+    `logs` (an ActionLog) and `react_trace` render their text only when read;
+    serialize with `json.dumps(result, default=json_default)` or their `to_list()`.
+    Balances, temperatures and verify outcomes are also appended to the
+    process-wide history store (core/timeseries.py).
+    """
+    with metrics.tracing() as spans, metrics.span("total"):
+        with metrics.span("load"):
+            cs = _load_snapshot(scenario_id, frame).overlay()
+        if induce_failure:
+            _induce_failure(cs)
+        temp0 = cs["temp_c"].copy()
+        if llm_deadline_s is None:
+            llm_deadline_s = llm_deadline()
+        speculative = DeadlinePlanner() if use_llm and llm_deadline_s is not None else None
+        plan_fn = None if speculative is None else speculative.bind(time.monotonic() + llm_deadline_s)
+        bal0, plan, reasoning, logs, verification = _control_step(
+            cs, tau, use_llm=use_llm, planner=planner, plan_fn=plan_fn
+        )
+        trace = ReactTrace(reasoning, logs, verification)
+        _record_history(cs, bal0, temp0, verification)
+    result = {
         "scenario": scenario_id,
         "balance_before": bal0,
         "balance_after": verification["balance_after"],
-        "temp_before": state["temp_c"].copy(),
-        "temp_after": new_state["temp_c"].copy(),
+        "temp_before": temp0,
+        "temp_after": cs["temp_c"].copy(),
         "plan": plan,
         "logs": logs,
         "verify": verification,
         "react_trace": trace,
     }
+    if speculative is not None:
+        result["speculation"] = speculative.speculation
+        speculative.close()
+    if spans is not None:
+        result["timings_ms"] = spans.timings
+        result["counters"] = spans.counters
+    return result
+
+
+def simulate_dc(
+    scenario_id="A", ticks=1000, tau=-2.0, planner="greedy", seed=0, record_clusters=False, sink=NULL_SINK
+):
+    """Replay `ticks` control periods starting from a scenario snapshot; see core/simulator.py.
+
+    Alerts go to `sink` (discarded by default; pass None for the alerts.log sink).
+    """
+    cs = _load_snapshot(scenario_id).overlay()
+    res = simulate(
+        cs,
+        ticks,
+        lambda s, monitor: _plan_step(s, planner=planner, monitor=monitor)[1],
+        tau=tau,
+        seed=seed,
+        record_clusters=record_clusters,
+        sink=sink,
+    )
+    res["scenario"] = scenario_id
+    return res
+
+
+def live_dc(
+    scenario_id="A",
+    tau=-2.0,
+    induce_failure=False,
+    use_llm=False,
+    planner="greedy",
+    interval_s=DEFAULT_INTERVAL_S,
+    seed=0,
+    sink=None,
+):
+    """Start a background controller on a live plant; see core/live.py.
+
+    Every `interval_s` the scenario's plant advances one `step_physics` tick
+    (seeded load noise) and a full control step runs on it. Each step's result
+    (timestep, balances, temperatures, plan, verify) is published on the
+    returned LiveController and recorded in its own in-memory `history` store
+    (core/timeseries.py), so other runs in the process never show up in its
+    charts. Call `stop()` when done.
+    """
+    cs = _load_snapshot(scenario_id).overlay()
+    if induce_failure:
+        _induce_failure(cs)
+    nominal, temp_offset = plant_baseline(cs)
+    rng = np.random.default_rng(seed)
+    history = timeseries.TimeSeriesStore()
+
+    def step():
+        step_physics(cs, nominal, temp_offset, rng.normal(0.0, LOAD_DRIFT_KW, size=cs.size))
+        cs.extra["timestep"] = int(cs.extra.get("timestep", 0)) + 1
+        temp0 = cs["temp_c"].copy()
+        bal0, plan, reasoning, logs, verification = _control_step(
+            cs, tau, use_llm=use_llm, planner=planner, sink=sink
+        )
+        _record_history(cs, bal0, temp0, verification, store=history)
+        return {
+            "timestep": cs.extra["timestep"],
+            "balance_before": bal0,
+            "balance_after": verification["balance_after"],
+            "temp_before": temp0,
+            "temp_after": cs["temp_c"].copy(),
+            "plan": plan,
+            "verify": verification,
+        }
+
+    return LiveController(step, interval_s, name=f"gridguardian-live-{scenario_id}", history=history).start()
+
+
+def daemon_dc(
+    scenario_id="A",
+    tau=-2.0,
+    use_llm=False,
+    planner="greedy",
+    period_s=DEFAULT_PERIOD_S,
+    source=None,
+    seed=0,
+    max_ticks=None,
+    on_tick=None,
+    sink=None,
+):
+    """Headless control loop at a fixed period; `.run()` blocks until `.stop()`. See core/daemon.py.
+
+    Each tick controls either the scenario's drifting plant (one `step_physics`
+    tick per period) or, with `source`, the newest telemetry snapshot (ticks
+    with nothing new are idle). An LLM plan must arrive within PLAN_BUDGET of
+    the period, otherwise the tick runs `planner` instead and is reported as
+    degraded. On stop, alerts and the history store are flushed.
+    """
+    llm = DeadlinePlanner()
+    feed = None
+    if source is not None:
+        meta = _load_clusters_meta()
+        feed = LatestSnapshot(open_source(source, follow=True) if isinstance(source, str) else source)
+
+        def next_state():
+            snap = feed.take()
+            if snap is None:
+                if feed.finished:
+                    loop.stop()
+                return None
+            return _normalize_cluster_state(meta, snap)
+
+    else:
+        plant = _load_snapshot(scenario_id).overlay()
+        nominal, temp_offset = plant_baseline(plant)
+        rng = np.random.default_rng(seed)
+
+        def next_state():
+            step_physics(plant, nominal, temp_offset, rng.normal(0.0, LOAD_DRIFT_KW, size=plant.size))
+            plant.extra["timestep"] = int(plant.extra.get("timestep", 0)) + 1
+            return plant
+
+    def tick(deadline):
+        cs = next_state()
+        if cs is None:
+            return {"idle": True}
+        temp0 = cs["temp_c"].copy()
+        plan_fn = llm.bind(deadline - (1.0 - PLAN_BUDGET) * period_s)
+        bal0, plan, reasoning, logs, verification = _control_step(
+            cs, tau, use_llm=use_llm, planner=planner, sink=sink, plan_fn=plan_fn
+        )
+        _record_history(cs, bal0, temp0, verification)
+        return {
+            "timestep": cs.extra.get("timestep"),
+            "stable": verification["stable"],
+            "actions": len(plan["actions"]),
+            "degraded": llm.degraded,
+            "speculation": llm.speculation,
+        }
+
+    def shutdown():
+        llm.close()
+        if feed is not None:
+            feed.close()
+        (sink or get_sink()).flush()
+        timeseries.flush()
+
+    loop = FixedRateLoop(tick, period_s, max_ticks=max_ticks, on_tick=on_tick, on_stop=shutdown)
+    return loop
+
+
+def publish_dc(scenario_id="A", name=None):
+    """Publish a scenario snapshot to shared memory; see core/shared_state.py.
+
+    The caller becomes the single writer: drive it with `control_shared`, and
+    call `close()` + `unlink()` (or use it as a context manager) when done.
+    Other processes read it with `SharedClusterState.attach(shared.name)`.
+    """
+    return SharedClusterState.create(_load_snapshot(scenario_id), name=name)
+
+
+def control_shared(shared, tau=-2.0, use_llm=False, planner="greedy", sink=None):
+    """One control step on a published state, applied in place under the seqlock.
+
+    Monitoring and planning read the writer's own columns outside the write
+    section, so readers only retry while the plan is being applied; the
+    timestep advances in the same section.
+    """
+    cs = shared.state
+    bal0, plan, reasoning, logs, verification = _control_step(
+        cs, tau, use_llm=use_llm, planner=planner, sink=sink, guard=shared.write(tick=True)
+    )
+    return {
+        "timestep": shared.timestep,
+        "generation": shared.generation,
+        "balance_before": bal0,
+        "plan": plan,
+        "logs": logs,
+        "verify": verification,
+    }
+
+
+def stream_dc(source, tau=-2.0, use_llm=False, planner="greedy", maxsize=64, overload="drop_oldest", follow=False, sink=None):
+    """Control loop over streamed telemetry; see core/ingest.py.
 
+    `source` is an iterable of snapshots (scenario file shape) or a spec string:
+    an NDJSON file / named pipe path, `unix:/path` or `tcp:host:port`. Each
+    snapshot is normalized against clusters.json like `_normalize_state` and run
+    through monitor → planner → apply_plan → verify as it arrives. Iterate the
+    returned pipeline for per-snapshot results; `pipeline.stats()` reports
+    throughput, latency and drops.
+    """
+    meta = _load_clusters_meta()
+    errors = [0]
+    if isinstance(source, str):
+        source = open_source(source, follow=follow, errors=errors)
+
+    def process(snap):
+        cs = _normalize_cluster_state(meta, snap)
+        temp0 = cs["temp_c"].copy()
+        bal0, plan, reasoning, logs, verification = _control_step(
+            cs, tau, use_llm=use_llm, planner=planner, sink=sink
+        )
+        _record_history(cs, bal0, temp0, verification)
+        return {
+            "timestep": snap.get("timestep"),
+            "balance_before": bal0,
+            "plan": plan,
+            "reasoning": reasoning,
+            "verify": verification,
+        }
 
-def evaluate_dc(tau=-2.0, use_llm=False):
-    configs = [("A", False), ("A", True), ("B", False), ("B", True)]
+    return TelemetryPipeline(source, process, maxsize=maxsize, overload=overload, parse_errors=errors)
+
+
+EVAL_CONFIGS = (("A", False), ("A", True), ("B", False), ("B", True))
+SWEEP_TAUS = np.linspace(-10.0, 0.0, 101)
+
+
+def evaluate_dc(tau=-2.0, use_llm=False, planner="greedy", llm_deadline_s=None):
     runs = []
     passed = 0
-    for scenario_id, induce in configs:
-        res = run_dc(scenario_id, tau=tau, induce_failure=induce, use_llm=use_llm)
+    for scenario_id, induce in EVAL_CONFIGS:
+        res = run_dc(
+            scenario_id, tau=tau, induce_failure=induce, use_llm=use_llm, planner=planner, llm_deadline_s=llm_deadline_s
+        )
         ok = res["verify"]["stable"]
         if ok:
             passed += 1
@@ -143,50 +527,65 @@ def evaluate_dc(tau=-2.0, use_llm=False):
     return {"passed": passed, "total": total, "score": passed / total if total else 0.0, "runs": runs}
 
 
-def evaluate_dc_nemotron(tau=-2.0, use_llm=False, n_scenarios=3):
-    meta_all = _load_clusters_meta()
-    keys = _cluster_keys(meta_all)
-    scenarios, notes = nemotron_generate_scenarios(meta_all, n=n_scenarios)
+def sweep_dc(taus=None, configs=EVAL_CONFIGS, use_llm=False, planner="greedy"):
+    """Stability of every (scenario, induce_failure) config over a grid of tau values.
+
+    The plan does not depend on tau (only `verify` does), so each config is
+    loaded, planned and executed once; every tau is then checked against that
+    post-plan state in one pass over its sorted balances. Returns per-config
+    curves (`stable`, `power_deficits` per tau) and the fleet `pass_rate` curve,
+    matching `evaluate_dc` at each tau. Nothing is alerted or recorded.
+    """
+    taus = np.asarray(SWEEP_TAUS if taus is None else taus, dtype=float)
     runs = []
-    passed = 0
-    for idx, snap in enumerate(scenarios):
-        state = {
-            "timestep": snap.get("timestep", 0),
-            "power_draw_kw": snap.get("power_draw_kw", {}),
-            "cooling_online_kw": snap.get("cooling_online_kw", {}),
-            "battery_kw": snap.get("battery_kw", {}),
-            "utilization": snap.get("utilization", {}),
-            "temp_c": snap.get("temp_c", {}),
-            "cooling_capacity_kw": meta_all.get("cooling_capacity_kw", {}),
-            "battery_max_kw": meta_all.get("battery_max_kw", {}),
-            "base_grid_kw": meta_all.get("base_grid_kw", {}),
-        }
-        state["base_grid_kw"] = _ensure_map(state["base_grid_kw"], keys, 0.0)
-        state["power_draw_kw"] = _ensure_map(state["power_draw_kw"], keys, 0.0)
-        state["cooling_online_kw"] = _ensure_map(state["cooling_online_kw"], keys, 0.0)
-        state["battery_kw"] = _ensure_map(state["battery_kw"], keys, 0.0)
-        state["utilization"] = _ensure_map(state["utilization"], keys, 0.0)
-        state["temp_c"] = _ensure_map(state["temp_c"], keys, 0.0)
-        state["battery_out_kw"] = _ensure_map(state.get("battery_out_kw"), keys, 0.0)
-        state["cooling_capacity_kw"] = _ensure_map(state["cooling_capacity_kw"], keys, 0.0)
-        bal0 = power_balance(state["base_grid_kw"], state["power_draw_kw"], state["battery_out_kw"])
-        therm0 = thermal_violations(state["temp_c"])
-        powdef0 = power_deficits(bal0)
-        plan, reasoning = plan_actions(
-            powdef0,
-            therm0,
-            bal0,
-            state["battery_kw"],
-            state["cooling_capacity_kw"],
-            state["cooling_online_kw"],
-            state["base_grid_kw"],
-            state["power_draw_kw"].copy(),
-            use_llm=use_llm,
+    passed = np.zeros(len(taus), dtype=int)
+    for scenario_id, induce in configs:
+        cs = _load_snapshot(scenario_id).overlay()
+        if induce:
+            _induce_failure(cs)
+        _, plan, _, _ = _plan_step(cs, use_llm=use_llm, planner=planner)
+        bal = np.sort(balance_array(cs))
+        hot = int(thermal_mask(cs.column("temp_c")).sum())
+        # deficits at tau are balances < tau; stable iff none and nothing over temperature
+        deficits = np.searchsorted(bal, taus, side="left")
+        stable = (deficits == 0) & (hot == 0)
+        passed += stable
+        runs.append(
+            {
+                "scenario": scenario_id,
+                "induce_failure": induce,
+                "min_balance": float(bal[0]) if len(bal) else 0.0,
+                "thermal_violations": hot,
+                "actions": len(plan["actions"]),
+                "stable": stable.tolist(),
+                "power_deficits": deficits.tolist(),
+            }
         )
-        logs, new_state = apply_plan(state, plan, state["cooling_capacity_kw"])
-        verification = verify(new_state, tau)
-        if verification["stable"]:
-            passed += 1
+    total = len(runs)
+    return {
+        "taus": taus.tolist(),
+        "passed": passed.tolist(),
+        "total": total,
+        "pass_rate": (passed / total if total else np.zeros(len(taus))).tolist(),
+        "runs": runs,
+    }
+
+
+def evaluate_dc_nemotron_stream(tau=-2.0, use_llm=False, n_scenarios=3, planner="greedy", concurrency=None):
+    """`evaluate_dc_nemotron`, yielding a partial summary as each scenario is graded.
+
+    The first summary comes right after scenario generation (`done` = 0); every
+    later one adds a finished run, with `runs` kept in scenario order. The last
+    summary is the complete result.
+    """
+    meta_all = _load_clusters_meta()
+    keys = _cluster_keys(meta_all)
+    scenarios, notes = nemotron_generate_scenarios(meta_all, n=n_scenarios, concurrency=concurrency)
+
+    def _run_and_grade(item):
+        idx, snap = item
+        cs = _snapshot_state(snap, meta_all, keys)
+        _, plan, reasoning, logs, verification = _control_step(cs, tau, use_llm=use_llm, planner=planner)
         result = {
             "plan": plan,
             "logs": logs,
@@ -197,15 +596,239 @@ def evaluate_dc_nemotron(tau=-2.0, use_llm=False, n_scenarios=3):
             scenario=f"NEMO_{idx}",
             induce_failure=False,
             tau=tau,
-            planner="nemotron" if use_llm else "greedy",
+            planner="nemotron" if use_llm else planner,
         )
         grade = nemotron_grade({"result": summary})
-        runs.append({"result": summary, "grade": grade})
-    total = len(runs)
+        return {"result": summary, "grade": grade}
+
+    total = len(scenarios)
+    finished = {}
+
+    def _summary():
+        runs = [finished[i] for i in sorted(finished)]
+        passed = sum(1 for run in runs if run["result"]["stable"])
+        return {
+            "notes": notes,
+            "passed": passed,
+            "total": total,
+            "score": passed / total if total else 0.0,
+            "runs": runs,
+            "done": len(runs),
+        }
+
+    yield _summary()
+    for idx, run in iter_concurrent(_run_and_grade, enumerate(scenarios), concurrency):
+        finished[idx] = run
+        yield _summary()
+
+
+def evaluate_dc_nemotron(tau=-2.0, use_llm=False, n_scenarios=3, planner="greedy", concurrency=None):
+    """Generate scenarios, control each one and grade it with the critic.
+
+    Scenario generation and the per-scenario run + grade both go through the
+    shared Nemotron client with at most `concurrency` requests in flight.
+    """
+    for summary in evaluate_dc_nemotron_stream(tau, use_llm, n_scenarios, planner, concurrency):
+        pass
+    summary.pop("done")
+    return summary
+
+
+_mc_meta = None
+
+
+def _mc_init(meta=None):
+    # runs once per worker process: cluster metadata is loaded here, not per scenario
+    global _mc_meta
+    _mc_meta = meta if meta is not None else _load_clusters_meta()
+
+
+def _sampled_states(meta, keys, batch):
+    """ClusterStates for the rows of a `sample_batch` result; static columns are shared."""
+    registry = ClusterRegistry.get(keys)
+    static = {f: ensure_column(meta.get(f, {}), registry.names, 0.0) for f in STATIC_FIELDS}
+    extra = {"timestep": 0, "zones": meta["zones"]} if meta.get("zones") else {"timestep": 0}
+    for j in range(len(batch["temp_c"])):
+        columns = dict(static)
+        columns.update({f: batch[f][j].copy() for f in GEN_FIELDS})
+        columns["battery_out_kw"] = np.zeros(len(keys))
+        yield ClusterState(registry, columns, extra, shared=STATIC_FIELDS)
+
+
+def _mc_states(meta, keys, start, stop, seed, profile):
+    if profile is None:
+        return (_snapshot_state(_nemotron_gen_payload(meta, seed + i), meta, keys) for i in range(start, stop))
+    return _sampled_states(meta, keys, sample_batch(meta, start, stop, seed, profile))
+
+
+def _mc_snapshot(meta, i, seed, profile):
+    if profile is None:
+        return _nemotron_gen_payload(meta, seed + i)
+    batch = sample_batch(meta, i, i + 1, seed, profile)
+    return {f: dict(zip(meta["clusters"], batch[f][0].tolist())) for f in GEN_FIELDS}
+
+
+def _mc_chunk(start, stop, seed, tau, planner, profile=None):
+    meta = _mc_meta
+    keys = _cluster_keys(meta)
+    n = stop - start
+    stable = np.zeros(n, dtype=bool)
+    deficit = np.zeros(n)
+    min_bal = np.zeros(n)
+    max_temp = np.zeros(n)
+    hot = np.zeros(n, dtype=np.int32)
+    for j, cs in enumerate(_mc_states(meta, keys, start, stop, seed, profile)):
+        _, _, _, _, verification = _control_step(cs, tau, planner=planner, sink=NULL_SINK)
+        bal = balance_array(cs)
+        temp = cs.column("temp_c")
+        stable[j] = verification["stable"]
+        deficit[j] = np.clip(-bal, 0.0, None).sum()
+        min_bal[j] = bal.min() if len(bal) else 0.0
+        max_temp[j] = temp.max() if len(temp) else 0.0
+        hot[j] = len(verification["thermal_violations"])
+    return start, stable, deficit, min_bal, max_temp, hot
+
+
+def _distribution(values):
+    if not len(values):
+        return {}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]).tolist()
+    return {"mean": float(values.mean()), "p50": p50, "p90": p90, "p99": p99, "max": float(values.max())}
+
+
+def evaluate_dc_montecarlo(
+    n_scenarios=1000, seed=0, tau=-2.0, planner="greedy", workers=None, chunk_size=250, worst_k=5, profile=None
+):
+    """Evaluate `n_scenarios` locally sampled snapshots across a process pool.
+
+    Scenario i is drawn from `_nemotron_gen_payload(meta, seed + i)`, or with a
+    stress `profile` (agents/scenario_gen.STRESS_PROFILES) from the vectorized
+    `sample_batch`, a chunk at a time. Either way results depend only on `seed`
+    (and `profile`), never on `workers` or `chunk_size`. `workers=1` runs inline
+    without a pool.
+    """
+    meta = _load_clusters_meta()
+    bounds = [(lo, min(lo + chunk_size, n_scenarios)) for lo in range(0, n_scenarios, chunk_size)]
+    if workers == 1:
+        _mc_init(meta)
+        chunks = [_mc_chunk(lo, hi, seed, tau, planner, profile) for lo, hi in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_mc_init, initargs=(meta,)) as pool:
+            futures = [pool.submit(_mc_chunk, lo, hi, seed, tau, planner, profile) for lo, hi in bounds]
+            chunks = [f.result() for f in futures]
+    chunks.sort(key=lambda c: c[0])
+    stable, deficit, min_bal, max_temp, hot = (
+        np.concatenate([c[k] for c in chunks]) if chunks else np.zeros(0) for k in range(1, 6)
+    )
+
+    passed = int(stable.sum())
+    # worst first: largest residual deficit, then hottest
+    order = np.lexsort((-max_temp, -deficit))[:worst_k]
+    worst = [
+        {
+            "index": int(i),
+            "seed": seed + int(i),
+            "stable": bool(stable[i]),
+            "deficit_kw": float(deficit[i]),
+            "min_balance_kw": float(min_bal[i]),
+            "max_temp_c": float(max_temp[i]),
+            "snapshot": _mc_snapshot(meta, int(i), seed, profile),
+        }
+        for i in order.tolist()
+    ]
     return {
-        "notes": notes,
+        "seed": seed,
+        "tau": tau,
+        "planner": planner,
+        "profile": profile,
         "passed": passed,
-        "total": total,
-        "score": passed / total if total else 0.0,
-        "runs": runs,
+        "total": n_scenarios,
+        "score": passed / n_scenarios if n_scenarios else 0.0,
+        "deficit_kw": _distribution(deficit),
+        "min_balance_kw": _distribution(min_bal),
+        "max_temp_c": _distribution(max_temp),
+        "thermal_violations": _distribution(hot.astype(np.float64)),
+        "worst": worst,
+        "samples": {"stable": stable, "deficit_kw": deficit, "min_balance_kw": min_bal, "max_temp_c": max_temp},
+    }
+
+
+_ct_state = None
+
+
+def _ct_init(scenario_id, tau, planner, base_outcome):
+    # runs once per worker process; the base snapshot is shared by every contingency
+    global _ct_state
+    _ct_state = (_load_snapshot(scenario_id), tau, planner, base_outcome)
+
+
+def _ct_chunk(combos):
+    base, tau, planner, base_outcome = _ct_state
+    out = []
+    for combo in combos:
+        cs = base.overlay()
+        for kind, i in combo:
+            contingency.apply_fault(cs, kind, i)
+        _control_step(cs, tau, planner=planner, sink=NULL_SINK)
+        res = contingency.outcome(cs, tau, base_outcome)
+        res["faults"] = [{"kind": kind, "cluster": cs.names[i]} for kind, i in combo]
+        out.append(res)
+    return out
+
+
+def contingency_dc(
+    scenario_id="A", depth=2, tau=-2.0, planner="greedy", kinds=contingency.FAULT_KINDS, workers=None, chunk_size=256
+):
+    """N-1 (and up to N-`depth`) contingency screening of a scenario; see core/contingency.py.
+
+    Single faults are evaluated first; each higher order only enumerates
+    combinations that contain no critical lower-order one. Each order is
+    split into chunks of `chunk_size` across a process pool (`workers=1`, or a
+    single chunk, runs inline). Returns the base outcome, pruning counts and
+    `critical`, the contingencies that make the controlled state worse than the
+    controlled base, most severe first.
+    """
+    t0 = time.perf_counter()
+    base = _load_snapshot(scenario_id)
+    cs = base.overlay()
+    _control_step(cs, tau, planner=planner, sink=NULL_SINK)
+    base_outcome = contingency.outcome(cs, tau)
+    faults, no_effect = contingency.single_faults(base, kinds)
+
+    pool = None
+    if workers != 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_ct_init, initargs=(scenario_id, tau, planner, base_outcome)
+        )
+    _ct_init(scenario_id, tau, planner, base_outcome)
+    results, critical, evaluated, dominated = [], [], {}, 0
+    try:
+        for order in range(1, depth + 1):
+            combos, pruned = contingency.combinations(faults, order, critical)
+            dominated += pruned
+            chunks = [combos[lo : lo + chunk_size] for lo in range(0, len(combos), chunk_size)]
+            if pool is None or len(chunks) < 2:
+                found = [_ct_chunk(c) for c in chunks]
+            else:
+                found = list(pool.map(_ct_chunk, chunks))
+            for chunk, chunk_results in zip(chunks, found):
+                for combo, res in zip(chunk, chunk_results):
+                    if res["critical"]:
+                        critical.append(combo)
+                    results.append(res)
+            evaluated[order] = len(combos)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return {
+        "scenario": scenario_id,
+        "tau": tau,
+        "planner": planner,
+        "depth": depth,
+        "base": base_outcome,
+        "faults": len(faults),
+        "evaluated": evaluated,
+        "pruned": {"no_effect": no_effect, "dominated": dominated},
+        "critical": contingency.rank(results),
+        "elapsed_s": time.perf_counter() - t0,
     }
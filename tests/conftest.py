@@ -0,0 +1,40 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# no history.npz next to the tests; must be set before core_app is imported
+os.environ.setdefault("GRIDGUARDIAN_HISTORY", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents import llm_cache, llm_client  # noqa: E402
+from agents.llm_cache import ResponseCache  # noqa: E402
+from bench.stub_llm import StubServer  # noqa: E402
+from core import alerts  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _memory_alerts():
+    # keep verify() from appending to the repo's alerts.log
+    sink = alerts.MemorySink()
+    alerts.set_sink(sink)
+    yield sink
+    alerts.set_sink(None)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Local stub Nemotron endpoint with a fresh client session and the response cache off."""
+    srv = StubServer(("127.0.0.1", 0))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setenv("NEMOTRON_URL", srv.url)
+    monkeypatch.setenv("NEMOTRON_KEY", "stub")
+    llm_cache.set_cache(ResponseCache(directory=None, mode="off"))
+    llm_client.close()
+    yield srv
+    llm_client.close()
+    llm_cache.set_cache(None)
+    srv.shutdown()
+    srv.server_close()
@@ -0,0 +1,38 @@
+import itertools
+
+import pytest
+
+import core_app
+from core import contingency
+from core.alerts import NULL_SINK
+
+
+def _key(res):
+    return frozenset((f["kind"], f["cluster"]) for f in res["faults"])
+
+
+@pytest.mark.parametrize("scenario", ["A", "B"])
+def test_pruning_matches_brute_force(scenario):
+    tau = -2.0
+    base = core_app._load_snapshot(scenario)
+    cs = base.overlay()
+    core_app._control_step(cs, tau, sink=NULL_SINK)
+    base_outcome = contingency.outcome(cs, tau)
+    faults, _ = contingency.single_faults(base)
+    core_app._ct_init(scenario, tau, "greedy", base_outcome)
+
+    singles = core_app._ct_chunk([(f,) for f in faults])
+    doubles = core_app._ct_chunk(list(itertools.combinations(faults, 2)))
+    critical_singles = {_key(r) for r in singles if r["critical"]}
+    critical_doubles = {_key(r) for r in doubles if r["critical"]}
+
+    # dominance: every double containing a critical single is itself critical
+    for res in doubles:
+        if any(s <= _key(res) for s in critical_singles):
+            assert res["critical"], res["faults"]
+
+    screened = core_app.contingency_dc(scenario, depth=2, tau=tau, workers=1)
+    found = {_key(r) for r in screened["critical"]}
+    undominated = {d for d in critical_doubles if not any(s <= d for s in critical_singles)}
+    assert found == critical_singles | undominated
+    assert screened["evaluated"] == {1: len(faults), 2: len(doubles) - screened["pruned"]["dominated"]}
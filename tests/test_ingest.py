@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+import pytest
+
+from core.ingest import TelemetryPipeline, ndjson_source
+
+N = 50
+
+
+def _run(pipeline, timeout=10.0):
+    out = []
+    worker = threading.Thread(target=lambda: out.extend(pipeline), daemon=True)
+    worker.start()
+    worker.join(timeout)
+    assert not worker.is_alive(), "pipeline did not finish"
+    return out
+
+
+def _stalled(n=N):
+    """A source and process where the consumer is stuck on the first snapshot until the source is exhausted."""
+    started, done = threading.Event(), threading.Event()
+
+    def source():
+        yield {"temp_c": {"c0": 0.0}}
+        started.wait(5)
+        for i in range(1, n):
+            yield {"temp_c": {f"c{i}": float(i)}}
+        done.set()
+
+    def process(snap):
+        started.set()
+        done.wait(5)
+        return {"snap": snap}
+
+    return source(), process
+
+
+def test_block_loses_nothing():
+    def process(snap):
+        time.sleep(0.001)
+        return {"snap": snap}
+
+    pipeline = TelemetryPipeline(({"i": i} for i in range(N)), process, maxsize=2, overload="block")
+    out = _run(pipeline)
+    assert [r["snap"]["i"] for r in out] == list(range(N))
+    assert pipeline.counters["dropped"] == pipeline.counters["coalesced"] == 0
+    assert pipeline.counters["high_water"] <= 2
+
+
+def test_drop_oldest_keeps_newest():
+    source, process = _stalled()
+    pipeline = TelemetryPipeline(source, process, maxsize=2, overload="drop_oldest")
+    out = _run(pipeline)
+    c = pipeline.counters
+    assert c["received"] == N
+    assert c["processed"] + c["dropped"] == N
+    assert c["dropped"] > 0
+    assert list(out[-1]["snap"]["temp_c"]) == [f"c{N - 1}"]
+
+
+def test_coalesce_merges_fields():
+    source, process = _stalled()
+    pipeline = TelemetryPipeline(source, process, maxsize=2, overload="coalesce")
+    out = _run(pipeline)
+    c = pipeline.counters
+    assert c["received"] == N
+    assert c["processed"] + c["coalesced"] == N
+    assert c["dropped"] == 0
+    seen = set()
+    for r in out:
+        seen.update(r["snap"]["temp_c"])
+    assert seen == {f"c{i}" for i in range(N)}
+
+
+def test_coalesce_latency_counts_from_oldest_part():
+    started, done = threading.Event(), threading.Event()
+
+    def source():
+        yield {"a": 0}
+        started.wait(5)  # the consumer now holds the first snapshot
+        yield {"a": 1}
+        time.sleep(0.2)
+        yield {"b": 2}  # queue full: folded into {"a": 1}
+        done.set()
+
+    def process(snap):
+        started.set()
+        done.wait(5)
+        return {"snap": snap}
+
+    out = _run(TelemetryPipeline(source(), process, maxsize=1, overload="coalesce"))
+    assert out[-1]["snap"] == {"a": 1, "b": 2}
+    assert out[-1]["latency_ms"] >= 200.0
+
+
+def test_follow_holds_partial_line(tmp_path):
+    path = tmp_path / "feed.ndjson"
+    path.write_text('{"a": 1}\n{"b":')
+    errors = [0]
+    source = ndjson_source(path, follow=True, poll_s=0.01, errors=errors)
+    assert next(source) == {"a": 1}
+
+    def finish():
+        time.sleep(0.1)
+        with open(path, "a") as fh:
+            fh.write(' 2}\n')
+
+    threading.Thread(target=finish, daemon=True).start()
+    assert next(source) == {"b": 2}
+    assert errors[0] == 0
+    source.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_follow_fifo_ends_when_writer_closes(tmp_path):
+    path = tmp_path / "feed.fifo"
+    os.mkfifo(path)
+
+    def write():
+        with open(path, "w") as fh:
+            fh.write('{"a": 1}\n{"b": 2}\n{"c": 3}')
+
+    threading.Thread(target=write, daemon=True).start()
+    out = []
+    reader = threading.Thread(target=lambda: out.extend(ndjson_source(path, follow=True, poll_s=0.01)), daemon=True)
+    reader.start()
+    reader.join(5)
+    assert not reader.is_alive(), "follow on a FIFO did not stop at EOF"
+    assert out == [{"a": 1}, {"b": 2}, {"c": 3}]
@@ -0,0 +1,133 @@
+import json
+import os
+import time
+
+import pytest
+
+from agents import llm_cache, llm_client
+from agents.llm_cache import CacheMiss, ResponseCache, request_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache(directory=tmp_path, memory_entries=2)
+    llm_cache.set_cache(c)
+    yield c
+    llm_cache.set_cache(None)
+
+
+def test_key_ignores_user_dict_order():
+    a = request_key("m", "sys", json.dumps({"x": 1, "y": {"b": 2, "a": 3}}))
+    b = request_key("m", "sys", json.dumps({"y": {"a": 3, "b": 2}, "x": 1}))
+    assert a == b
+    assert a != request_key("m", "sys", json.dumps({"x": 1, "y": {"a": 3, "b": 4}}))
+    assert a != request_key("other", "sys", json.dumps({"x": 1, "y": {"a": 3, "b": 2}}))
+
+
+def test_memory_lru_then_disk(cache):
+    for k in ("k1", "k2", "k3"):
+        cache.put(k, f'"{k}"', 0.5)
+    assert list(cache._memory) == ["k2", "k3"]  # k1 pushed out of the 2-entry LRU
+
+    assert cache.get("k3") == '"k3"'
+    assert cache.get("k1") == '"k1"'
+    stats = cache.snapshot_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 0)
+    assert list(cache._memory) == ["k3", "k1"]  # the disk hit is promoted
+    assert cache.get("missing") is None
+    assert cache.snapshot_stats()["misses"] == 1
+
+
+def test_disk_entry_expires(cache):
+    cache.put("old", '"old"')
+    cache._memory.clear()
+    cache._account(0)
+    path = cache._path("old")
+    stale = time.time() - cache.ttl_s - 60
+    os.utime(path, (stale, stale))
+
+    assert cache.get("old") is None
+    assert not path.exists()
+    assert cache._disk_bytes == 0
+
+
+def test_disk_trimmed_to_byte_budget(tmp_path):
+    cache = ResponseCache(directory=tmp_path, max_bytes=1000)
+    now = time.time()
+    for i in range(20):
+        cache.put(f"{i:02d}" + "0" * 62, json.dumps("x" * 100))
+        path = cache._path(f"{i:02d}" + "0" * 62)
+        os.utime(path, (now - 100 + i, now - 100 + i))
+
+    files = list(tmp_path.glob("*/*.json"))
+    total = sum(p.stat().st_size for p in files)
+    assert total <= 1000
+    assert cache._disk_bytes == total
+    assert cache.stats["evictions"] > 0
+    kept = sorted(p.stem[:2] for p in files)
+    assert kept == [f"{i:02d}" for i in range(20 - len(kept), 20)]  # oldest went first
+
+
+def test_replay_miss_raises(tmp_path, monkeypatch):
+    llm_cache.set_cache(ResponseCache(directory=tmp_path, mode="replay"))
+    monkeypatch.delenv("NEMOTRON_KEY", raising=False)
+    try:
+        assert llm_client.available()
+        with pytest.raises(CacheMiss):
+            llm_client.chat_json("sys", json.dumps({"a": 1}))
+    finally:
+        llm_cache.set_cache(None)
+
+
+class _Response:
+    def __init__(self, content):
+        self._content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+class _Session:
+    def __init__(self, content):
+        self.content = content
+        self.posts = 0
+
+    def post(self, *args, **kwargs):
+        self.posts += 1
+        return _Response(self.content)
+
+
+def _reject_empty(payload):
+    if not payload.get("actions"):
+        raise ValueError("no actions")
+
+
+def test_invalid_response_not_cached(cache, monkeypatch):
+    fake = _Session(json.dumps({"actions": []}))
+    monkeypatch.setattr(llm_client, "session", lambda: fake)
+    user = json.dumps({"a": 1})
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            llm_client.chat_json("sys", user, key="k", validate=_reject_empty)
+    assert fake.posts == 2
+    assert cache.get(request_key(llm_client.DEFAULT_MODEL, "sys", user)) is None
+
+    fake.content = json.dumps({"actions": [{"type": "battery"}]})
+    assert llm_client.chat_json("sys", user, key="k", validate=_reject_empty)["actions"]
+    assert llm_client.chat_json("sys", user, key="k", validate=_reject_empty)["actions"]
+    assert fake.posts == 3
+
+
+def test_cached_response_failing_validation_is_evicted(cache):
+    user = json.dumps({"a": 1})
+    key = request_key(llm_client.DEFAULT_MODEL, "sys", user)
+    cache.put(key, json.dumps({"actions": []}))
+
+    with pytest.raises(ValueError):
+        llm_client.chat_json("sys", user, key="k", validate=_reject_empty)
+    assert key not in cache._memory
+    assert not cache._path(key).exists()
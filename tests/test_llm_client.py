@@ -0,0 +1,60 @@
+import json
+import threading
+import time
+
+import pytest
+
+import core_app
+from agents import llm_client
+
+
+def test_serial_calls_reuse_one_connection(server):
+    for i in range(5):
+        out = llm_client.chat_json("You are a datacenter planner.", json.dumps({"i": i}))
+        assert out == {"actions": []}
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+def _tracked(limit_seen):
+    lock = threading.Lock()
+    active = [0]
+
+    def fn(x):
+        with lock:
+            active[0] += 1
+            limit_seen.append(active[0])
+        time.sleep(0.01 * (5 - x % 5))  # later items finish first
+        with lock:
+            active[0] -= 1
+        return x * x
+
+    return fn
+
+
+def test_map_concurrent_limit_and_order():
+    seen = []
+    assert llm_client.map_concurrent(_tracked(seen), range(12), limit=3) == [x * x for x in range(12)]
+    assert max(seen) == 3
+
+
+def test_iter_concurrent_limit_and_indices():
+    seen = []
+    pairs = list(llm_client.iter_concurrent(_tracked(seen), range(12), limit=3))
+    assert max(seen) == 3
+    assert sorted(pairs) == [(i, i * i) for i in range(12)]
+
+
+def test_bad_concurrency_env_falls_back(monkeypatch):
+    monkeypatch.setenv("NEMOTRON_CONCURRENCY", "lots")
+    with pytest.warns(UserWarning, match="NEMOTRON_CONCURRENCY"):
+        assert llm_client.concurrency() == llm_client.DEFAULT_CONCURRENCY
+
+
+def test_evaluate_dc_nemotron_against_stub(server):
+    res = core_app.evaluate_dc_nemotron(n_scenarios=3, concurrency=2)
+    assert res["total"] == 3
+    assert len(res["runs"]) == 3
+    assert all(run["grade"]["notes"] == "stub critic" for run in res["runs"])
+    assert not any(note.startswith("Nemotron error") for note in res["notes"])
+    assert server.requests >= 4  # scenario generation plus one critic call per run
@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import pytest
+
+from agents.executor import apply_plan
+from agents.monitor import IncrementalMonitor, balance_array, deficit_mask, monitor_state, thermal_mask
+from bench.fleet import synthetic_fleet
+from core_app import _normalize_cluster_state
+
+TAUS = (-2.0, 0.0, 5.0)
+
+
+def _random_actions(names, rnd, n):
+    actions = []
+    for _ in range(n):
+        kind = rnd.random()
+        if kind < 0.3:
+            actions.append({"type": "cooling", "cluster": rnd.choice(names), "kw": rnd.uniform(0, 15)})
+        elif kind < 0.6:
+            actions.append({"type": "battery", "cluster": rnd.choice(names), "kw": rnd.uniform(0, 10)})
+        else:
+            src, dst = rnd.sample(names, 2)
+            actions.append({"type": "redistribute", "from": src, "to": dst, "kw": rnd.uniform(0, 20)})
+    return actions
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_incremental_matches_full_recompute(seed, monkeypatch):
+    monkeypatch.setenv("MONITOR_DEBUG", "1")
+    rnd = random.Random(seed)
+    cs = _normalize_cluster_state(*synthetic_fleet(rnd.choice([4, 12, 40]), seed))
+    monitor = IncrementalMonitor(cs)
+    assert monitor.debug
+    names = list(cs.names)
+
+    for _ in range(5):
+        plan = {"actions": _random_actions(names, rnd, rnd.randint(1, 60))}
+        apply_plan(cs, plan, cs["cooling_capacity_kw"], on_delta=monitor.record, batched=rnd.random() < 0.5)
+
+        assert monitor.state() == monitor_state(cs)
+        bal = balance_array(cs)
+        assert np.array_equal(monitor.balance, bal)
+        assert np.array_equal(monitor.thermal, thermal_mask(cs.column("temp_c")))
+        for tau in TAUS:
+            assert np.array_equal(monitor.deficits(tau), deficit_mask(bal, tau))
+
+
+def test_debug_catches_divergence(monkeypatch):
+    monkeypatch.setenv("MONITOR_DEBUG", "1")
+    cs = _normalize_cluster_state(*synthetic_fleet(4, 0))
+    monitor = IncrementalMonitor(cs)
+    cs.writable("power_draw_kw")[0] += 100.0  # a write the monitor is not told about
+    monitor.record(cs.names[1], "power_draw_kw", 1.0)
+    with pytest.raises(RuntimeError, match="diverged"):
+        monitor.refresh()
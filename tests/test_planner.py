@@ -0,0 +1,54 @@
+import time
+
+import agents.planner as planner
+import core_app
+from agents.zone_planner import zone_plan
+
+
+def test_speculative_llm_sees_state_before_local_plan(monkeypatch):
+    seen = {}
+
+    def slow_nemotron(power_defs, therm_viol, balance, battery_kw, cooling_cap, cooling_on, base_grid, power_draw):
+        # read the prompt inputs only after the local planner has run on the caller's thread
+        time.sleep(0.2)
+        seen.update(power_draw)
+        return {"actions": []}, ["stub"]
+
+    monkeypatch.setattr(planner, "_nemotron_plan", slow_nemotron)
+    before = core_app._load_snapshot("A").overlay()
+    core_app._induce_failure(before)
+
+    res = core_app.run_dc("A", induce_failure=True, use_llm=True, llm_deadline_s=1.0)
+
+    assert res["speculation"]["winner"] == "nemotron"
+    assert seen == dict(before["power_draw_kw"])
+
+
+def _zone_inputs():
+    clusters = ["A", "B", "C"]
+    zero = {c: 0.0 for c in clusters}
+    # A is 10 kW short and only C has grid headroom
+    return (
+        {"A": -10.0},
+        {},
+        {"A": -10.0, "B": 0.0, "C": 0.0},
+        dict(zero),
+        dict(zero),
+        dict(zero),
+        {"A": 20.0, "B": 20.0, "C": 50.0},
+        {"A": 30.0, "B": 20.0, "C": 20.0},
+    )
+
+
+def test_zone_plan_reports_zones_and_cross_zone_transfers():
+    stats = {}
+    plan = zone_plan(*_zone_inputs(), zones={"z1": ["A", "B"]}, workers=1, stats=stats)
+    assert stats == {"zones": 2, "cross_zone": 1}
+    assert plan["actions"] == [{"type": "redistribute", "from": "A", "to": "C", "kw": 10.0}]
+
+    plan, reasoning = planner.plan_actions(*_zone_inputs(), planner="zone", zones={"z1": ["A", "B"]})
+    assert reasoning == ["Zone planner planned 2 zone(s); the coordinator added 1 cross-zone transfer(s)."]
+
+    plan, reasoning = planner.plan_actions(*_zone_inputs(), planner="zone", zones={"z1": ["A", "C"]})
+    assert plan["actions"] == [{"type": "redistribute", "from": "A", "to": "C", "kw": 10.0}]
+    assert reasoning == ["Zone planner planned 2 zone(s)."]
@@ -0,0 +1,105 @@
+import json
+
+import numpy as np
+import pytest
+
+import core_app
+from agents import scenario_gen
+from agents.scenario_gen import (
+    GEN_FIELDS,
+    SAMPLE_BLOCK,
+    STRESS_PROFILES,
+    _check_snapshots,
+    _nemotron_gen_payload,
+    iter_sample_batches,
+    nemotron_generate_scenarios,
+    sample_batch,
+)
+
+META = {"clusters": ["GPU_A", "CPU_B", "GPU_C", "CPU_D", "GPU_E"]}
+
+
+@pytest.mark.parametrize("profile", sorted(STRESS_PROFILES))
+def test_slices_match_full_run(profile):
+    n = 2 * SAMPLE_BLOCK + 100
+    full = sample_batch(META, 0, n, seed=7, profile=profile)
+    for start, stop in ((0, 1), (3, 90), (SAMPLE_BLOCK - 5, SAMPLE_BLOCK + 5), (SAMPLE_BLOCK + 1, n)):
+        part = sample_batch(META, start, stop, seed=7, profile=profile)
+        for f in GEN_FIELDS:
+            assert np.array_equal(part[f], full[f][start:stop]), (start, stop, f)
+    batches = list(iter_sample_batches(META, n, seed=7, profile=profile, batch_size=100))
+    assert [start for start, _ in batches] == list(range(0, n, 100))
+    for f in GEN_FIELDS:
+        assert np.array_equal(np.concatenate([b[f] for _, b in batches]), full[f])
+
+
+def test_profiles_shape_the_fleet():
+    batch = sample_batch(META, 0, 500, seed=1, profile="hot_donor")
+    hot = batch["temp_c"] >= 86
+    assert (hot.sum(axis=1) >= 1).all()
+    assert (batch["utilization"] <= 1.0).all() and (batch["utilization"] >= 0.1).all()
+
+
+def _valid(seed):
+    return _nemotron_gen_payload(META, seed)
+
+
+def test_check_snapshots_rejects_bad_rows():
+    good = _valid(1)
+    missing = _valid(2)
+    del missing["temp_c"]["GPU_C"]
+    negative = _valid(3)
+    negative["battery_kw"]["CPU_B"] = -1
+    overloaded = _valid(4)
+    overloaded["utilization"]["GPU_A"] = 1.5
+    garbage = _valid(5)
+    garbage["power_draw_kw"]["CPU_D"] = "lots"
+    nan = _valid(6)
+    nan["cooling_online_kw"]["GPU_E"] = float("nan")
+
+    out = _check_snapshots({"snapshots": [missing, good, negative, overloaded, garbage, nan, "x"]}, META["clusters"])
+    assert out == [{f: {c: float(v) for c, v in good[f].items()} for f in GEN_FIELDS}]
+    with pytest.raises(ValueError):
+        _check_snapshots({"snaps": []}, META["clusters"])
+
+
+def _fake_chat(payload):
+    def chat_json(system, user, key=None, validate=None):
+        if validate is not None:
+            validate(payload)
+        return payload
+
+    return chat_json
+
+
+def test_invalid_snapshots_filled_from_local_sampler(monkeypatch):
+    bad = _valid(9)
+    bad["utilization"]["GPU_A"] = 2.0
+    good = _valid(8)
+    monkeypatch.setattr(scenario_gen, "available", lambda: True)
+    monkeypatch.setattr(scenario_gen, "chat_json", _fake_chat({"snapshots": [bad, good]}))
+
+    scenarios, notes = nemotron_generate_scenarios(META, n=4, seed=100, concurrency=1, per_request=4)
+    assert len(scenarios) == 4
+    assert scenarios[0] == {f: {c: float(v) for c, v in good[f].items()} for f in GEN_FIELDS}
+    assert scenarios[1:] == [_valid(100 + j) for j in (1, 2, 3)]
+    assert notes == ["Nemotron request 0: 3 of 4 snapshots missing or invalid"]
+
+
+def test_unusable_response_falls_back_entirely(monkeypatch):
+    bad = _valid(9)
+    bad["temp_c"]["GPU_A"] = -5
+    monkeypatch.setattr(scenario_gen, "available", lambda: True)
+    monkeypatch.setattr(scenario_gen, "chat_json", _fake_chat({"snapshots": [bad]}))
+
+    scenarios, notes = nemotron_generate_scenarios(META, n=3, seed=0, concurrency=1, per_request=4)
+    assert scenarios == [_valid(j) for j in range(3)]
+    assert notes == ["Nemotron error on request 0: ValueError"]
+
+
+def test_stub_requests_return_distinct_snapshots(server):
+    meta = core_app._load_clusters_meta()
+    scenarios, notes = nemotron_generate_scenarios(meta, n=10, concurrency=2, per_request=4)
+    assert server.requests == 3
+    assert len({json.dumps(s, sort_keys=True) for s in scenarios}) == 10
+    assert not any(note.startswith("Nemotron") for note in notes)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import core_app
+from core.alerts import NULL_SINK
+from core.cluster_state import FIELDS
+from core.shared_state import SharedClusterState
+
+
+@pytest.fixture
+def shared():
+    writer = core_app.publish_dc("A")
+    reader = SharedClusterState.attach(writer.name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+    writer.unlink()
+
+
+def test_reader_sees_applied_plan(shared):
+    writer, reader = shared
+    base = reader.snapshot()
+    generation = reader.generation
+    assert base.extra["timestep"] == 0
+
+    res = core_app.control_shared(writer, sink=NULL_SINK)
+    snap = reader.snapshot()
+    assert res["plan"]["actions"]
+    assert res["timestep"] == snap.extra["timestep"] == reader.timestep == 1
+    assert reader.generation > generation
+    assert not np.array_equal(snap.column("power_draw_kw"), base.column("power_draw_kw"))
+    for f in FIELDS:
+        assert np.array_equal(snap.column(f), writer.state.column(f)), f
+
+    core_app.control_shared(writer, sink=NULL_SINK)
+    assert reader.snapshot().extra["timestep"] == 2
+
+
+def test_snapshot_times_out_during_write(shared):
+    writer, reader = shared
+    with writer.write():
+        with pytest.raises(TimeoutError):
+            reader.snapshot(retries=5)
+    assert reader.snapshot().extra["timestep"] == 0
+
+
+def test_readers_cannot_write(shared):
+    _, reader = shared
+    with pytest.raises(PermissionError):
+        with reader.write():
+            pass
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+import core_app
+from agents.monitor import IncrementalMonitor
+from agents.verifier import verify
+from core import simulator
+from core.alerts import MemorySink
+from core.state import LOAD_DRIFT_KW
+
+
+def _act(cs, monitor):
+    return core_app._plan_step(cs, monitor=monitor)[1]
+
+
+def _reference(cs, ticks, tau, seed):
+    """Plain per-tick loop: full verify() dicts and per-tick reductions."""
+    rng = np.random.default_rng(seed)
+    nominal, temp_offset = simulator.plant_baseline(cs)
+    noise = rng.normal(0.0, LOAD_DRIFT_KW, size=(ticks, cs.size))
+    monitor = IncrementalMonitor(cs)
+    sink = MemorySink(maxlen=ticks)
+    rows = []
+    for t in range(ticks):
+        simulator.step_physics(cs, nominal, temp_offset, noise[t])
+        monitor.recompute()
+        actions = 0
+        if monitor.deficits().any() or monitor.thermal.any():
+            actions = len(_act(cs, monitor)["actions"])
+        verification = verify(cs, tau, sink=sink, monitor=monitor)
+        bal = np.array(list(verification["balance_after"].values()))
+        rows.append(
+            (
+                verification["stable"],
+                actions,
+                np.clip(-bal, 0.0, None).sum(),
+                bal.min(),
+                cs.column("temp_c").max(),
+                cs.column("battery_kw").sum(),
+                cs.column("battery_out_kw").sum(),
+            )
+        )
+    return rows, sink.alerts
+
+
+@pytest.mark.parametrize("block", [simulator.NOISE_BLOCK, 12])
+@pytest.mark.parametrize("scenario", ["A", "B"])
+def test_simulate_matches_reference_loop(scenario, block, monkeypatch):
+    # a small NOISE_BLOCK puts several metric blocks (and a partial last one) in the run
+    monkeypatch.setattr(simulator, "NOISE_BLOCK", block)
+    ticks, tau, seed = 40, -2.0, 3
+    sink = MemorySink(maxlen=ticks)
+    res = simulator.simulate(
+        core_app._load_snapshot(scenario).overlay(), ticks, _act, tau=tau, seed=seed, record_clusters=True, sink=sink
+    )
+    rows, alerts = _reference(core_app._load_snapshot(scenario).overlay(), ticks, tau, seed)
+
+    m = res["metrics"]
+    fields = ("stable", "actions", "deficit_kw", "min_balance_kw", "max_temp_c", "battery_kw", "battery_out_kw")
+    for k, field in enumerate(fields):
+        assert np.array_equal(m[field], np.array([r[k] for r in rows], dtype=m[field].dtype)), field
+    assert sink.alerts == alerts
+    assert np.allclose(m["balance_kw"].min(axis=1), m["min_balance_kw"], atol=1e-3)
+    assert np.allclose(m["temp_c"].max(axis=1), m["max_temp_c"], atol=1e-3)
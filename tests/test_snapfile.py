@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pytest
+
+from core import snapfile
+from core.cluster_state import FIELDS, ClusterState
+from core.snapfile import SnapshotFile, SnapshotWriter, to_meta, to_scenario, write_snapshot
+from core_app import DATA_DIR, _normalize_cluster_state
+
+
+def _load_json(scenario):
+    with open(DATA_DIR / "clusters.json", "r", encoding="utf-8") as fh:
+        meta = json.load(fh)
+    with open(DATA_DIR / f"scenario_DC_{scenario}.json", "r", encoding="utf-8") as fh:
+        state = json.load(fh)
+    return meta, state
+
+
+def _assert_dicts_close(got, want, rtol):
+    assert got.keys() == want.keys()
+    for k, v in want.items():
+        if isinstance(v, dict) and all(isinstance(x, float) for x in v.values()):
+            assert got[k].keys() == v.keys(), k
+            assert np.allclose(list(got[k].values()), list(v.values()), rtol=rtol, atol=0), k
+        else:
+            assert got[k] == v, k
+
+
+@pytest.mark.parametrize("float32", [False, True])
+@pytest.mark.parametrize("scenario", ["A", "B"])
+def test_json_round_trip(tmp_path, scenario, float32):
+    dst = tmp_path / f"{scenario}.ggs"
+    argv = ["to-bin", str(DATA_DIR / f"scenario_DC_{scenario}.json"), str(dst)]
+    snapfile.main(argv + (["--float32"] if float32 else []))
+
+    expected = _normalize_cluster_state(*_load_json(scenario))
+    snap = SnapshotFile(dst)
+    assert len(snap) == 1
+    assert snap.dtype == (np.float32 if float32 else np.float64)
+    cs = snap.state(0)
+    rtol = 1e-6 if float32 else 0
+    _assert_dicts_close(to_scenario(cs), to_scenario(expected), rtol)
+    _assert_dicts_close(to_meta(cs), to_meta(expected), rtol)
+    if not float32:
+        for f in FIELDS:
+            assert np.array_equal(cs.column(f), expected.column(f)), f
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_history_frames(tmp_path, dtype):
+    base = _normalize_cluster_state(*_load_json("A"))
+    frames = []
+    for t in range(6):
+        cs = base.copy()
+        cs.writable("power_draw_kw")[:] += t
+        cs.writable("temp_c")[:] -= 0.5 * t
+        cs.extra["timestep"] = 10 + t
+        frames.append(cs)
+    path = write_snapshot(tmp_path / "hist.ggs", frames, dtype)
+
+    snap = SnapshotFile(path)
+    assert len(snap) == 6
+    assert snap.timesteps.tolist() == list(range(10, 16))
+    want = np.stack([f.column("power_draw_kw") for f in frames[1:4]]).astype(dtype)
+    assert np.array_equal(snap.history("power_draw_kw", 1, 4), want)
+    assert np.array_equal(snap.history("temp_c")[-1], frames[-1].column("temp_c").astype(dtype))
+    last = snap.state(-1)
+    assert last.extra["timestep"] == 15
+    assert [cs.extra["timestep"] for cs in snap.states(2, 4)] == [12, 13]
+
+
+def test_bad_header_rejected(tmp_path):
+    path = write_snapshot(tmp_path / "a.ggs", _normalize_cluster_state(*_load_json("A")))
+    raw = bytearray(path.read_bytes())
+
+    bad_magic = tmp_path / "magic.ggs"
+    bad_magic.write_bytes(b"NOTASNAP" + bytes(raw[8:]))
+    with pytest.raises(ValueError, match="not a GridGuardian snapshot"):
+        SnapshotFile(bad_magic)
+
+    bad_version = tmp_path / "version.ggs"
+    raw[8:16] = (99).to_bytes(8, "little")
+    bad_version.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match="Unsupported snapshot layout 99"):
+        SnapshotFile(bad_version)
+
+
+def test_failed_append_removes_file(tmp_path):
+    path = tmp_path / "partial.ggs"
+    cs = _normalize_cluster_state(*_load_json("A"))
+    other = ClusterState.from_dict({"clusters": ["X"], "temp_c": {"X": 1.0}})
+    with pytest.raises(ValueError):
+        with SnapshotWriter(path) as w:
+            w.append(cs)
+            w.append(other)
+    assert not path.exists()
+
+    with pytest.raises(ValueError, match="at least one frame"):
+        with SnapshotWriter(path):
+            pass
+    assert not path.exists()
@@ -0,0 +1,69 @@
+import numpy as np
+
+from core.timeseries import TimeSeriesStore
+
+TIERS = ((1.0, 8), (10.0, 4))
+NAMES = ["GPU_A", "CPU_B"]
+
+
+def _fill(store, start, stop, seed=0):
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for ts in np.arange(start, stop, 0.5):
+        values = rng.normal(50.0, 10.0, size=len(NAMES))
+        store.record("temp_c", values, NAMES, ts)
+        samples[float(ts)] = values
+    return samples
+
+
+def test_memory_and_rows_bounded():
+    store = TimeSeriesStore(TIERS)
+    _fill(store, 0, 30)
+    size = store.nbytes()
+    _fill(store, 30, 500, seed=1)
+    assert store.nbytes() == size
+    for k, (_, slots) in enumerate(TIERS):
+        rows = store.range("temp_c", tier=k)
+        assert 0 < len(rows["t"]) <= slots
+        assert rows["mean"].shape == (len(rows["t"]), len(NAMES))
+        assert np.all(np.diff(rows["t"]) > 0)
+
+
+def test_coarse_tier_is_exact_aggregate():
+    store = TimeSeriesStore(TIERS)
+    samples = _fill(store, 0, 100)
+    rows = store.range("temp_c", tier=1)
+    start = rows["t"][0]
+    raw = np.array([v for ts, v in samples.items() if ts >= start])
+
+    agg = store.aggregate("temp_c", tier=1)
+    assert agg["resolution_s"] == 10.0
+    assert agg["count"].tolist() == [len(raw)] * len(NAMES)
+    assert np.allclose(agg["mean"], raw.mean(axis=0), rtol=1e-6)
+    assert np.array_equal(agg["min"], raw.min(axis=0).astype(np.float32))
+    assert np.array_equal(agg["max"], raw.max(axis=0).astype(np.float32))
+
+    one = store.aggregate("temp_c", cluster="CPU_B", tier=1)
+    assert np.isclose(one["mean"], raw[:, 1].mean(), rtol=1e-6)
+
+
+def test_save_load_round_trip(tmp_path):
+    store = TimeSeriesStore(TIERS)
+    _fill(store, 0, 75)
+    store.record("stable", [1.0], ["fleet"], 74.0)
+    loaded = TimeSeriesStore.load(store.save(tmp_path / "history.npz"))
+
+    assert loaded.tiers == store.tiers
+    assert loaded.metrics() == store.metrics() == ["stable", "temp_c"]
+    assert loaded.clusters("temp_c") == NAMES
+    assert loaded.nbytes() == store.nbytes()
+    for k in range(len(TIERS)):
+        want, got = store.range("temp_c", tier=k), loaded.range("temp_c", tier=k)
+        for key in ("t", "mean", "min", "max", "count"):
+            assert np.array_equal(got[key], want[key], equal_nan=key != "count"), (k, key)
+
+    # recording continues where the saved store left off
+    _fill(store, 75, 90, seed=2)
+    _fill(loaded, 75, 90, seed=2)
+    for k in range(len(TIERS)):
+        assert np.array_equal(loaded.range("temp_c", tier=k)["mean"], store.range("temp_c", tier=k)["mean"])
@@ -1,5 +1,12 @@
-def discharge(state, cluster, kw):
+def message(cluster, kw):
+    return f"Discharged {kw:.1f} kW battery on {cluster}."
+
+
+def discharge(state, cluster, kw, on_delta=None):
     kw = min(kw, state["battery_kw"][cluster])
     state["battery_kw"][cluster] -= kw
     state["battery_out_kw"][cluster] += kw
-    return f"Discharged {kw:.1f} kW battery on {cluster}.", kw
+    if on_delta is not None:
+        on_delta(cluster, "battery_kw", -kw)
+        on_delta(cluster, "battery_out_kw", kw)
+    return message(cluster, kw), kw
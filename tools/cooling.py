@@ -1,9 +1,16 @@
 from core.state import ALPHA
 
 
-def boost(state, cluster, kw, cooling_cap):
+def message(cluster, kw):
+    return f"Boosted cooling {kw:.1f} kW on {cluster}."
+
+
+def boost(state, cluster, kw, cooling_cap, on_delta=None):
     head = cooling_cap[cluster] - state["cooling_online_kw"][cluster]
     kw = max(0.0, min(kw, head))
     state["cooling_online_kw"][cluster] += kw
     state["temp_c"][cluster] -= ALPHA * kw
-    return f"Boosted cooling {kw:.1f} kW on {cluster}.", kw
+    if on_delta is not None:
+        on_delta(cluster, "cooling_online_kw", kw)
+        on_delta(cluster, "temp_c", -ALPHA * kw)
+    return message(cluster, kw), kw
@@ -1,16 +1,27 @@
-from core.state import BETA, MAX_UTIL
+from core.state import BETA, MAX_UTIL, UTIL_PER_KW
 
 
-def redistribute(state, src, dst, kw):
+def message(src, dst, kw, skipped=False):
+    if skipped:
+        return f"Redistribute skipped: {dst} at max util."
+    return f"Redistributed {kw:.1f} kW {src}→{dst}."
+
+
+def redistribute(state, src, dst, kw, on_delta=None):
     # reduce src load and temp; increase dst if util allows
     if state["utilization"][dst] >= MAX_UTIL:
-        return f"Redistribute skipped: {dst} at max util.", 0.0
+        return message(src, dst, 0.0, skipped=True), 0.0
     kw = max(0.0, min(kw, state["power_draw_kw"][src]))  # can't move more than draw
     state["power_draw_kw"][src] = max(0.0, state["power_draw_kw"][src] - kw)
     state["temp_c"][src] -= BETA * kw
     state["power_draw_kw"][dst] += kw
     state["temp_c"][dst] += BETA * kw
     # utilization nudge (mock)
-    state["utilization"][src] = max(0.0, state["utilization"][src] - 0.01 * kw)
-    state["utilization"][dst] = min(1.0, state["utilization"][dst] + 0.01 * kw)
-    return f"Redistributed {kw:.1f} kW {src}→{dst}.", kw
+    state["utilization"][src] = max(0.0, state["utilization"][src] - UTIL_PER_KW * kw)
+    state["utilization"][dst] = min(1.0, state["utilization"][dst] + UTIL_PER_KW * kw)
+    if on_delta is not None:
+        on_delta(src, "power_draw_kw", -kw)
+        on_delta(src, "temp_c", -BETA * kw)
+        on_delta(dst, "power_draw_kw", kw)
+        on_delta(dst, "temp_c", BETA * kw)
+    return message(src, dst, kw), kw
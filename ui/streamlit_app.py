@@ -2,6 +2,9 @@ import json
 import os
 import sys
 import importlib
+import threading
+import time
+import uuid
 
 proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if proj_root not in sys.path:
@@ -20,7 +23,8 @@ import streamlit as st, pandas as pd
 assert (
     hasattr(core, "run_dc")
     and hasattr(core, "evaluate_dc")
-    and hasattr(core, "evaluate_dc_nemotron")
+    and hasattr(core, "evaluate_dc_nemotron_stream")
+    and hasattr(core, "live_dc")
 ), "core_app missing required functions"
 
 st.set_page_config(page_title="GridGuardian DC", layout="wide")
@@ -35,8 +39,24 @@ with colA:
 with colB:
     use_llm = st.toggle("Use Nemotron planner (stub)", value=False)
 
-if st.button("Run Controller"):
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_run(scenario, tau, induce_failure, use_llm, stamp):
+    # `stamp` (scenario file mtimes) is only part of the key, so edited data files rerun
     res = core.run_dc(scenario, tau, induce_failure=induce_failure, use_llm=use_llm)
+    res["logs"] = res["logs"].to_list()
+    res["react_trace"] = res["react_trace"].to_list()
+    return res
+
+
+if st.button("Run Controller"):
+    st.session_state["run_args"] = (scenario, tau, induce_failure, use_llm)
+
+# the last run stays on the page across widget changes; reruns are cache hits
+if "run_args" in st.session_state:
+    run_args = st.session_state["run_args"]
+    res = _cached_run(*run_args, core.scenario_stamp(run_args[0]))
     c1, c2 = st.columns(2)
     with c1:
         st.subheader("Power Balance (kW) — Before")
@@ -59,16 +79,97 @@ if st.button("Run Controller"):
         st.download_button(
             "Download Plan JSON",
             data=json.dumps(res["plan"], indent=2),
-            file_name=f"plan_{scenario}.json",
+            file_name=f"plan_{run_args[0]}.json",
         )
         if st.button("Reset Scenario"):
-            st.session_state.clear()
+            st.session_state.pop("run_args", None)
             st.rerun()
 
     st.subheader("ReAct Trace")
     for row in res["react_trace"]:
         st.write(f"{row['phase']}: {row['text']}")
 
+st.divider()
+st.subheader("Live Controller")
+st.caption("Runs the controller in a background thread on a drifting plant; shared by every open session.")
+coll1, coll2, coll3 = st.columns(3)
+with coll1:
+    live = st.toggle("Live mode", value=False, key="live")
+with coll2:
+    live_interval = st.slider("Control interval (s)", 0.5, 10.0, 1.0, 0.5, key="live_interval")
+with coll3:
+    live_window = st.slider("Chart window (min)", 1, 60, 5, key="live_window")
+
+
+@st.cache_resource
+def _live_slot():
+    # one controller per server process, visible to every session; `sessions` holds
+    # the sessions with live mode on, and the controller stops when the last one leaves
+    return {"args": None, "controller": None, "sessions": set(), "lock": threading.Lock()}
+
+
+def _live_controller(args, session):
+    slot = _live_slot()
+    with slot["lock"]:
+        slot["sessions"].add(session)
+        if slot["args"] != args:
+            if slot["controller"] is not None:
+                slot["controller"].stop()
+            slot["controller"] = core.live_dc(*args[:4], interval_s=args[4])
+            slot["args"] = args
+        return slot["controller"]
+
+
+def _live_release(session, force=False):
+    slot = _live_slot()
+    with slot["lock"]:
+        slot["sessions"].discard(session)
+        if force:
+            slot["sessions"].clear()
+        if not slot["sessions"] and slot["controller"] is not None:
+            slot["controller"].stop()
+            slot["controller"] = slot["args"] = None
+
+
+def _live_panel(controller, window_s):
+    if controller.error is not None:
+        st.error(f"Live controller stopped: {type(controller.error).__name__}: {controller.error}")
+    latest = controller.latest()
+    if latest is None:
+        st.info("Waiting for the first control step…")
+        return
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Timestep", latest["timestep"])
+    m2.metric("Stable", "yes" if latest["verify"]["stable"] else "no")
+    m3.metric("Actions", len(latest["plan"]["actions"]))
+    names = list(latest["balance_after"])
+    for metric, title in (
+        ("balance_after_kw", "Power balance after control (kW)"),
+        ("temp_after_c", "Temperature (°C)"),
+    ):
+        st.subheader(title)
+        st.line_chart(_history_frame(controller, metric, window_s)[names])
+
+
+def _history_frame(controller, metric, window_s):
+    # the controller's own store, so run_dc / evaluator runs on this page stay out of the chart
+    store = controller.history
+    rows = store.range(metric, time.time() - window_s)
+    return pd.DataFrame(rows["mean"], index=pd.to_datetime(rows["t"], unit="s"), columns=store.clusters(metric))
+
+
+live_session = st.session_state.setdefault("live_session", uuid.uuid4().hex)
+if live:
+    controller = _live_controller((scenario, tau, induce_failure, use_llm, live_interval), live_session)
+    st.fragment(run_every=live_interval)(_live_panel)(controller, live_window * 60)
+else:
+    _live_release(live_session)
+    if _live_slot()["controller"] is not None:
+        # kept alive by other sessions (or ones closed without turning live mode off)
+        if st.button("Stop shared live controller"):
+            _live_release(live_session, force=True)
+            st.rerun()
+
 st.divider()
 st.subheader("Evaluator")
 col1, col2 = st.columns(2)
@@ -79,15 +180,30 @@ with col2:
 
 
 @st.cache_data(show_spinner=False)
-def _cached_eval(tau, use_llm):
+def _cached_eval(tau, use_llm, stamp):
     return core.evaluate_dc(tau=tau, use_llm=use_llm)
 
 
 if st.button("Run Evaluator"):
-    summary = _cached_eval(eval_tau, eval_use_llm)
+    summary = _cached_eval(eval_tau, eval_use_llm, (core.scenario_stamp("A"), core.scenario_stamp("B")))
     st.write(f"Pass rate: {summary['passed']}/{summary['total']} = {summary['score']:.2f}")
     st.json(summary["runs"])
 
+
+@st.cache_data(show_spinner=False)
+def _cached_sweep(use_llm, stamp):
+    return core.sweep_dc(use_llm=use_llm)
+
+
+if st.button("Sweep τ"):
+    # one plan per config, every τ on the slider's grid checked against it
+    sweep = _cached_sweep(eval_use_llm, (core.scenario_stamp("A"), core.scenario_stamp("B")))
+    curves = {"pass rate": sweep["pass_rate"]}
+    for run in sweep["runs"]:
+        label = f"{run['scenario']}{' +failure' if run['induce_failure'] else ''}"
+        curves[label] = [float(ok) for ok in run["stable"]]
+    st.line_chart(pd.DataFrame(curves, index=pd.Index(sweep["taus"], name="τ")))
+
 st.divider()
 st.subheader("Nemotron Scenario Generator + Critic")
 colg1, colg2, colg3 = st.columns(3)
@@ -99,9 +215,20 @@ with colg3:
     nemo_use_llm = st.toggle("Use Nemotron planner in eval", value=False, key="nemo_use_llm")
 
 if st.button("Run Nemotron Eval"):
-    summary = core.evaluate_dc_nemotron(tau=nemo_tau, use_llm=nemo_use_llm, n_scenarios=int(nemo_n))
-    st.write(f"Pass rate: {summary['passed']}/{summary['total']} = {summary['score']:.2f}")
-    for idx, run in enumerate(summary["runs"]):
-        score = run["grade"].get("score", 0.0)
-        st.write(f"Scenario #{idx}: score={score:.2f}")
-        st.json(run)
+    progress = st.progress(0.0, text="Generating scenarios…")
+    score_line = st.empty()
+    shown = set()
+    # partial summaries arrive as each scenario is graded
+    for summary in core.evaluate_dc_nemotron_stream(tau=nemo_tau, use_llm=nemo_use_llm, n_scenarios=int(nemo_n)):
+        done, total = summary["done"], summary["total"]
+        progress.progress(done / total if total else 1.0, text=f"Graded {done}/{total} scenarios")
+        score_line.write(f"Pass rate: {summary['passed']}/{done} graded, {total} total")
+        for run in summary["runs"]:
+            name = run["result"]["scenario"]
+            if name in shown:
+                continue
+            shown.add(name)
+            score = run["grade"].get("score", 0.0)
+            st.write(f"Scenario {name}: score={score:.2f}")
+            st.json(run)
+    score_line.write(f"Pass rate: {summary['passed']}/{summary['total']} = {summary['score']:.2f}")